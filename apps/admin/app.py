@@ -16,7 +16,7 @@ from django.views.decorators.csrf import csrf_protect
 from django.views.generic import RedirectView
 
 from .decorators import admin_staff_member_required
-from .views import AppIndexView, AppReportView, AppStatisticsView
+from .views import AppIndexView, AppReportView, AppReportJobView, AppReportJobDownloadView, AppStatisticsView
 
 
 class AppAdmin:
@@ -76,6 +76,18 @@ class AppAdmin:
                     AppReportView.as_view(site_admin=self.site_admin, app_config=app_config), cacheable=True
                 ),
             ),
+            url(
+                r'^reports/jobs/(?P<pk>[0-9a-f-]+)/$', name='{}_report_job'.format(self.app_label),
+                view=admin_staff_member_required(
+                    AppReportJobView.as_view(site_admin=self.site_admin, app_config=app_config)
+                ),
+            ),
+            url(
+                r'^reports/jobs/(?P<pk>[0-9a-f-]+)/download/$', name='{}_report_job_download'.format(self.app_label),
+                view=admin_staff_member_required(
+                    AppReportJobDownloadView.as_view(site_admin=self.site_admin, app_config=app_config)
+                ),
+            ),
             url(
                 r'^statistics/$', kwargs={}, name='{}_statistics'.format(self.app_label),
                 view=admin_staff_member_required(
@@ -86,6 +98,13 @@ class AppAdmin:
 
         return urlpatterns
 
+    def get_report(self, request, type_report, report_code):
+        """Return a report by its code in the attribute "reports"."""
+
+        report = self.reports[report_code]
+        class_report = report['class_report']
+        return class_report(request, type_report, filename=report['label'])
+
     def get_tables_of_statistics(self):
         """
         return (
@@ -103,7 +122,7 @@ class AppAdmin:
 
         raise NotImplementedError
 
-    def get_context_for_charts_of_statistics(self):
+    def get_charts_of_statistics(self):
         """
         return (
             {
@@ -0,0 +1,62 @@
+
+import time
+import logging
+
+from django.core.management import BaseCommand
+
+from ...models import ReportJob
+
+
+logger = logging.getLogger('django.development')
+
+
+class Command(BaseCommand):
+
+    help = 'Make reports of pending jobs'
+
+    def add_arguments(self, parser):
+
+        parser.add_argument(
+            '--batch-size', type=int, default=10,
+            help='Count jobs taken at once.',
+        )
+        parser.add_argument(
+            '--loop', action='store_true', default=False,
+            help='Keep waiting for new jobs, instead of exit when there are no pending jobs.',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1,
+            help='Seconds of waiting for new jobs in the loop.',
+        )
+
+    def handle(self, *args, **kwargs):
+
+        batch_size = kwargs['batch_size']
+
+        count_done = 0
+        count_failed = 0
+
+        while True:
+
+            # jobs of lost workers are made again
+            count_requeued, count_stale_failed = ReportJob.objects.requeue_stale()
+            count_failed += count_stale_failed
+            if count_requeued or count_stale_failed:
+                logger.warning('Requeued {} stale jobs of reports, failed {}.'.format(count_requeued, count_stale_failed))
+
+            pks = ReportJob.objects.get_pending_pks(batch_size)
+
+            for pk in pks:
+                try:
+                    if ReportJob.objects.process(pk):
+                        count_done += 1
+                except Exception:
+                    count_failed += 1
+                    logger.exception('Report of the job {} was not made.'.format(pk))
+
+            if len(pks) < batch_size:
+                if not kwargs['loop']:
+                    break
+                time.sleep(kwargs['interval'])
+
+        logger.info('Made {} reports, failed {}.'.format(count_done, count_failed))
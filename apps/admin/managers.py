@@ -1,2 +1,104 @@
 
-from django.db import models
+import json
+import hashlib
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.text import force_text
+
+
+class ReportJobManager(models.Manager):
+    """
+    Manager for jobs making reports in a worker.
+    """
+
+    def enqueue(self, report, user=None):
+        """
+        Return a job making the report. A job for the same report (class, type, subjects and version of data)
+        is reused, if it is not failed or stale and its file is still kept.
+        """
+
+        key = report.get_job_key()
+
+        job = self.filter(key=key).exclude(status=self.model.FAILED).order_by('-created').first()
+        if job is not None and not job.is_stale():
+            if not job.is_done() or default_storage.exists(job.file_name):
+                return job
+
+        parameters = dict(
+            filename=force_text(report.filename),
+            subjects=list(report.subjects),
+            attributes=report.get_serializable_report_attributes(),
+        )
+
+        return self.create(
+            key=key,
+            class_report=report.get_class_path(),
+            report_type=report.type,
+            parameters=json.dumps(parameters),
+            user=user,
+        )
+
+    def get_pending_pks(self, batch_size):
+
+        return list(
+            self.filter(status=self.model.PENDING).order_by('created').values_list('pk', flat=True)[:batch_size]
+        )
+
+    def requeue_stale(self, now=None):
+        """
+        Return jobs running longer than REPORT_JOBS_RUNNING_TIMEOUT (their worker is lost) to pending,
+        or fail them after REPORT_JOBS_MAX_ATTEMPTS attempts. Return counts of requeued and failed jobs.
+        """
+
+        if now is None:
+            now = timezone.now()
+
+        timeout = getattr(settings, 'REPORT_JOBS_RUNNING_TIMEOUT', 60 * 30)
+        max_attempts = getattr(settings, 'REPORT_JOBS_MAX_ATTEMPTS', 3)
+
+        stale = self.filter(status=self.model.RUNNING, started__lt=now - timezone.timedelta(seconds=timeout))
+
+        count_failed = stale.filter(count_attempts__gte=max_attempts).update(
+            status=self.model.FAILED, finished=now, error='Timed out after {} attempts'.format(max_attempts),
+        )
+        count_requeued = stale.update(status=self.model.PENDING, started=None)
+
+        return count_requeued, count_failed
+
+    def process(self, pk):
+        """
+        Make the report of the job and keep it in the storage under a hash of its content,
+        so the same files are kept once. Return True if the job was taken by the current worker.
+        """
+
+        # take the job by a single update, so other workers skip it
+        with transaction.atomic():
+            count_taken = self.filter(pk=pk, status=self.model.PENDING).update(
+                status=self.model.RUNNING, started=timezone.now(), count_attempts=models.F('count_attempts') + 1,
+            )
+            if not count_taken:
+                return False
+
+        job = self.get(pk=pk)
+
+        try:
+            report = job.get_report()
+            output = report.get_output(json.loads(job.parameters)['attributes'])
+
+            content_hash = hashlib.sha256(output).hexdigest()
+            file_name = 'reports/{}.{}'.format(content_hash, report.RESPONSE_DETAILS[report.type]['extension'])
+            if not default_storage.exists(file_name):
+                default_storage.save(file_name, ContentFile(output))
+        except Exception as exc:
+            self.filter(pk=pk).update(status=self.model.FAILED, finished=timezone.now(), error=repr(exc))
+            raise
+
+        self.filter(pk=pk).update(
+            status=self.model.DONE, finished=timezone.now(), file_name=file_name, content_hash=content_hash,
+        )
+
+        return True
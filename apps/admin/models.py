@@ -11,6 +11,9 @@ from django.core.validators import MinLengthValidator, MaxValueValidator
 from django.utils.translation import ugettext_lazy as _
 from django.db import models
 from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .managers import ReportJobManager
 
 
 class LogEntry(models.Model):
@@ -75,3 +78,82 @@ class LogEntry(models.Model):
     def is_deleted(self):
 
         return self.action == self.DELETED
+
+
+class ReportJob(models.Model):
+    """
+    Job making a report in a worker (the command process_report_jobs), instead of a request.
+    """
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    CHOICES_STATUS = (
+        (PENDING, _('Pending')),
+        (RUNNING, _('Running')),
+        (DONE, _('Done')),
+        (FAILED, _('Failed')),
+    )
+
+    id = models.UUIDField(primary_key=True, editable=False, default=uuid.uuid4)
+
+    key = models.CharField(_('key'), max_length=40, db_index=True)
+    class_report = models.CharField(_('class of report'), max_length=200)
+    report_type = models.CharField(_('type of report'), max_length=10)
+    parameters = models.TextField(_('parameters'))
+    status = models.CharField(_('status'), choices=CHOICES_STATUS, max_length=10, default=PENDING)
+    file_name = models.CharField(_('file name'), max_length=200, blank=True)
+    content_hash = models.CharField(_('hash of content'), max_length=64, blank=True)
+    error = models.TextField(_('error'), blank=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, verbose_name=_('user'),
+        on_delete=models.SET_NULL, related_name='report_jobs', null=True, blank=True,
+    )
+    created = models.DateTimeField(_('created'), auto_now_add=True)
+    started = models.DateTimeField(_('started'), null=True, blank=True)
+    finished = models.DateTimeField(_('finished'), null=True, blank=True)
+    count_attempts = models.PositiveSmallIntegerField(_('count attempts'), default=0)
+
+    objects = models.Manager()
+    objects = ReportJobManager()
+
+    class Meta:
+        db_table = 'admin_admin_report_jobs'
+        verbose_name = _('job of report')
+        verbose_name_plural = _('jobs of reports')
+        get_latest_by = 'created'
+        ordering = ('created', )
+        index_together = (('status', 'created'), )
+
+    def __str__(self):
+
+        return '{0.class_report} ({0.report_type})'.format(self)
+
+    def get_report(self):
+        """Return the report of the job, made without a request."""
+
+        parameters = json.loads(self.parameters)
+        class_report = import_string(self.class_report)
+        return class_report(None, self.report_type, parameters['filename'], subjects=parameters['subjects'])
+
+    def is_done(self):
+
+        return self.status == self.DONE
+
+    def is_failed(self):
+
+        return self.status == self.FAILED
+
+    def is_stale(self, now=None):
+        """Return True if the job is running longer than REPORT_JOBS_RUNNING_TIMEOUT, so its worker is lost."""
+
+        if self.status != self.RUNNING or self.started is None:
+            return False
+
+        if now is None:
+            now = timezone.now()
+
+        timeout = getattr(settings, 'REPORT_JOBS_RUNNING_TIMEOUT', 60 * 30)
+        return self.started < now - timezone.timedelta(seconds=timeout)
@@ -222,6 +222,18 @@ class SiteAdmin:
                 'admin:{}_reports'.format(app_label),
                 current_app=self.name
             )
+        elif key_name == 'report_job':
+            return reverse(
+                'admin:{}_report_job'.format(app_label),
+                current_app=self.name,
+                **kwargs
+            )
+        elif key_name == 'report_job_download':
+            return reverse(
+                'admin:{}_report_job_download'.format(app_label),
+                current_app=self.name,
+                **kwargs
+            )
         elif key_name == 'statistics':
             return reverse(
                 'admin:{}_statistics'.format(app_label),
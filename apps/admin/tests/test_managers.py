@@ -1,7 +1,175 @@
 
-import unittest
+import json
+import shutil
+import tempfile
+from unittest import mock
 
-from django.test import TestCase
+from django.core.files.storage import FileSystemStorage
+from django.test import TestCase, override_settings
+from django.utils import timezone
 
-import factory
-from factories import fuzzy
+from apps.core.reports import BaseReport
+from apps.users.models import User
+
+from apps.admin.models import ReportJob
+
+
+class FakeFormatReport(object):
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def __call__(self):
+        return 'Report by {author}'.format(**self.kwargs).encode()
+
+
+class FakeReport(BaseReport):
+
+    theme = 'Users'
+    report_models = (User, )
+    PDF_class_report = FakeFormatReport
+    Excel_class_report = FakeFormatReport
+
+    def get_location(self):
+        return 'Location'
+
+    def get_author(self):
+        return 'Author'
+
+
+class ReportJobTestMixin(object):
+
+    def setUp(self):
+
+        self.storage_location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.storage_location)
+
+        storage = FileSystemStorage(location=self.storage_location)
+        for target in ('apps.admin.managers.default_storage', 'apps.admin.views.default_storage'):
+            patcher = mock.patch(target, storage)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.storage = storage
+
+    def get_report(self, report_type='pdf', subjects=()):
+
+        return FakeReport(None, report_type, 'report', subjects=subjects)
+
+
+@override_settings(REPORT_JOBS_RUNNING_TIMEOUT=60, REPORT_JOBS_MAX_ATTEMPTS=2)
+class ReportJobManagerTest(ReportJobTestMixin, TestCase):
+    """
+    Tests for jobs making reports in a worker.
+    """
+
+    def test_enqueue(self):
+
+        job = ReportJob.objects.enqueue(self.get_report())
+
+        self.assertEqual(job.status, ReportJob.PENDING)
+        self.assertEqual(job.class_report, FakeReport.get_class_path())
+        self.assertEqual(job.report_type, 'pdf')
+        self.assertEqual(json.loads(job.parameters)['attributes']['author'], 'Author')
+
+    def test_enqueue_reuses_job_of_the_same_report(self):
+
+        job = ReportJob.objects.enqueue(self.get_report())
+
+        self.assertEqual(ReportJob.objects.enqueue(self.get_report()), job)
+        self.assertNotEqual(ReportJob.objects.enqueue(self.get_report('excel')), job)
+        self.assertNotEqual(ReportJob.objects.enqueue(self.get_report(subjects=['a'])), job)
+
+        # the same file is reused while it is kept
+        ReportJob.objects.process(job.pk)
+        self.assertEqual(ReportJob.objects.enqueue(self.get_report()), job)
+
+        job.refresh_from_db()
+        self.storage.delete(job.file_name)
+        self.assertNotEqual(ReportJob.objects.enqueue(self.get_report()), job)
+
+    def test_enqueue_does_not_reuse_failed_and_stale_jobs(self):
+
+        failed_job = ReportJob.objects.enqueue(self.get_report())
+        ReportJob.objects.filter(pk=failed_job.pk).update(status=ReportJob.FAILED)
+
+        stale_job = ReportJob.objects.enqueue(self.get_report())
+        self.assertNotEqual(stale_job, failed_job)
+
+        ReportJob.objects.filter(pk=stale_job.pk).update(
+            status=ReportJob.RUNNING, started=timezone.now() - timezone.timedelta(seconds=61),
+        )
+        self.assertNotIn(ReportJob.objects.enqueue(self.get_report()), (failed_job, stale_job))
+
+    def test_process(self):
+
+        job = ReportJob.objects.enqueue(self.get_report())
+
+        self.assertTrue(ReportJob.objects.process(job.pk))
+        self.assertFalse(ReportJob.objects.process(job.pk))
+
+        job.refresh_from_db()
+        self.assertTrue(job.is_done())
+        self.assertEqual(job.count_attempts, 1)
+        self.assertIsNotNone(job.started)
+        self.assertIsNotNone(job.finished)
+        self.assertTrue(job.file_name.endswith('.pdf'))
+        with self.storage.open(job.file_name) as file:
+            self.assertEqual(file.read(), b'Report by Author')
+
+    def test_process_keeps_the_same_files_once(self):
+
+        job1 = ReportJob.objects.enqueue(self.get_report())
+        job2 = ReportJob.objects.enqueue(self.get_report(subjects=['a']))
+
+        ReportJob.objects.process(job1.pk)
+        ReportJob.objects.process(job2.pk)
+
+        job1.refresh_from_db()
+        job2.refresh_from_db()
+        self.assertEqual(job1.file_name, job2.file_name)
+
+    def test_process_failed(self):
+
+        job = ReportJob.objects.enqueue(self.get_report())
+
+        with mock.patch.object(FakeFormatReport, '__call__', side_effect=ValueError('error')):
+            with self.assertRaises(ValueError):
+                ReportJob.objects.process(job.pk)
+
+        job.refresh_from_db()
+        self.assertTrue(job.is_failed())
+        self.assertIn('error', job.error)
+
+    def test_requeue_stale(self):
+
+        now = timezone.now()
+
+        running_job = ReportJob.objects.enqueue(self.get_report())
+        stale_job = ReportJob.objects.enqueue(self.get_report('excel'))
+        exhausted_job = ReportJob.objects.enqueue(self.get_report(subjects=['a']))
+
+        ReportJob.objects.filter(pk=running_job.pk).update(
+            status=ReportJob.RUNNING, started=now - timezone.timedelta(seconds=59), count_attempts=1,
+        )
+        ReportJob.objects.filter(pk=stale_job.pk).update(
+            status=ReportJob.RUNNING, started=now - timezone.timedelta(seconds=61), count_attempts=1,
+        )
+        ReportJob.objects.filter(pk=exhausted_job.pk).update(
+            status=ReportJob.RUNNING, started=now - timezone.timedelta(seconds=61), count_attempts=2,
+        )
+
+        self.assertEqual(ReportJob.objects.requeue_stale(now), (1, 1))
+
+        running_job.refresh_from_db()
+        stale_job.refresh_from_db()
+        exhausted_job.refresh_from_db()
+        self.assertEqual(running_job.status, ReportJob.RUNNING)
+        self.assertEqual(stale_job.status, ReportJob.PENDING)
+        self.assertIsNone(stale_job.started)
+        self.assertTrue(exhausted_job.is_failed())
+
+        # the requeued job is made again
+        self.assertTrue(ReportJob.objects.process(stale_job.pk))
+        stale_job.refresh_from_db()
+        self.assertEqual(stale_job.count_attempts, 2)
@@ -1,7 +1,59 @@
 
-import unittest
-
+from django.core.urlresolvers import reverse
 from django.test import TestCase
 
-import factory
-from factories import fuzzy
+from apps.users.factories import UserFactory
+
+from apps.admin.models import ReportJob
+
+from .test_managers import ReportJobTestMixin
+
+
+class ReportJobViewsTest(ReportJobTestMixin, TestCase):
+    """
+    Tests for pages of waiting for and downloading reports made by jobs.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+
+        cls.superuser = UserFactory(is_active=True, is_superuser=True)
+
+    def setUp(self):
+
+        super().setUp()
+
+        self.client.force_login(self.superuser)
+        self.job = ReportJob.objects.enqueue(self.get_report(), user=self.superuser)
+
+    def get_url(self, name):
+
+        return reverse('admin:utilities_{}'.format(name), kwargs={'pk': self.job.pk})
+
+    def test_status_of_job(self):
+
+        response = self.client.get(self.get_url('report_job'), HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.json(), dict(status=ReportJob.PENDING, download_url=None))
+
+        ReportJob.objects.process(self.job.pk)
+
+        response = self.client.get(self.get_url('report_job'), HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(
+            response.json(), dict(status=ReportJob.DONE, download_url=self.get_url('report_job_download')),
+        )
+
+    def test_download_not_made_report(self):
+
+        response = self.client.get(self.get_url('report_job_download'))
+        self.assertEqual(response.status_code, 404)
+
+    def test_download(self):
+
+        ReportJob.objects.process(self.job.pk)
+
+        response = self.client.get(self.get_url('report_job_download'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertIn('attachment; filename="report', response['Content-Disposition'])
+        self.assertEqual(b''.join(response.streaming_content), b'Report by Author')
@@ -22,7 +22,8 @@ from django import forms
 # from django.shortcuts import render, get_object_or_404
 from django.db import models
 # from django.apps import apps
-from django.http import HttpResponseRedirect, Http404, HttpResponse, HttpResponseBadRequest
+from django.http import HttpResponseRedirect, Http404, HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.core.files.storage import default_storage
 # from django.db.models.fields.reverse_related import ManyToOneRel
 from django.core.urlresolvers import reverse
 from django.utils.translation import ugettext_lazy as _, ungettext
@@ -36,7 +37,7 @@ from utils.python.utils import get_filename_with_datetime
 
 from apps.notifications.models import Notification
 
-from .models import LogEntry
+from .models import LogEntry, ReportJob
 from .filters import DateTimeRangeFilter, RelatedOnlyFieldListFilter, ChoiceFilter
 from .forms_utils import BootstrapErrorList
 from .forms import LoginForm, AddChangeDisplayForm, ImportForm, InlinesFormsets
@@ -847,10 +848,16 @@ class AppReportView(SiteAppAdminMixin, SiteAdminView):
         report_type = request.POST.get('report_type')
         report_code = request.POST.get('report_code')
 
-        if report_type not in ['pdf', 'excel']:
+        if report_type not in ['pdf', 'excel'] or report_code not in self.app_admin.reports:
             return HttpResponseBadRequest('Incorrect input data')
 
-        return self.app_admin.get_report(request, report_type, report_code)
+        # the report is made by a worker, and the user waits for it on a page of the job
+        report = self.app_admin.get_report(request, report_type, report_code)
+        job = ReportJob.objects.enqueue(report, user=request.user)
+
+        return HttpResponseRedirect(
+            self.site_admin.get_url('report_job', self.app_config.label, kwargs={'pk': job.pk})
+        )
 
     def get_template_names(self):
 
@@ -877,6 +884,77 @@ class AppReportView(SiteAppAdminMixin, SiteAdminView):
         return context
 
 
+class ReportJobMixin(object):
+
+    def get_job(self, pk):
+
+        # get_object_or_404 does not working with UUID
+        try:
+            return ReportJob.objects.get(pk=pk)
+        except (ReportJob.DoesNotExist, ValueError):
+            raise Http404(_('A report doesn`t found'))
+
+
+class AppReportJobView(ReportJobMixin, SiteAppAdminMixin, SiteAdminView):
+    """Page of waiting for a report; for AJAX-requests it returns a status of the job as JSON."""
+
+    def get(self, request, *args, **kwargs):
+
+        self.job = self.get_job(kwargs['pk'])
+
+        if request.is_ajax():
+            return JsonResponse(dict(
+                status=self.job.status,
+                download_url=self.get_download_url() if self.job.is_done() else None,
+            ))
+
+        return self.render_to_response(self.get_context_data())
+
+    def get_download_url(self):
+
+        return self.site_admin.get_url('report_job_download', self.app_config.label, kwargs={'pk': self.job.pk})
+
+    def get_template_names(self):
+
+        return (
+            'admin/admin/report_job.html',
+        )
+
+    def render_to_response(self, context):
+
+        return TemplateResponse(
+            self.request,
+            template=self.get_template_names(),
+            context=context,
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        context['title'] = _('{} - Reports ').format(self.app_config.verbose_name)
+
+        context['app_config'] = self.app_config
+        context['job'] = self.job
+        context['reports_url'] = self.site_admin.get_url('reports', self.app_config.label)
+        if self.job.is_done():
+            context['download_url'] = self.get_download_url()
+
+        return context
+
+
+class AppReportJobDownloadView(ReportJobMixin, SiteAppAdminMixin, SiteAdminView):
+
+    def get(self, request, *args, **kwargs):
+
+        job = self.get_job(kwargs['pk'])
+
+        if not job.is_done():
+            raise Http404(_('A report is not made yet'))
+
+        report = job.get_report()
+        return report.get_response(default_storage.open(job.file_name))
+
+
 class AppStatisticsView(SiteAppAdminMixin, SiteAdminView):
 
     def get(self, request, *args, **kwargs):
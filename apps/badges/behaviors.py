@@ -1,6 +1,4 @@
 
-import itertools
-
 from dateutil.relativedelta import relativedelta
 
 from .utils import check_boolean_return
@@ -277,17 +275,7 @@ def check_badge_forumer_silver(user, topic_model, post_model):
 def check_badge_enthusiast_bronze(user, attendance_model):
     """Visit the site each day for 30 consecutive days."""
 
-    qs = attendance_model._default_manager.filter(users=user)
-
-    dates = tuple(qs.values_list('date', flat=True))
-
-    pairs_neighboring_dates = zip(dates[0:-1], dates[1:])
-
-    diffrence_days = (map(lambda i: (i[0] - i[1]).days, pairs_neighboring_dates))
-
-    perionds_consecutive_days = (len(tuple(i)) for k, i in itertools.groupby(diffrence_days) if k == 1)
-
-    return bool(tuple(filter(lambda i: i > 29, perionds_consecutive_days)))
+    return attendance_model._default_manager.get_longest_streak(user) >= 30
 
 
 @check_boolean_return
@@ -302,17 +290,7 @@ def check_badge_frequent_recorder_bronze(user, diary_model):
 def check_badge_fanatic_silver(user, attendance_model):
     """Visit the site each day for 100 consecutive days."""
 
-    qs = attendance_model._default_manager.filter(users=user)
-
-    dates = tuple(qs.values_list('date', flat=True))
-
-    pairs_neighboring_dates = zip(dates[0:-1], dates[1:])
-
-    diffrence_days = (map(lambda i: (i[0] - i[1]).days, pairs_neighboring_dates))
-
-    perionds_consecutive_days = [len(tuple(i)) for k, i in itertools.groupby(diffrence_days) if k == 1]
-
-    return bool(tuple(filter(lambda i: i > 99, perionds_consecutive_days)))
+    return attendance_model._default_manager.get_longest_streak(user) >= 100
 
 
 @check_boolean_return
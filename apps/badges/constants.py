@@ -81,6 +81,36 @@ class Badges(object):
         GOLD = 'gold'
         SILVER = 'silver'
 
+    @enum.unique
+    class Counter(enum.Enum):
+
+        COMMENTS = 'comments'
+        OPINIONS_USEFUL = 'opinions_useful'
+        OPINIONS_USELESS = 'opinions_useless'
+        POSTS = 'posts'
+        REPLIES = 'replies'
+        TOPICS = 'topics'
+        VOTES = 'votes'
+
+    @classproperty
+    def counter_rules(cls):
+        """Badges earned by counters of activity of an user: all thresholds must be reached."""
+
+        return {
+            cls.Badge.BIBLIOPHILE_GOLD: {cls.Counter.REPLIES: 10},
+            cls.Badge.BOOKLOVER_SILVER: {cls.Counter.REPLIES: 5},
+            cls.Badge.COMMENTATOR_BRONZE: {cls.Counter.COMMENTS: 10},
+            cls.Badge.COMMENTATOR_GOLD: {cls.Counter.COMMENTS: 100},
+            cls.Badge.COMMENTATOR_SILVER: {cls.Counter.COMMENTS: 50},
+            cls.Badge.CRITIC_BRONZE: {cls.Counter.OPINIONS_USELESS: 1},
+            cls.Badge.FORUMER_SILVER: {cls.Counter.TOPICS: 10, cls.Counter.POSTS: 50},
+            cls.Badge.INITIALIZER_CONVERSATION_BRONZE: {cls.Counter.TOPICS: 1},
+            cls.Badge.INTERLOCUTOR_BRONZE: {cls.Counter.POSTS: 1},
+            cls.Badge.READER_BRONZE: {cls.Counter.REPLIES: 1},
+            cls.Badge.SUPPORTER_BRONZE: {cls.Counter.OPINIONS_USEFUL: 1},
+            cls.Badge.VOTER_BRONZE: {cls.Counter.VOTES: 1},
+        }
+
     @classproperty
     def checkers(cls):
 
@@ -127,6 +157,16 @@ class Badges(object):
             cls.Badge.YEARLING_BRONZE: behaviors.check_badge_yearling_bronze,
         }
 
+    CHOICES_COUNTER = (
+        (Counter.COMMENTS.value, _('Comments')),
+        (Counter.OPINIONS_USEFUL.value, _('Useful opinions')),
+        (Counter.OPINIONS_USELESS.value, _('Useless opinions')),
+        (Counter.POSTS.value, _('Posts')),
+        (Counter.REPLIES.value, _('Replies')),
+        (Counter.TOPICS.value, _('Topics')),
+        (Counter.VOTES.value, _('Votes')),
+    )
+
     CHOICES_KIND = (
         (Kind.BRONZE.value, _('Bronze')),
         (Kind.GOLD.value, _('Gold')),
@@ -0,0 +1,118 @@
+
+from django.db import models
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+
+from apps.polls.models import Poll, Vote
+from apps.comments.models import Comment
+from apps.articles.models import Article
+from apps.questions.models import Question, Answer
+from apps.forums.models import Post, Topic
+from apps.snippets.models import Snippet
+from apps.opinions.models import Opinion
+from apps.library.models import Reply
+from apps.solutions.models import Solution
+from apps.visits.models import Visit
+from apps.users.models import Profile
+from apps.diaries.models import Diary
+
+from .constants import Badges
+
+
+User = get_user_model()
+
+
+def _with_count_at_least(model, count, **conditions):
+
+    return model._default_manager.filter(**conditions).values('user').annotate(
+        count=models.Count('pk'),
+    ).filter(count__gte=count)
+
+
+def _with_rating(model, rating_lookup, rating, **conditions):
+
+    return model._default_manager.filter(**conditions).objects_with_rating().filter(**{rating_lookup: rating})
+
+
+def get_eligible_users(badge_const):
+    """
+    Return queryset and lookup of a primary key of user for users must have the badge,
+    all of them are evaluated by single aggregate query.
+    """
+
+    Badge = Badges.Badge
+
+    # the same thresholds as in checkers of behaviors
+    querysets = {
+        Badge.COMMENTATOR_BRONZE: lambda: _with_count_at_least(Comment, 10),
+        Badge.COMMENTATOR_SILVER: lambda: _with_count_at_least(Comment, 50),
+        Badge.COMMENTATOR_GOLD: lambda: _with_count_at_least(Comment, 100),
+        Badge.VOTER_BRONZE: lambda: Vote._default_manager.all(),
+        Badge.VOTER_SILVER: lambda: Vote._default_manager.values('user').annotate(
+            count=models.Count('pk'),
+        ).filter(count__gt=Poll._default_manager.count() / 2),
+        Badge.VOTER_GOLD: lambda: _with_count_at_least(Vote, max(Poll._default_manager.count(), 1)),
+        Badge.PUBLICIST_BRONZE: lambda: _with_rating(Article, 'rating__gt', 0, count_views__gte=100),
+        Badge.PUBLICIST_SILVER: lambda: _with_rating(Article, 'rating__gte', 10, count_views__gte=500),
+        Badge.PUBLICIST_GOLD: lambda: _with_rating(Article, 'rating__gte', 50, count_views__gte=1000),
+        Badge.CODER_BRONZE: lambda: _with_rating(Snippet, 'rating__gt', 0, count_views__gte=100),
+        Badge.CODER_SILVER: lambda: _with_rating(Snippet, 'rating__gte', 10, count_views__gte=500),
+        Badge.CODER_GOLD: lambda: _with_rating(Snippet, 'rating__gte', 50, count_views__gte=1000),
+        Badge.INVENTOR_BRONZE: lambda: _with_rating(Solution, 'rating__gt', 0, count_views__gte=100),
+        Badge.INVENTOR_SILVER: lambda: _with_rating(Solution, 'rating__gte', 10, count_views__gte=500),
+        Badge.INVENTOR_GOLD: lambda: _with_rating(Solution, 'rating__gte', 50, count_views__gte=1000),
+        Badge.QUESTIONER_BRONZE: lambda: _with_rating(Question, 'rating__gt', 0, count_views__gte=100),
+        Badge.QUESTIONER_SILVER: lambda: _with_rating(Question, 'rating__gte', 10, count_views__gte=500),
+        Badge.QUESTIONER_GOLD: lambda: _with_rating(Question, 'rating__gte', 50, count_views__gte=1000),
+        Badge.TEACHER_BRONZE: lambda: _with_rating(Answer, 'rating__gt', 0),
+        Badge.ENLIGHTENED_SILVER: lambda: _with_rating(Answer, 'rating__gte', 10),
+        Badge.GURU_GOLD: lambda: _with_rating(Answer, 'rating__gte', 50),
+        Badge.SELF_LEARNER_BRONZE: lambda: _with_rating(Answer, 'rating__gt', 3, question__user=models.F('user')),
+        Badge.INTERLOCUTOR_BRONZE: lambda: Post._default_manager.all(),
+        Badge.INITIALIZER_CONVERSATION_BRONZE: lambda: Topic._default_manager.all(),
+        Badge.FORUMER_SILVER: lambda: _with_count_at_least(Topic, 10).filter(
+            user__in=_with_count_at_least(Post, 50).values('user'),
+        ),
+        Badge.CRITIC_BRONZE: lambda: Opinion._default_manager.filter(is_useful=False),
+        Badge.SUPPORTER_BRONZE: lambda: Opinion._default_manager.filter(is_useful=True),
+        Badge.READER_BRONZE: lambda: Reply._default_manager.all(),
+        Badge.BOOKLOVER_SILVER: lambda: _with_count_at_least(Reply, 5),
+        Badge.BIBLIOPHILE_GOLD: lambda: _with_count_at_least(Reply, 10),
+        Badge.ENTHUSIAST_BRONZE: lambda: Visit._default_manager.filter(longest_streak__gte=30),
+        Badge.FANATIC_SILVER: lambda: Visit._default_manager.filter(longest_streak__gte=100),
+        Badge.YEARLING_BRONZE: lambda: Visit._default_manager.filter(
+            updated__gte=models.F('user__date_joined') + timezone.timedelta(days=365),
+        ),
+        Badge.FREQUENT_RECORDER_BRONZE: lambda: Diary._default_manager.diaries_with_total_size().filter(
+            total_size__gte=250000,
+        ),
+        Badge.OUTSPOKEN_BRONZE: lambda: Vote._default_manager.none(),
+        Badge.TALKATIVE_BRONZE: lambda: Vote._default_manager.none(),
+    }
+
+    # these are evaluated on the model of users
+    querysets_of_users = {
+        Badge.EPIC_SILVER: lambda: User._default_manager.filter(reputation__gte=1000),
+        Badge.LEGENDARY_GOLD: lambda: User._default_manager.filter(reputation__gte=10000),
+    }
+
+    if badge_const == Badge.SCHOOLAR_BRONZE:
+        return Answer._default_manager.filter(is_accepted=True), 'question__user'
+
+    if badge_const in querysets:
+        return querysets[badge_const](), 'user'
+
+    if badge_const in querysets_of_users:
+        return querysets_of_users[badge_const](), 'pk'
+
+    return None, None
+
+
+def get_eligible_users_by_checker(badge_const, user_filter):
+    """Return primary keys of users must have the badge, evaluated by its checker per an user."""
+
+    if badge_const == Badges.Badge.AUTOBIOGRAPHER_BRONZE:
+        profiles = Profile._default_manager.filter(**{'user__' + key: value for key, value in user_filter.items()})
+        return set(profile.user_id for profile in profiles.iterator() if profile.get_percentage_filling() >= 90)
+
+    raise ValueError('Badge "{}" has not a way of evaluating.'.format(badge_const.value))
@@ -0,0 +1,140 @@
+
+import time
+import uuid
+import logging
+import multiprocessing
+
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+
+from ...constants import Badges
+from ...eligibility import get_eligible_users, get_eligible_users_by_checker
+from ...models import Badge, EarnedBadge
+
+
+logger = logging.getLogger('django.development')
+
+
+def get_ranges_of_user_pks(count_ranges):
+    """Split space of UUIDs of users into ranges as pairs (start, end), where None is unbounded."""
+
+    bounds = [uuid.UUID(int=(index * 2 ** 128) // count_ranges) for index in range(1, count_ranges)]
+    return list(zip([None] + bounds, bounds + [None]))
+
+
+def get_range_filter(lookup, range_of_user_pks):
+
+    start, end = range_of_user_pks
+
+    user_filter = dict()
+    if start is not None:
+        user_filter[lookup + '__gte'] = start
+    if end is not None:
+        user_filter[lookup + '__lt'] = end
+    return user_filter
+
+
+def recompute_badge(badge, range_of_user_pks, batch_size):
+    """Make earned badge equal to eligibility of users in range; return counts of created and deleted."""
+
+    badge_const = Badges.Badge(badge.name)
+
+    queryset, lookup = get_eligible_users(badge_const)
+
+    if queryset is None:
+        user_filter = get_range_filter('pk', range_of_user_pks)
+        eligible_user_pks = get_eligible_users_by_checker(badge_const, user_filter)
+    else:
+        queryset = queryset.filter(**get_range_filter(lookup, range_of_user_pks))
+        eligible_user_pks = set(queryset.values_list(lookup, flat=True).distinct())
+
+    earned_badges = EarnedBadge.objects.filter(badge=badge, **get_range_filter('user', range_of_user_pks))
+    earned_user_pks = set(earned_badges.values_list('user_id', flat=True))
+
+    user_pks_to_create = list(eligible_user_pks - earned_user_pks)
+    user_pks_to_delete = list(earned_user_pks - eligible_user_pks)
+
+    with transaction.atomic():
+
+        EarnedBadge.objects.bulk_create(
+            [EarnedBadge(user_id=user_pk, badge=badge) for user_pk in user_pks_to_create],
+            batch_size=batch_size,
+        )
+
+        for index in range(0, len(user_pks_to_delete), batch_size):
+            EarnedBadge.objects.filter(
+                badge=badge, user_id__in=user_pks_to_delete[index:index + batch_size],
+            ).delete()
+
+    return len(user_pks_to_create), len(user_pks_to_delete)
+
+
+def recompute_badges(badge_pks, range_of_user_pks, batch_size):
+    """Return list of (name of badge, count created, count deleted, seconds) for users in range."""
+
+    result = list()
+    for badge in Badge.objects.filter(pk__in=badge_pks):
+        start_time = time.monotonic()
+        count_created, count_deleted = recompute_badge(badge, range_of_user_pks, batch_size)
+        result.append((badge.name, count_created, count_deleted, time.monotonic() - start_time))
+    return result
+
+
+def _recompute_badges_in_worker(args):
+
+    # each process must have own connections to database
+    connections.close_all()
+    return recompute_badges(*args)
+
+
+class Command(BaseCommand):
+
+    help = 'Recompute earned badges of all users by aggregate queries'
+
+    def add_arguments(self, parser):
+
+        parser.add_argument(
+            '--badges', nargs='+', default=None,
+            help='Names of badges to recompute, all by default.',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Count processes, each of them recomputes badges for own range of users.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Count rows per an insert or a delete.',
+        )
+
+    def handle(self, *args, **kwargs):
+
+        badges = Badge.objects.all()
+        if kwargs['badges']:
+            badges = badges.filter(name__in=kwargs['badges'])
+        badge_pks = list(badges.values_list('pk', flat=True))
+
+        workers = max(kwargs['workers'], 1)
+        batch_size = kwargs['batch_size']
+
+        tasks = [(badge_pks, range_of_user_pks, batch_size) for range_of_user_pks in get_ranges_of_user_pks(workers)]
+
+        if workers == 1:
+            results = [recompute_badges(*task) for task in tasks]
+        else:
+            connections.close_all()
+            with multiprocessing.Pool(workers) as pool:
+                results = pool.map(_recompute_badges_in_worker, tasks)
+
+        # sum up results of all ranges of users
+        totals = dict()
+        for result in results:
+            for name, count_created, count_deleted, seconds in result:
+                total = totals.get(name, (0, 0, 0))
+                totals[name] = (total[0] + count_created, total[1] + count_deleted, total[2] + seconds)
+
+        for name, (count_created, count_deleted, seconds) in sorted(totals.items()):
+            logger.info('Badge "{}": earned {}, lost {}, for {:.2f} sec.'.format(
+                name, count_created, count_deleted, seconds
+            ))
+
+        logger.info('Recomputed {} badges by {} workers.'.format(len(totals), workers))
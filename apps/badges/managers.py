@@ -1,9 +1,10 @@
 
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 
+from .constants import Badges
 from .querysets import BadgeQuerySet
 
 
@@ -45,4 +46,48 @@ class EarnedBadgeManager(models.Manager):
             earned_badge.delete()
 
 
+class ActivityCounterManager(models.Manager):
+    """
+    Manager for counters of activity of users.
+    """
+
+    def get_counters(self, user):
+
+        return {
+            Badges.Counter(name): value
+            for name, value in self.filter(user=user).values_list('name', 'value')
+        }
+
+    def change(self, user, deltas, get_initial_value):
+        """
+        Change counters of user by mapping counter -> delta and return counters before and after it.
+        Missing counters are initialized by get_initial_value(counter), that must return value before the change.
+        """
+
+        with transaction.atomic():
+
+            # missing counters are created before locking; get_or_create inserts in a savepoint,
+            # so a counter created by a concurrent change is taken instead of failing the transaction
+            existing_names = set(
+                self.filter(user=user, name__in=[counter.value for counter in deltas]).values_list('name', flat=True)
+            )
+            for counter in deltas:
+                if counter.value not in existing_names:
+                    self.get_or_create(user=user, name=counter.value, defaults={'value': get_initial_value(counter)})
+
+            counters_before = {
+                Badges.Counter(name): value
+                for name, value in self.select_for_update().filter(user=user).values_list('name', 'value')
+            }
+
+            for counter, delta in deltas.items():
+                self.filter(user=user, name=counter.value).update(value=models.F('value') + delta)
+
+        counters_after = counters_before.copy()
+        for counter, delta in deltas.items():
+            counters_after[counter] += delta
+
+        return counters_before, counters_after
+
+
 BadgeManager = BadgeManager.from_queryset(BadgeQuerySet)
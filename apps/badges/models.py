@@ -9,7 +9,7 @@ from django.conf import settings
 from utils.django.models import Timestampable, UUIDable, Creatable
 from utils.django.models_utils import get_admin_url
 
-from .managers import BadgeManager, EarnedBadgeManager
+from .managers import BadgeManager, EarnedBadgeManager, ActivityCounterManager
 from .constants import Badges
 
 
@@ -118,3 +118,28 @@ class EarnedBadge(UUIDable, Creatable):
 
     def __str__(self):
         return 'Badge "{0.badge}" of user "{0.user}"'.format(self)
+
+
+class ActivityCounter(UUIDable):
+    """
+    Model for keeping a counter of activity of an user, changed incrementally
+    while objects of the user are created and deleted.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, verbose_name=_('User'),
+        on_delete=models.CASCADE, related_name='activity_counters',
+    )
+    name = models.CharField(_('Name'), max_length=20, choices=Badges.CHOICES_COUNTER)
+    value = models.IntegerField(_('Value'), default=0)
+
+    objects = models.Manager()
+    objects = ActivityCounterManager()
+
+    class Meta:
+        verbose_name = _('activity counter')
+        verbose_name_plural = _('activity counters')
+        unique_together = (('user', 'name'), )
+
+    def __str__(self):
+        return '{0.name} of user "{0.user}": {0.value}'.format(self)
@@ -0,0 +1,78 @@
+
+import uuid
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from apps.users.factories import UserFactory
+
+from apps.badges.constants import Badges
+from apps.badges.models import Badge, EarnedBadge
+from apps.badges.management.commands.recompute_badges import (
+    get_ranges_of_user_pks, get_range_filter, recompute_badge,
+)
+
+
+User = get_user_model()
+
+
+class RecomputeBadgesCommandTest(TestCase):
+    """
+    Tests for recomputing earned badges of all users by aggregate queries.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+
+        call_command('create_default_badges')
+        cls.badge = Badge.objects.get(name=Badges.Badge.EPIC_SILVER.value)
+
+    def setUp(self):
+
+        self.eligible_user, self.not_eligible_user = UserFactory(), UserFactory()
+
+        User.objects.filter(pk=self.eligible_user.pk).update(reputation=1500)
+        User.objects.filter(pk=self.not_eligible_user.pk).update(reputation=10)
+
+        EarnedBadge.objects.create(user=self.not_eligible_user, badge=self.badge)
+
+    def get_users_with_badge(self):
+
+        return set(EarnedBadge.objects.filter(badge=self.badge).values_list('user_id', flat=True))
+
+    def test_get_ranges_of_user_pks(self):
+
+        self.assertEqual(get_ranges_of_user_pks(1), [(None, None)])
+
+        middle = uuid.UUID(int=2 ** 127)
+        self.assertEqual(get_ranges_of_user_pks(2), [(None, middle), (middle, None)])
+
+    def test_get_range_filter(self):
+
+        start, end = uuid.UUID(int=1), uuid.UUID(int=2)
+
+        self.assertEqual(get_range_filter('user', (None, None)), {})
+        self.assertEqual(get_range_filter('user', (start, end)), {'user__gte': start, 'user__lt': end})
+        self.assertEqual(get_range_filter('pk', (start, None)), {'pk__gte': start})
+
+    def test_recompute_badge(self):
+
+        self.assertEqual(recompute_badge(self.badge, (None, None), batch_size=1), (1, 1))
+        self.assertEqual(self.get_users_with_badge(), {self.eligible_user.pk})
+
+        self.assertEqual(recompute_badge(self.badge, (None, None), batch_size=1), (0, 0))
+
+    def test_recompute_badge_by_ranges_of_users(self):
+
+        counts = [recompute_badge(self.badge, range_of_user_pks, 100) for range_of_user_pks in get_ranges_of_user_pks(4)]
+
+        self.assertEqual(sum(count_created for count_created, count_deleted in counts), 1)
+        self.assertEqual(sum(count_deleted for count_created, count_deleted in counts), 1)
+        self.assertEqual(self.get_users_with_badge(), {self.eligible_user.pk})
+
+    def test_command(self):
+
+        call_command('recompute_badges', '--badges', self.badge.name)
+
+        self.assertEqual(self.get_users_with_badge(), {self.eligible_user.pk})
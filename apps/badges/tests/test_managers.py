@@ -0,0 +1,56 @@
+
+from django.test import TestCase
+
+from apps.users.factories import UserFactory
+
+from apps.badges.constants import Badges
+from apps.badges.models import ActivityCounter
+
+
+class ActivityCounterManagerTest(TestCase):
+    """
+    Tests for changing counters of activity of users.
+    """
+
+    def setUp(self):
+
+        self.user = UserFactory()
+
+    def test_change_creates_missing_counters_by_initial_values(self):
+
+        initial_values = {Badges.Counter.COMMENTS: 9, Badges.Counter.POSTS: 0}
+
+        counters_before, counters_after = ActivityCounter.objects.change(
+            self.user, {Badges.Counter.COMMENTS: 1, Badges.Counter.POSTS: 1}, initial_values.get,
+        )
+
+        self.assertEqual(counters_before, {Badges.Counter.COMMENTS: 9, Badges.Counter.POSTS: 0})
+        self.assertEqual(counters_after, {Badges.Counter.COMMENTS: 10, Badges.Counter.POSTS: 1})
+        self.assertEqual(ActivityCounter.objects.get_counters(self.user), counters_after)
+
+    def test_change_existing_counters(self):
+
+        ActivityCounter.objects.change(self.user, {Badges.Counter.COMMENTS: 1}, lambda counter: 5)
+
+        counters_before, counters_after = ActivityCounter.objects.change(
+            self.user, {Badges.Counter.COMMENTS: -1}, lambda counter: self.fail('Counter must not be initialized'),
+        )
+
+        self.assertEqual(counters_before[Badges.Counter.COMMENTS], 6)
+        self.assertEqual(counters_after[Badges.Counter.COMMENTS], 5)
+        self.assertEqual(ActivityCounter.objects.get_counters(self.user), {Badges.Counter.COMMENTS: 5})
+
+    def test_change_counter_created_concurrently(self):
+
+        def get_initial_value(counter):
+            # another change creates the counter meanwhile
+            ActivityCounter.objects.create(user=self.user, name=counter.value, value=7)
+            return 3
+
+        counters_before, counters_after = ActivityCounter.objects.change(
+            self.user, {Badges.Counter.COMMENTS: 1}, get_initial_value,
+        )
+
+        self.assertEqual(counters_before[Badges.Counter.COMMENTS], 7)
+        self.assertEqual(counters_after[Badges.Counter.COMMENTS], 8)
+        self.assertEqual(ActivityCounter.objects.filter(user=self.user).count(), 1)
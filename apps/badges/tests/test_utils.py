@@ -0,0 +1,30 @@
+
+import unittest
+
+from apps.badges.utils import is_rule_satisfied, get_crossed_badges
+
+
+class UtilsTest(unittest.TestCase):
+
+    def test_is_rule_satisfied(self):
+
+        rule = {'topics': 10, 'posts': 50}
+
+        assert is_rule_satisfied(rule, {'topics': 10, 'posts': 50}) is True
+        assert is_rule_satisfied(rule, {'topics': 10, 'posts': 49}) is False
+        assert is_rule_satisfied(rule, {'topics': 11}) is False
+
+    def test_get_crossed_badges(self):
+
+        rules = {
+            'bronze': {'comments': 10},
+            'silver': {'comments': 50},
+            'forumer': {'topics': 10, 'posts': 50},
+        }
+
+        assert get_crossed_badges(rules, {'comments': 9}, {'comments': 10}) == ({'bronze'}, set())
+        assert get_crossed_badges(rules, {'comments': 50}, {'comments': 49}) == (set(), {'silver'})
+        assert get_crossed_badges(rules, {'comments': 20}, {'comments': 21}) == (set(), set())
+        assert get_crossed_badges(
+            rules, {'topics': 10, 'posts': 49}, {'topics': 10, 'posts': 50}
+        ) == ({'forumer'}, set())
@@ -12,3 +12,28 @@ def check_boolean_return(func, *agrs, **kwargs):
         return result
 
     return _wrap
+
+
+def is_rule_satisfied(rule, counters):
+    """Rule is mapping counter -> threshold, all must be reached."""
+
+    return all(counters.get(counter, 0) >= threshold for counter, threshold in rule.items())
+
+
+def get_crossed_badges(rules, counters_before, counters_after):
+    """Return badges must be earned and badges must be lost after change of counters."""
+
+    earned_badges = set()
+    lost_badges = set()
+
+    for badge, rule in rules.items():
+
+        was_satisfied = is_rule_satisfied(rule, counters_before)
+        is_satisfied = is_rule_satisfied(rule, counters_after)
+
+        if is_satisfied and not was_satisfied:
+            earned_badges.add(badge)
+        elif was_satisfied and not is_satisfied:
+            lost_badges.add(badge)
+
+    return earned_badges, lost_badges
@@ -12,10 +12,11 @@ class CoreConfig(AppConfig):
     def ready(self):
 
         from .signals import (
-            post_added_updated_object,
-            pre_deleted_object,
             changed_group,
             login_user,
             logout_user,
             failed_login_user,
+            invalidate_registry,
+            reset_registry_statistics,
+            log_registry_statistics,
         )
@@ -0,0 +1,89 @@
+
+import threading
+import contextlib
+import collections
+
+from django.db.models.signals import post_save, pre_delete
+
+
+class ModelSignalDispatcher(object):
+    """
+    Dispatcher of handlers of saving and deleting objects.
+
+    It is connected to signals only for models having handlers, and finds handlers of a model by dict.
+    Handlers are called as handler(sender, instance, action, users_for_deleting=...),
+    where action is one of 'created', 'updated' or 'deleted'.
+    """
+
+    SUSPENDED = 'suspended'
+    DEFERRED = 'deferred'
+
+    def __init__(self):
+
+        self._handlers = collections.OrderedDict()
+        self._local = threading.local()
+
+    def register(self, models, handler):
+
+        for model in models:
+            self._handlers.setdefault(model, list()).append(handler)
+
+    def connect(self):
+
+        for model in self._handlers:
+            post_save.connect(self.handle_post_save, sender=model, dispatch_uid='core_dispatcher_post_save')
+            pre_delete.connect(self.handle_pre_delete, sender=model, dispatch_uid='core_dispatcher_pre_delete')
+
+    def handle_post_save(self, sender, instance, created, **kwargs):
+
+        action = 'created' if created is True else 'updated'
+        self.dispatch(sender, instance, action)
+
+    def handle_pre_delete(self, sender, instance, **kwargs):
+
+        # deleted objects cannot be handled later
+        self.dispatch(
+            sender, instance, 'deleted', users_for_deleting=kwargs.get('users_for_deleting'), is_deferrable=False
+        )
+
+    def dispatch(self, sender, instance, action, users_for_deleting=None, is_deferrable=True):
+
+        mode = getattr(self._local, 'mode', None)
+
+        if mode == self.SUSPENDED:
+            return
+
+        if mode == self.DEFERRED and is_deferrable:
+            self._local.deferred.append((sender, instance, action, users_for_deleting))
+            return
+
+        for handler in self._handlers.get(sender, ()):
+            handler(sender, instance, action, users_for_deleting=users_for_deleting)
+
+    @contextlib.contextmanager
+    def suspend(self, defer=False):
+        """
+        Context manager (or decorator) to skip handlers during bulk operations in the current thread.
+
+        With defer=True, handlers of saved objects are called on exit, if no exception was raised;
+        handlers of deleted objects are called immediately anyway.
+        """
+
+        previous = getattr(self._local, 'mode', None), getattr(self._local, 'deferred', None)
+
+        self._local.mode = self.DEFERRED if defer else self.SUSPENDED
+        self._local.deferred = list()
+
+        try:
+            yield
+        finally:
+            deferred = self._local.deferred
+            self._local.mode, self._local.deferred = previous
+
+        for sender, instance, action, users_for_deleting in deferred:
+            self.dispatch(sender, instance, action, users_for_deleting=users_for_deleting)
+
+
+dispatcher = ModelSignalDispatcher()
+
+suspend_model_signals = dispatcher.suspend
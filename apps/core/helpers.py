@@ -1,7 +1,5 @@
 import collections
 
-from django.contrib.auth.models import Group
-
 from apps.polls.models import Poll, Vote
 from apps.comments.models import Comment
 from apps.articles.models import Article, Mark
@@ -12,16 +10,33 @@ from apps.opinions.models import Opinion
 from apps.library.models import Reply
 from apps.solutions.models import Solution
 from apps.visits.models import Attendance, Visit
-from apps.users.models import User, Profile
+from apps.users.models import User, Profile, ReputationChange
 from apps.diaries.models import Diary
 
 from apps.badges.constants import Badges
-from apps.badges.models import Badge, EarnedBadge
+from apps.badges.models import Badge, EarnedBadge, ActivityCounter
+from apps.badges.utils import get_crossed_badges
 
 from apps.notifications.models import Notification
 from apps.notifications.signals import notify
 from apps.notifications.constants import Actions
 
+from .registry import registry
+
+
+# models, saving and deleting of which are handled
+ACTIVITY_MODELS = (
+    User, Vote, Solution, Snippet, Question, Answer, Profile, Diary,
+    Article, Mark, Reply, Comment, Opinion, Post, Topic,
+)
+
+BADGES_MODELS = (
+    Poll, Vote, Comment, Article, Mark, Question, Answer, Post, Topic,
+    Snippet, Opinion, Reply, Solution, Visit, User, Profile, Diary,
+)
+
+REPUTATION_MODELS = (Vote, Opinion, Mark)
+
 
 def get_recipients_while_deleting(users_for_deleting, GroupModerators, *users):
 
@@ -41,17 +56,61 @@ def get_recipients_while_deleting(users_for_deleting, GroupModerators, *users):
     return alive_recipients
 
 
-def notify_badges(sender, instance, users_for_deleting=None):
+ACTIVITY_COUNTER_SOURCES = {
+    Badges.Counter.COMMENTS: lambda user: Comment._default_manager.filter(user=user).count(),
+    Badges.Counter.OPINIONS_USEFUL: lambda user: Opinion._default_manager.filter(user=user, is_useful=True).count(),
+    Badges.Counter.OPINIONS_USELESS: lambda user: Opinion._default_manager.filter(user=user, is_useful=False).count(),
+    Badges.Counter.POSTS: lambda user: Post._default_manager.filter(user=user).count(),
+    Badges.Counter.REPLIES: lambda user: Reply._default_manager.filter(user=user).count(),
+    Badges.Counter.TOPICS: lambda user: Topic._default_manager.filter(user=user).count(),
+    Badges.Counter.VOTES: lambda user: Vote._default_manager.filter(user=user).count(),
+}
+
 
-    if sender in [
-        Poll, Vote, Comment, Article, Mark, Question, Answer, Post, Topic,
-        Snippet, Opinion, Reply, Solution, Visit, User, Profile, Diary
-    ]:
+def get_activity_deltas(instance, action):
+    """Return changes of counters of activity of user by created, updated or deleted object."""
+
+    if isinstance(instance, Opinion):
+
+        counter = Badges.Counter.OPINIONS_USEFUL if instance.is_useful else Badges.Counter.OPINIONS_USELESS
+
+        if action == 'updated':
+
+            if instance.is_changed() is False:
+                return dict()
+
+            # opinion was changed to opposite
+            opposite_counter = Badges.Counter.OPINIONS_USELESS if instance.is_useful else Badges.Counter.OPINIONS_USEFUL
+            return {counter: 1, opposite_counter: -1}
+
+    elif isinstance(instance, Comment):
+        counter = Badges.Counter.COMMENTS
+    elif isinstance(instance, Vote):
+        counter = Badges.Counter.VOTES
+    elif isinstance(instance, Reply):
+        counter = Badges.Counter.REPLIES
+    elif isinstance(instance, Post):
+        counter = Badges.Counter.POSTS
+    elif isinstance(instance, Topic):
+        counter = Badges.Counter.TOPICS
+    else:
+        return dict()
+
+    if action == 'created':
+        return {counter: 1}
+    elif action == 'deleted':
+        return {counter: -1}
+    return dict()
+
+
+def notify_badges(sender, instance, action, users_for_deleting=None):
+
+    if sender in BADGES_MODELS:
 
         if users_for_deleting is None:
             users_for_deleting = ()
 
-        users_lost_badges, users_earned_badges = check_badges_for_instance(instance, users_for_deleting)
+        users_lost_badges, users_earned_badges = check_badges_for_instance(instance, action, users_for_deleting)
 
         for user, badges in users_lost_badges.items():
 
@@ -88,12 +147,19 @@ def notify_badges(sender, instance, users_for_deleting=None):
                 )
 
 
-def check_badges_for_instance(instance, users_for_deleting):
+def check_badges_for_instance(instance, action, users_for_deleting):
     """ """
 
     users_lost_badges = collections.defaultdict(set)
     users_earned_badges = users_lost_badges.copy()
 
+    # badges earned by counts of objects are evaluated by counters of activity
+    deltas = get_activity_deltas(instance, action)
+    if deltas and instance.user not in users_for_deleting:
+        users_lost_badges, users_earned_badges = update_counters_and_return_result(
+            instance.user, deltas, action, users_lost_badges, users_earned_badges
+        )
+
     if isinstance(instance, Vote):
 
         user = instance.user
@@ -101,10 +167,6 @@ def check_badges_for_instance(instance, users_for_deleting):
         if user in users_for_deleting:
             return users_lost_badges, users_earned_badges
 
-        users_lost_badges, users_earned_badges = update_badges_and_return_result(
-            user, Badges.Badge.VOTER_BRONZE, users_lost_badges, users_earned_badges, Vote
-        )
-
         users_lost_badges, users_earned_badges = update_badges_and_return_result(
             user, Badges.Badge.VOTER_SILVER, users_lost_badges, users_earned_badges, Vote
         )
@@ -113,25 +175,6 @@ def check_badges_for_instance(instance, users_for_deleting):
             user, Badges.Badge.VOTER_GOLD, users_lost_badges, users_earned_badges, Poll, Vote
         )
 
-    elif isinstance(instance, Comment):
-
-        user = instance.user
-
-        if user in users_for_deleting:
-            return users_lost_badges, users_earned_badges
-
-        users_lost_badges, users_earned_badges = update_badges_and_return_result(
-            user, Badges.Badge.COMMENTATOR_BRONZE, users_lost_badges, users_earned_badges, Comment
-        )
-
-        users_lost_badges, users_earned_badges = update_badges_and_return_result(
-            user, Badges.Badge.COMMENTATOR_SILVER, users_lost_badges, users_earned_badges, Comment
-        )
-
-        users_lost_badges, users_earned_badges = update_badges_and_return_result(
-            user, Badges.Badge.COMMENTATOR_GOLD, users_lost_badges, users_earned_badges, Comment
-        )
-
     elif isinstance(instance, (Mark, Article)):
 
         user = instance.user if isinstance(instance, Article) else instance.article.user
@@ -235,59 +278,10 @@ def check_badges_for_instance(instance, users_for_deleting):
             user, Badges.Badge.SCHOOLAR_BRONZE, users_lost_badges, users_earned_badges, Answer
         )
 
-    elif isinstance(instance, (Topic, Post)):
-
-        user = instance.user
-
-        if user in users_for_deleting:
-            return users_lost_badges, users_earned_badges
-
-        users_lost_badges, users_earned_badges = update_badges_and_return_result(
-            user, Badges.Badge.INTERLOCUTOR_BRONZE, users_lost_badges, users_earned_badges, Post
-        )
-
-        users_lost_badges, users_earned_badges = update_badges_and_return_result(
-            user, Badges.Badge.INITIALIZER_CONVERSATION_BRONZE, users_lost_badges, users_earned_badges, Topic
-        )
-
-        users_lost_badges, users_earned_badges = update_badges_and_return_result(
-            user, Badges.Badge.FORUMER_SILVER, users_lost_badges, users_earned_badges, Topic, Post
-        )
-
-    elif isinstance(instance, Opinion):
+    elif isinstance(instance, (Comment, Topic, Post, Opinion, Reply)):
 
         user = instance.user
 
-        if user in users_for_deleting:
-            return users_lost_badges, users_earned_badges
-
-        users_lost_badges, users_earned_badges = update_badges_and_return_result(
-            user, Badges.Badge.CRITIC_BRONZE, users_lost_badges, users_earned_badges, Opinion
-        )
-
-        users_lost_badges, users_earned_badges = update_badges_and_return_result(
-            user, Badges.Badge.SUPPORTER_BRONZE, users_lost_badges, users_earned_badges, Opinion
-        )
-
-    elif isinstance(instance, Reply):
-
-        user = instance.user
-
-        if user in users_for_deleting:
-            return users_lost_badges, users_earned_badges
-
-        users_lost_badges, users_earned_badges = update_badges_and_return_result(
-            user, Badges.Badge.READER_BRONZE, users_lost_badges, users_earned_badges, Reply
-        )
-
-        users_lost_badges, users_earned_badges = update_badges_and_return_result(
-            user, Badges.Badge.BOOKLOVER_SILVER, users_lost_badges, users_earned_badges, Reply
-        )
-
-        users_lost_badges, users_earned_badges = update_badges_and_return_result(
-            user, Badges.Badge.BIBLIOPHILE_GOLD, users_lost_badges, users_earned_badges, Reply
-        )
-
     elif isinstance(instance, Visit):
 
         user = instance.user
@@ -339,10 +333,6 @@ def check_badges_for_instance(instance, users_for_deleting):
             if user in users_for_deleting:
                 continue
 
-            users_lost_badges, users_earned_badges = update_badges_and_return_result(
-                user, Badges.Badge.VOTER_BRONZE, users_lost_badges, users_earned_badges, Vote
-            )
-
             users_lost_badges, users_earned_badges = update_badges_and_return_result(
                 user, Badges.Badge.VOTER_SILVER, users_lost_badges, users_earned_badges, Vote
             )
@@ -376,19 +366,63 @@ def check_badge_for_user(user, badge_const, *checker_args):
     return checker(user, *checker_args)
 
 
+def update_counters_and_return_result(user, deltas, action, users_lost_badges, users_earned_badges):
+    """Change counters of activity of user and earn or lose badges only if their thresholds were crossed."""
+
+    changed_counters = set(deltas)
+
+    # counters of the same rules must be known too
+    for rule in Badges.counter_rules.values():
+        if changed_counters.intersection(rule):
+            for counter in rule:
+                deltas.setdefault(counter, 0)
+
+    def get_initial_value(counter):
+
+        value = ACTIVITY_COUNTER_SOURCES[counter](user)
+
+        # on deleting an object is still in database, otherwise the change is already made
+        if action != 'deleted':
+            value -= deltas[counter]
+        return value
+
+    counters_before, counters_after = ActivityCounter.objects.change(user, deltas, get_initial_value)
+
+    badges_to_earn, badges_to_lose = get_crossed_badges(Badges.counter_rules, counters_before, counters_after)
+
+    for badge_const in badges_to_lose:
+
+        badge = registry.get_badge(badge_const.value)
+
+        EarnedBadge.objects.delete_if_exists(user, badge)
+
+        users_lost_badges[user].add(badge)
+
+    for badge_const in badges_to_earn:
+
+        badge = registry.get_badge(badge_const.value)
+
+        if EarnedBadge.objects.get_or_create(user=user, badge=badge)[1]:
+            users_earned_badges[user].add(badge)
+
+    return users_lost_badges, users_earned_badges
+
+
 def update_badges_and_return_result(user, badge_const, users_lost_badges, users_earned_badges, *checker_args):
 
-    badge = Badge.objects.get(name=badge_const.value)
+    badge = registry.get_badge(badge_const.value)
 
     must_earn_badge = check_badge_for_user(user, badge_const, *checker_args)
 
-    if must_earn_badge is False and Badge.objects.has_badge(badge, user) is True:
+    has_badge = Badge.objects.has_badge(badge, user)
+
+    if must_earn_badge is False and has_badge is True:
 
         EarnedBadge.objects.delete_if_exists(user, badge)
 
         users_lost_badges[user].add(badge)
 
-    if must_earn_badge is True and Badge.objects.has_badge(badge, user) is False:
+    if must_earn_badge is True and has_badge is False:
 
         earned_badge = EarnedBadge(user=user, badge=badge)
         earned_badge.full_clean()
@@ -401,12 +435,9 @@ def update_badges_and_return_result(user, badge_const, users_lost_badges, users_
 
 def notify_activity(sender, instance, action, users_for_deleting=None):
 
-    if sender in [
-        User, Vote, Solution, Snippet, Question, Answer, Profile, Diary,
-        Article, Mark, Reply, Comment, Opinion, Post, Topic,
-    ]:
+    if sender in ACTIVITY_MODELS:
 
-        GroupModerators = Group.objects.get(name='moderators')
+        GroupModerators = registry.get_moderators()
 
         if action == 'created':
 
@@ -661,7 +692,7 @@ def notify_activity(sender, instance, action, users_for_deleting=None):
 
 def notify_reputation(sender, instance, action, users_for_deleting, update_fields=None):
 
-    if sender in (Vote, Opinion, Mark):
+    if sender in REPUTATION_MODELS:
 
         is_changed = False
 
@@ -738,9 +769,12 @@ def notify_reputation(sender, instance, action, users_for_deleting, update_field
 
         value = Actions.get_reputation_deviation(action, target)
 
-        recipient.reputation += int(value)
-        recipient.full_clean()
-        recipient.save()
+        # written to the ledger, with the total on the user updated without saving it
+        ReputationChange.objects.add(recipient, int(value), action, target)
+
+        # the user is not saved, so badges for reputation are checked here by the actual total
+        recipient.refresh_from_db(fields=['reputation'])
+        notify_badges(User, recipient, 'updated', users_for_deleting)
 
         notify.send(
             sender,
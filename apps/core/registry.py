@@ -0,0 +1,121 @@
+
+import time
+import threading
+
+from django.apps import apps
+from django.conf import settings
+
+
+class WellKnownRowsRegistry(object):
+    """
+    Keep rarely changed rows (badges, groups, content types) in memory of the process,
+    all rows of a model are loaded by single query on the first access to it.
+
+    Rows of a model are dropped on saving or deleting any of them, and loaded again on the next access;
+    since other processes are not notified about it, rows are also loaded again after
+    WELL_KNOWN_ROWS_TIMEOUT seconds, or on a miss of a key.
+    """
+
+    # model label -> field of lookup
+    MODELS = {
+        'badges.Badge': 'name',
+        'auth.Group': 'name',
+        'contenttypes.ContentType': 'pk',
+    }
+
+    def __init__(self):
+
+        self._lock = threading.Lock()
+        self._rows = dict()
+        self._local = threading.local()
+
+    def _get_rows(self, label, reload=False):
+
+        entry = self._rows.get(label)
+        if entry is not None and reload is False:
+            loaded, rows = entry
+            if time.monotonic() - loaded < getattr(settings, 'WELL_KNOWN_ROWS_TIMEOUT', 60 * 5):
+                self._local.count_saved_queries = self.get_count_saved_queries() + 1
+                return rows
+
+        model = apps.get_model(label)
+        lookup = self.MODELS[label]
+        rows = {getattr(obj, lookup): obj for obj in model._default_manager.all()}
+
+        with self._lock:
+            self._rows[label] = (time.monotonic(), rows)
+        return rows
+
+    def _get(self, label, key):
+
+        rows = self._get_rows(label)
+        if key not in rows:
+            # the row may be created after loading, possibly by another process
+            rows = self._get_rows(label, reload=True)
+
+        try:
+            return rows[key]
+        except KeyError:
+            model = apps.get_model(label)
+            raise model.DoesNotExist('{} "{}" does not exist.'.format(model._meta.object_name, key))
+
+    def get_badge(self, name):
+
+        return self._get('badges.Badge', name)
+
+    def get_group(self, name):
+
+        return self._get('auth.Group', name)
+
+    def get_moderators(self):
+
+        return self.get_group('moderators')
+
+    def get_content_type_for_id(self, pk):
+
+        return self._get('contenttypes.ContentType', pk)
+
+    def get_content_type(self, model):
+
+        model = model._meta.concrete_model
+        natural_key = (model._meta.app_label, model._meta.model_name)
+
+        for reload in (False, True):
+            for content_type in self._get_rows('contenttypes.ContentType', reload).values():
+                if (content_type.app_label, content_type.model) == natural_key:
+                    return content_type
+
+        raise apps.get_model('contenttypes.ContentType').DoesNotExist(
+            'Content type for "{}" does not exist.'.format(model._meta.label)
+        )
+
+    def warm(self):
+        """Load rows of all models."""
+
+        for label in self.MODELS:
+            self._get_rows(label)
+
+    def invalidate(self, model=None):
+        """Drop rows of the model or of all models."""
+
+        with self._lock:
+            if model is None:
+                self._rows.clear()
+            else:
+                self._rows.pop(model._meta.label, None)
+
+    def is_registered(self, model):
+
+        return model._meta.label in self.MODELS
+
+    def get_count_saved_queries(self):
+        """Return count queries replaced by the registry in the current thread, since the latest reset."""
+
+        return getattr(self._local, 'count_saved_queries', 0)
+
+    def reset_count_saved_queries(self):
+
+        self._local.count_saved_queries = 0
+
+
+registry = WellKnownRowsRegistry()
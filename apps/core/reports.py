@@ -1,24 +1,45 @@
 
 import logging
 import socket
+import hashlib
+import functools
 
 from django.utils.translation import ugettext as _
-from django.http import HttpResponse
+from django.utils.text import force_text
+from django.utils import timezone, formats
+from django.http import HttpResponse, FileResponse
 from django.contrib.gis.geoip2 import GeoIP2
+from django.db import models
 
 from utils.python.utils import get_filename_with_datetime
-from utils.django.utils import get_output_from_DTL
 
 
 logger = logging.getLogger('django.development')
 
 
+@functools.lru_cache()
+def get_location_by_host(host):
+    """Return a location of the host by GeoIP; it is determinated once per a process."""
+
+    geo_ip = GeoIP2()
+    try:
+        location = geo_ip.city(host)
+    except socket.gaierror:
+        logger.error('Could not determinate a location of user')
+        return _('Unknown')
+    else:
+        return '{0[city]}, {0[country_name]}'.format(location)
+
+
 class BaseReport(object):
 
     PDF_class_report = None
     Excel_class_report = None
     empty_value_display = '-'
 
+    # models, which data is in the report; changes of them make a new version of the report
+    report_models = ()
+
     RESPONSE_DETAILS = {
         'pdf': {
             'content_type': 'application/pdf',
@@ -32,10 +53,11 @@ class BaseReport(object):
 
     logger = logger
 
-    def __init__(self, request, report_type, filename):
+    def __init__(self, request, report_type, filename, subjects=()):
         self.request = request
         self.type = report_type
         self.filename = filename
+        self.subjects = tuple(subjects)
 
     def __call__(self):
         return self.generate_report()
@@ -51,57 +73,92 @@ class BaseReport(object):
             empty_value_display=self.empty_value_display,
         )
 
+    def get_serializable_report_attributes(self):
+        """Return attributes of the report as strings, to make it later without a request."""
+
+        return {name: force_text(value) for name, value in self.report_attributes.items()}
+
     def generate_report(self):
 
         response = self.get_response()
+        response.write(self.get_output())
+
+        return response
+
+    def get_output(self, report_attributes=None):
+
+        if report_attributes is None:
+            report_attributes = self.report_attributes
 
         if self.type == 'pdf':
             report_class = self.PDF_class_report
         elif self.type == 'excel':
             report_class = self.Excel_class_report
 
-        report = report_class(**self.report_attributes)
-        output = report()
+        report = report_class(**report_attributes)
+        return report()
 
-        response.write(output)
+    def get_response(self, file=None):
+        """Return a response for the report; if a file is passed, the response streams it."""
 
-        return response
+        response_details = self.RESPONSE_DETAILS[self.type]
 
-    def get_response(self):
+        if file is None:
+            response = HttpResponse(content_type=response_details['content_type'])
+        else:
+            response = FileResponse(file, content_type=response_details['content_type'])
 
-        response_details = self.RESPONSE_DETAILS[self.type]
-        response = HttpResponse(content_type=response_details['content_type'])
         filename = get_filename_with_datetime(self.filename, response_details['extension'])
         response['Content-Disposition'] = 'attachment; filename="{}"'.format(filename)
         return response
 
+    @classmethod
+    def get_class_path(cls):
+
+        return '{0.__module__}.{0.__qualname__}'.format(cls)
+
+    def get_data_version(self):
+        """Return a version of data of the report, by counts and latest changes of objects of its models."""
+
+        version = list()
+
+        for model in self.report_models:
+            aggregations = dict(count=models.Count('pk'))
+
+            for field_name in ('updated', 'created'):
+                if any(field.name == field_name for field in model._meta.get_fields()):
+                    aggregations[field_name] = models.Max(field_name)
+
+            values = model._default_manager.aggregate(**aggregations)
+            version.append((model._meta.label, sorted(values.items())))
+
+        return repr(version)
+
+    def get_job_key(self):
+        """Return a key of the same report: its type, subjects and version of data."""
+
+        key = repr((self.get_class_path(), self.type, sorted(self.subjects), self.get_data_version()))
+        return hashlib.sha1(key.encode()).hexdigest()
+
     def get_location(self):
-        geo_ip = GeoIP2()
-        try:
-            location = geo_ip.city(self.request.get_host())
-        except socket.gaierror:
-            logger.error('Could not determinate a location of user')
-            return _('Unknown')
-        else:
-            return '{0[city]}, {0[country_name]}'.format(location)
+
+        return get_location_by_host(self.request.get_host())
 
     def get_author(self):
 
         return self.request.user.get_full_name()
 
     def get_timezone(self):
-        timezone_name = get_output_from_DTL("{% now 'T' %}")
-        offset = get_output_from_DTL("{% now 'O' %}")
 
-        if len(offset) == 4:
-            sign, hours, minutes = '', offset[1:3], offset[3:]
-        elif len(offset) == 5:
-            sign, hours, minutes = offset[0], offset[1:3], offset[3:]
+        now = timezone.localtime(timezone.now())
+        timezone_name = now.strftime('%Z')
+        offset = now.strftime('%z')
 
+        sign, hours, minutes = offset[0], offset[1:3], offset[3:]
         hours = hours[1] if hours.startswith('0') else hours
 
         return '{} {}{}:{}'.format(timezone_name, sign, hours, minutes)
 
     def get_date_created(self):
 
-        return get_output_from_DTL("{% now 'DATETIME_FORMAT' %}")
+        return formats.date_format(timezone.localtime(timezone.now()), 'DATETIME_FORMAT')
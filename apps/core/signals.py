@@ -1,11 +1,13 @@
 
 import uuid
+import logging
 
 from django.contrib.auth.models import Group
 from django.contrib.auth.signals import user_logged_in, user_logged_out, user_login_failed
-from django.db.models.signals import post_save, pre_delete, m2m_changed
+from django.core.signals import request_started, request_finished
+from django.db.models.signals import post_save, post_delete, m2m_changed
 # from django.core.exceptions import ValidationError
-# from django.contrib.contenttypes.models import ContentType
+from django.contrib.contenttypes.models import ContentType
 # from django.utils.translation import ugettext_lazy as _
 from django.dispatch import receiver
 # from django.conf import settings
@@ -14,30 +16,46 @@ from django.dispatch import receiver
 from apps.notifications.signals import notify
 from apps.notifications.models import Notification
 from apps.notifications.constants import Actions
+from apps.badges.models import Badge
 
-from .helpers import notify_badges, notify_activity, notify_reputation
+from .dispatch import dispatcher
+from .helpers import (
+    notify_badges, notify_activity, notify_reputation,
+    ACTIVITY_MODELS, BADGES_MODELS, REPUTATION_MODELS,
+)
+from .registry import registry
 
 
-@receiver(post_save, dispatch_uid=uuid.uuid4)
-def post_added_updated_object(sender, instance, created, **kwargs):
+logger = logging.getLogger('django.development')
 
-    action = 'created' if created is True else 'updated'
 
-    notify_activity(sender, instance, action)
-    notify_badges(sender, instance)
-    notify_reputation(sender, instance, action, users_for_deleting=None)
+@receiver((post_save, post_delete), sender=Badge, dispatch_uid=uuid.uuid4)
+@receiver((post_save, post_delete), sender=Group, dispatch_uid=uuid.uuid4)
+@receiver((post_save, post_delete), sender=ContentType, dispatch_uid=uuid.uuid4)
+def invalidate_registry(sender, **kwargs):
 
+    registry.invalidate(sender)
 
-@receiver(pre_delete, dispatch_uid=uuid.uuid4)
-def pre_deleted_object(sender, instance, **kwargs):
 
-    action = 'deleted'
+@receiver(request_started, dispatch_uid=uuid.uuid4)
+def reset_registry_statistics(sender, **kwargs):
 
-    users_for_deleting = kwargs.get('users_for_deleting')
+    registry.reset_count_saved_queries()
 
-    notify_activity(sender, instance, action, users_for_deleting=users_for_deleting)
-    notify_badges(sender, instance, users_for_deleting=users_for_deleting)
-    notify_reputation(sender, instance, action, users_for_deleting=users_for_deleting)
+
+@receiver(request_finished, dispatch_uid=uuid.uuid4)
+def log_registry_statistics(sender, **kwargs):
+
+    count_saved_queries = registry.get_count_saved_queries()
+    if count_saved_queries:
+        logger.debug('Registry of well-known rows saved {} queries.'.format(count_saved_queries))
+
+
+# handlers of saving and deleting objects, in order of calling
+dispatcher.register(ACTIVITY_MODELS, notify_activity)
+dispatcher.register(BADGES_MODELS, notify_badges)
+dispatcher.register(REPUTATION_MODELS, notify_reputation)
+dispatcher.connect()
 
 
 @receiver(user_logged_in, dispatch_uid=uuid.uuid4)
@@ -50,7 +68,7 @@ def login_user(sender, request, user, **kwargs):
         target=None,
         action_target=None,
         level=Notification.SUCCESS,
-        recipient=Group.objects.get(name='moderators'),
+        recipient=registry.get_moderators(),
     )
 
 
@@ -64,7 +82,7 @@ def logout_user(sender, request, user, **kwargs):
         target=None,
         action_target=None,
         level=Notification.SUCCESS,
-        recipient=Group.objects.get(name='moderators'),
+        recipient=registry.get_moderators(),
     )
 
 
@@ -79,7 +97,7 @@ def failed_login_user(sender, credentials, **kwargs):
         target=None,
         action_target=None,
         level=Notification.ERROR,
-        recipient=Group.objects.get(name='moderators'),
+        recipient=registry.get_moderators(),
     )
 
 
@@ -94,7 +112,7 @@ def changed_group(sender, instance, action, reverse, model, pk_set, **kwargs):
         is_anonimuos=False,
         action_target=None,
         level=Notification.SUCCESS,
-        recipient=Group.objects.get(name='moderators'),
+        recipient=registry.get_moderators(),
     )
 
     if action == 'pre_add':
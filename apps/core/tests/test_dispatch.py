@@ -0,0 +1,40 @@
+
+from django.test import SimpleTestCase
+
+from apps.core.dispatch import ModelSignalDispatcher
+
+
+class ModelSignalDispatcherTest(SimpleTestCase):
+
+    def setUp(self):
+
+        self.calls = list()
+        self.dispatcher = ModelSignalDispatcher()
+        self.dispatcher.register((int, ), self.handler)
+
+    def handler(self, sender, instance, action, users_for_deleting=None):
+
+        self.calls.append((sender, instance, action))
+
+    def test_dispatch_only_to_registered_models(self):
+
+        self.dispatcher.dispatch(int, 1, 'created')
+        self.dispatcher.dispatch(str, '1', 'created')
+
+        self.assertEqual(self.calls, [(int, 1, 'created')])
+
+    def test_suspend(self):
+
+        with self.dispatcher.suspend():
+            self.dispatcher.dispatch(int, 1, 'created')
+
+        self.assertEqual(self.calls, [])
+
+    def test_defer(self):
+
+        with self.dispatcher.suspend(defer=True):
+            self.dispatcher.dispatch(int, 1, 'created')
+            self.dispatcher.dispatch(int, 2, 'deleted', is_deferrable=False)
+            self.assertEqual(self.calls, [(int, 2, 'deleted')])
+
+        self.assertEqual(self.calls, [(int, 2, 'deleted'), (int, 1, 'created')])
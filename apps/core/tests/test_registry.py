@@ -0,0 +1,63 @@
+
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import Group
+
+from apps.core.registry import WellKnownRowsRegistry
+
+
+class WellKnownRowsRegistryTest(TestCase):
+
+    def setUp(self):
+
+        self.registry = WellKnownRowsRegistry()
+        self.group = Group.objects.create(name='moderators')
+
+    def test_rows_are_loaded_once(self):
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.registry.get_moderators(), self.group)
+            self.assertEqual(self.registry.get_group('moderators'), self.group)
+
+        self.assertEqual(self.registry.get_count_saved_queries(), 1)
+
+    def test_missing_row(self):
+
+        self.assertRaises(Group.DoesNotExist, self.registry.get_group, 'banned')
+
+    def test_missing_row_reloads_rows_once(self):
+
+        self.registry.get_moderators()
+
+        # as if created by another process, the registry of the test is not invalidated by signals
+        group = Group.objects.create(name='banned')
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.registry.get_group('banned'), group)
+
+        with self.assertNumQueries(1):
+            self.assertRaises(Group.DoesNotExist, self.registry.get_group, 'admins')
+
+    @override_settings(WELL_KNOWN_ROWS_TIMEOUT=60)
+    def test_rows_are_loaded_again_after_timeout(self):
+
+        with mock.patch('apps.core.registry.time.monotonic', return_value=1000):
+            self.registry.get_moderators()
+
+        with mock.patch('apps.core.registry.time.monotonic', return_value=1059):
+            with self.assertNumQueries(0):
+                self.registry.get_moderators()
+
+        with mock.patch('apps.core.registry.time.monotonic', return_value=1060):
+            with self.assertNumQueries(1):
+                self.registry.get_moderators()
+
+    def test_invalidate(self):
+
+        self.registry.get_moderators()
+        self.registry.invalidate(Group)
+
+        group = Group.objects.create(name='banned')
+        with self.assertNumQueries(1):
+            self.assertEqual(self.registry.get_group('banned'), group)
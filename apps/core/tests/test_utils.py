@@ -0,0 +1,39 @@
+
+import datetime
+
+from django.test import SimpleTestCase
+
+from apps.core.utils import _get_periods_of_past_year
+
+
+class PeriodsOfPastYearTest(SimpleTestCase):
+
+    now = datetime.datetime(2017, 3, 15, 12, 30)
+
+    def test_months(self):
+
+        periods = _get_periods_of_past_year(self.now, 'month')
+
+        self.assertEqual(len(periods), 12)
+        self.assertEqual(periods[0], datetime.date(2016, 4, 1))
+        self.assertEqual(periods[-1], datetime.date(2017, 3, 1))
+
+    def test_weeks_start_on_monday(self):
+
+        periods = _get_periods_of_past_year(self.now, 'week')
+
+        self.assertEqual(periods[0], datetime.date(2016, 3, 28))
+        self.assertEqual(periods[-1], datetime.date(2017, 3, 13))
+        self.assertTrue(all(period.weekday() == 0 for period in periods))
+
+    def test_days(self):
+
+        periods = _get_periods_of_past_year(self.now, 'day')
+
+        self.assertEqual(periods[0], datetime.date(2016, 4, 1))
+        self.assertEqual(periods[-1], datetime.date(2017, 3, 15))
+        self.assertEqual(len(periods), 349)
+
+    def test_unknown_granularity(self):
+
+        self.assertRaises(ValueError, _get_periods_of_past_year, self.now, 'year')
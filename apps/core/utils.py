@@ -1,60 +1,74 @@
 
+import datetime
+import collections
+
+from django.conf import settings
+from django.db import models
+from django.db.models.functions import Trunc
 from django.utils import timezone
 
 import pygal
 from dateutil.relativedelta import relativedelta
 
-from apps.notifications.constants import Actions
-from apps.notifications.models import Notification
 
+def _get_periods_of_past_year(now, granularity):
+    """Return first dates of periods (month, week or day) from the same month of the past year to now."""
 
-def get_statistics_count_objects_for_the_past_year(queryset, date_field_name):
-    """ """
+    first_date = (now - relativedelta(months=11)).date().replace(day=1)
+
+    if granularity == 'month':
+        return [first_date + relativedelta(months=i) for i in range(12)]
 
-    now = timezone.now()
+    if granularity == 'week':
+        first_date -= datetime.timedelta(days=first_date.weekday())
+        step = datetime.timedelta(weeks=1)
+    elif granularity == 'day':
+        step = datetime.timedelta(days=1)
+    else:
+        raise ValueError('Granularity must be "month", "week" or "day", not "{}".'.format(granularity))
 
-    # get datetime on eleven months ago
-    # owing to a number of month will be unique
-    eleven_months_ago = now - relativedelta(months=11)
+    periods = list()
+    date = first_date
+    while date <= now.date():
+        periods.append(date)
+        date += step
 
-    # set in first day of month
-    eleven_months_ago = eleven_months_ago.replace(day=1)
+    return periods
 
-    # filter votes for a last 11 months and current month
-    filter_lookup = '%s__gte' % date_field_name
-    conditions_filter = {filter_lookup: eleven_months_ago}
-    votes = queryset.filter(**conditions_filter)
 
-    number_current_month = now.month
-    number_current_year = now.year
+def get_statistics_count_objects_for_the_past_year(queryset, date_field_name, granularity='month'):
+    """
+    Return counts of objects for each month (or week, or day) of the past year, up to the current,
+    as [(label, count), ...], by a single grouped query. Periods are determinated in the current timezone.
+    """
 
-    numbers_all_months = list(range(1, 13))
+    now = timezone.localtime(timezone.now()) if settings.USE_TZ else timezone.now()
 
-    # make reorder for order all numbers of months
-    # where a number of current month is last, whereas a following month is first
-    numbers_all_months = numbers_all_months[number_current_month:] + numbers_all_months[:number_current_month]
+    periods = _get_periods_of_past_year(now, granularity)
 
-    #
-    result = list()
-    for number_month in numbers_all_months:
+    start = datetime.datetime.combine(periods[0], datetime.time())
+    if settings.USE_TZ:
+        start = timezone.make_aware(start)
 
-        # if is number month is more than current, that in month of past year
-        year = number_current_year
-        if number_month > number_current_month:
-            year = number_current_year - 1
+    # weeks are not supported by Trunc, so they are made of days
+    kind = 'month' if granularity == 'month' else 'day'
 
-        # get abbr local name of month and year
-        date_label = now.replace(year=year, month=number_month, day=1).strftime('%b %Y')
+    counts = queryset.filter(**{'{}__gte'.format(date_field_name): start})
+    counts = counts.annotate(period=Trunc(date_field_name, kind)).order_by().values('period')
+    counts = counts.annotate(count=models.Count('pk')).values_list('period', 'count')
 
-        # filter objects for that number of month
-        filter_lookup = '%s__month' % date_field_name
-        conditions_filter = {filter_lookup: number_month}
-        count_obj_in_that_month = votes.filter(**conditions_filter).count()
+    count_by_periods = collections.Counter()
+    for period, count in counts:
+        if timezone.is_aware(period):
+            period = timezone.localtime(period)
+        date = period.date()
+        if granularity == 'week':
+            date -= datetime.timedelta(days=date.weekday())
+        count_by_periods[date] += count
 
-        #
-        result.append((date_label, count_obj_in_that_month))
+    label_format = '%b %Y' if granularity == 'month' else '%d %b %Y'
 
-    return result
+    return [(period.strftime(label_format), count_by_periods[period]) for period in periods]
 
 
 def get_chart_count_objects_for_the_past_year(statistics_data):
@@ -78,7 +92,8 @@ def get_chart_count_objects_for_the_past_year(statistics_data):
 
 def get_user_reputation_by_notifications(user):
     """
-    Getting reputation of user for activity on website:
+    Getting reputation of user, as sum of the ledger of changes (with the opening balance
+    recorded by the command rebuild_reputation), for activity on website:
     marks of published snippets, answers, questions and rating of articles,
     participate in polls.
     ---------------------------------------
@@ -101,22 +116,6 @@ def get_user_reputation_by_notifications(user):
     ---------------------------------------
     """
 
-    notifications = Notification.objects.filter(recipient=user)
-
-    reputation = 0
-
-    count_participate_in_poll = notifications.filter(action=Actions.PARTICIPATE_IN_POLL.value).count()
-    count_undo_participate_in_poll = notifications.filter(action=Actions.UNDO_PARTICIPATE_IN_POLL.value).count()
-
-    reputation += count_participate_in_poll
-    reputation -= count_undo_participate_in_poll
-
-    # count_upvote = notifications.filter(action=Actions.UPVOTE.value).count()
-    # count_downvote = notifications.filter(action=Actions.DOWNVOTE.value).count()
-    # count_lose_upvote = notifications.filter(action=Actions.LOSE_UPVOTE.value).count()
-    # count_lose_downvote = notifications.filter(action=Actions.LOSE_DOWNVOTE.value).count()
-    # count_change_to_upvote = notifications.filter(action=Actions.CHANGE_TO_UPVOTE.value).count()
-    # count_downvote = notifications.filter(action=Actions.DOWNVOTE.value).count()
-    # count_change_to_downvote = notifications.filter(action=Actions.CHANGE_TO_DOWNVOTE.value).count()
+    from apps.users.models import ReputationChange
 
-    return reputation
+    return ReputationChange.objects.get_total(user)
@@ -4,6 +4,8 @@ import random
 
 from utils.django.basecommands import FactoryCountBaseCommand
 
+from apps.core.dispatch import suspend_model_signals
+
 from ...factories import SectionFactory, ForumFactory, TopicFactory, PostFactory
 
 
@@ -12,6 +14,7 @@ logger = logging.getLogger('django.development')
 
 class Command(FactoryCountBaseCommand):
 
+    @suspend_model_signals()
     def handle(self, *args, **kwargs):
 
         count = kwargs['count'][0]
@@ -34,7 +34,7 @@ class PostManager(models.Manager):
     def get_statistics_count_posts_for_the_past_year(self):
         """ """
 
-        return get_statistics_count_objects_for_the_past_year(self, 'date_added')
+        return get_statistics_count_objects_for_the_past_year(self, 'created')
 
     def get_chart_count_posts_for_the_past_year(self):
         """ """
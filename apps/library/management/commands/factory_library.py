@@ -4,6 +4,8 @@ import logging
 
 from utils.django.basecommands import FactoryCountBaseCommand
 
+from apps.core.dispatch import suspend_model_signals
+
 from ...factories import BookFactory, WriterFactory, PublisherFactory
 
 
@@ -14,6 +16,7 @@ class Command(FactoryCountBaseCommand):
 
     help = 'Factory a passed count of books for testing.'
 
+    @suspend_model_signals()
     def handle(self, *args, **kwargs):
 
         count = kwargs.get('count')[0]
@@ -3,6 +3,8 @@ import logging
 
 from utils.django.basecommands import FactoryCountBaseCommand
 
+from apps.core.dispatch import suspend_model_signals
+
 from ...factories import NewsletterFactory
 
 
@@ -11,6 +13,7 @@ logger = logging.getLogger('django.development')
 
 class Command(FactoryCountBaseCommand):
 
+    @suspend_model_signals()
     def handle(self, *args, **kwargs):
 
         count = kwargs['count'][0]
@@ -1,11 +1,15 @@
 
 import collections
+import functools
 import enum
 
 from django.contrib.contenttypes.models import ContentType
 from django.utils.translation import ugettext as _
 
 
+UNREAD_NOTIFICATIONS_KEY_PREFIX = 'UNREAD_NOTIFICATIONS:'
+
+
 @enum.unique
 class Actions(enum.Enum):
     """
@@ -207,104 +211,112 @@ class Actions(enum.Enum):
     @classmethod
     def get_reputation_deviation(cls, action_key, target_content_type_or_target):
 
-        from apps.polls.models import Poll
-        from apps.questions.models import Question, Answer
-        from apps.articles.models import Article
-        from apps.solutions.models import Solution
-        from apps.snippets.models import Snippet
-
-        ReputationCharge = collections.namedtuple('ReputationCharge', ('number', 'actions_up', 'actions_down'))
-
-        reputation_charge = {
-            Poll: ReputationCharge(
-                number=1,
-                actions_up=(
-                    cls.REPUTATION_PARTICIPATE_IN_POLL,
-                ),
-                actions_down=(
-                    cls.REPUTATION_UNDO_PARTICIPATE_IN_POLL,
-                ),
+        action_const = cls(action_key)
+        if isinstance(target_content_type_or_target, ContentType):
+            model = target_content_type_or_target.model_class()
+        else:
+            model = type(target_content_type_or_target)
+
+        return _get_reputation_deviations().get((action_const, model))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_reputation_deviations():
+    """Return precomputed deviations of reputation as dict (action, model) -> deviation."""
+
+    from apps.polls.models import Poll
+    from apps.questions.models import Question, Answer
+    from apps.articles.models import Article
+    from apps.solutions.models import Solution
+    from apps.snippets.models import Snippet
+
+    ReputationCharge = collections.namedtuple('ReputationCharge', ('number', 'actions_up', 'actions_down'))
+
+    reputation_charge = {
+        Poll: ReputationCharge(
+            number=1,
+            actions_up=(
+                Actions.REPUTATION_PARTICIPATE_IN_POLL,
             ),
-            Solution: ReputationCharge(
-                number=3,
-                actions_up=(
-                    cls.REPUTATION_UPVOTE_OPINION,
-                    cls.REPUTATION_CHANGED_TO_UPVOTE_OPINION,
-                    cls.REPUTATION_LOSE_DOWNVOTE_OPINION
-                ),
-                actions_down=(
-                    cls.REPUTATION_DOWNVOTE_OPINION,
-                    cls.REPUTATION_CHANGED_TO_DOWNVOTE_OPINION,
-                    cls.REPUTATION_LOSE_UPVOTE_OPINION
-                ),
+            actions_down=(
+                Actions.REPUTATION_UNDO_PARTICIPATE_IN_POLL,
             ),
-            Snippet: ReputationCharge(
-                number=2,
-                actions_up=(
-                    cls.REPUTATION_UPVOTE_OPINION,
-                    cls.REPUTATION_CHANGED_TO_UPVOTE_OPINION,
-                    cls.REPUTATION_LOSE_DOWNVOTE_OPINION
-                ),
-                actions_down=(
-                    cls.REPUTATION_DOWNVOTE_OPINION,
-                    cls.REPUTATION_CHANGED_TO_DOWNVOTE_OPINION,
-                    cls.REPUTATION_LOSE_UPVOTE_OPINION
-                ),
+        ),
+        Solution: ReputationCharge(
+            number=3,
+            actions_up=(
+                Actions.REPUTATION_UPVOTE_OPINION,
+                Actions.REPUTATION_CHANGED_TO_UPVOTE_OPINION,
+                Actions.REPUTATION_LOSE_DOWNVOTE_OPINION
             ),
-            Question: ReputationCharge(
-                number=2,
-                actions_up=(
-                    cls.REPUTATION_UPVOTE_OPINION,
-                    cls.REPUTATION_CHANGED_TO_UPVOTE_OPINION,
-                    cls.REPUTATION_LOSE_DOWNVOTE_OPINION
-                ),
-                actions_down=(
-                    cls.REPUTATION_DOWNVOTE_OPINION,
-                    cls.REPUTATION_CHANGED_TO_DOWNVOTE_OPINION,
-                    cls.REPUTATION_LOSE_UPVOTE_OPINION
-                ),
+            actions_down=(
+                Actions.REPUTATION_DOWNVOTE_OPINION,
+                Actions.REPUTATION_CHANGED_TO_DOWNVOTE_OPINION,
+                Actions.REPUTATION_LOSE_UPVOTE_OPINION
             ),
-            Answer: ReputationCharge(
-                number=3,
-                actions_up=(
-                    cls.REPUTATION_UPVOTE_OPINION,
-                    cls.REPUTATION_CHANGED_TO_UPVOTE_OPINION,
-                    cls.REPUTATION_LOSE_DOWNVOTE_OPINION
-                ),
-                actions_down=(
-                    cls.REPUTATION_DOWNVOTE_OPINION,
-                    cls.REPUTATION_CHANGED_TO_DOWNVOTE_OPINION,
-                    cls.REPUTATION_LOSE_UPVOTE_OPINION
-                ),
+        ),
+        Snippet: ReputationCharge(
+            number=2,
+            actions_up=(
+                Actions.REPUTATION_UPVOTE_OPINION,
+                Actions.REPUTATION_CHANGED_TO_UPVOTE_OPINION,
+                Actions.REPUTATION_LOSE_DOWNVOTE_OPINION
             ),
-            Article: ReputationCharge(
-                number=None,
-                actions_up=(
-                    cls.REPUTATION_PUT_ASSESSMENT,
-                    cls.REPUTATION_CHANGED_ASSESSMENT_TO_UP
-                ),
-                actions_down=(
-                    cls.REPUTATION_CHANGED_ASSESSMENT_TO_DOWN,
-                    cls.REPUTATION_UNDO_ASSESSMENT
-                ),
+            actions_down=(
+                Actions.REPUTATION_DOWNVOTE_OPINION,
+                Actions.REPUTATION_CHANGED_TO_DOWNVOTE_OPINION,
+                Actions.REPUTATION_LOSE_UPVOTE_OPINION
             ),
-        }
-
-        action_const = cls(action_key)
-        if isinstance(target_content_type_or_target, ContentType):
-            model = target_content_type_or_target.model_class()
-        else:
-            model = type(target_content_type_or_target)
+        ),
+        Question: ReputationCharge(
+            number=2,
+            actions_up=(
+                Actions.REPUTATION_UPVOTE_OPINION,
+                Actions.REPUTATION_CHANGED_TO_UPVOTE_OPINION,
+                Actions.REPUTATION_LOSE_DOWNVOTE_OPINION
+            ),
+            actions_down=(
+                Actions.REPUTATION_DOWNVOTE_OPINION,
+                Actions.REPUTATION_CHANGED_TO_DOWNVOTE_OPINION,
+                Actions.REPUTATION_LOSE_UPVOTE_OPINION
+            ),
+        ),
+        Answer: ReputationCharge(
+            number=3,
+            actions_up=(
+                Actions.REPUTATION_UPVOTE_OPINION,
+                Actions.REPUTATION_CHANGED_TO_UPVOTE_OPINION,
+                Actions.REPUTATION_LOSE_DOWNVOTE_OPINION
+            ),
+            actions_down=(
+                Actions.REPUTATION_DOWNVOTE_OPINION,
+                Actions.REPUTATION_CHANGED_TO_DOWNVOTE_OPINION,
+                Actions.REPUTATION_LOSE_UPVOTE_OPINION
+            ),
+        ),
+        Article: ReputationCharge(
+            number=None,
+            actions_up=(
+                Actions.REPUTATION_PUT_ASSESSMENT,
+                Actions.REPUTATION_CHANGED_ASSESSMENT_TO_UP
+            ),
+            actions_down=(
+                Actions.REPUTATION_CHANGED_ASSESSMENT_TO_DOWN,
+                Actions.REPUTATION_UNDO_ASSESSMENT
+            ),
+        ),
+    }
 
-        charge = reputation_charge.get(model, None)
+    deviations = dict()
+    for model, charge in reputation_charge.items():
+        for action_const in Actions:
 
-        if charge is None:
-            return
+            number = charge.number
+            if action_const in charge.actions_up:
+                number = '+{}'.format(number)
+            elif action_const in charge.actions_down:
+                number = '-{}'.format(number)
 
-        number = charge.number
-        if action_const in charge.actions_up:
-            number = '+{}'.format(number)
-        elif action_const in charge.actions_down:
-            number = '-{}'.format(number)
+            deviations[(action_const, model)] = number
 
-        return number
+    return deviations
@@ -0,0 +1,17 @@
+
+from django.utils.functional import SimpleLazyObject
+
+from .counters import get_count_unread_notifications
+
+
+def count_unread_notifications(request):
+    """Count unread notifications of the user, taken from the cache only if a template uses it."""
+
+    def get_count():
+        if not request.user.is_authenticated():
+            return 0
+        return get_count_unread_notifications(request.user.pk)
+
+    return {
+        'COUNT_UNREAD_NOTIFICATIONS': SimpleLazyObject(get_count),
+    }
@@ -0,0 +1,46 @@
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .constants import UNREAD_NOTIFICATIONS_KEY_PREFIX
+
+
+def _get_key(recipient_pk):
+
+    return UNREAD_NOTIFICATIONS_KEY_PREFIX + str(recipient_pk)
+
+
+def get_count_unread_notifications(recipient_pk):
+    """Return count unread notifications of user from the cache, counting them in database on a miss."""
+
+    key = _get_key(recipient_pk)
+
+    count = cache.get(key)
+    if count is None:
+        from .models import Notification
+        count = Notification.objects.filter(recipient_id=recipient_pk, is_read=False, is_deleted=False).count()
+        cache.add(key, count, getattr(settings, 'UNREAD_NOTIFICATIONS_COUNTER_TIMEOUT', 60 * 10))
+    return count
+
+
+def increment_count_unread_notifications(recipient_pks):
+    """Increase cached counters of users after commit; missed counters are counted on the next read."""
+
+    keys = [_get_key(recipient_pk) for recipient_pk in recipient_pks]
+
+    def increment():
+        for key in keys:
+            try:
+                cache.incr(key)
+            except ValueError:
+                pass
+
+    transaction.on_commit(increment)
+
+
+def reset_count_unread_notifications(recipient_pks):
+    """Drop cached counters of users after commit, so they are counted again on the next read."""
+
+    keys = [_get_key(recipient_pk) for recipient_pk in recipient_pks]
+    transaction.on_commit(lambda: cache.delete_many(keys))
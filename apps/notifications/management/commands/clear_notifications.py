@@ -4,6 +4,7 @@ import logging
 from django.core.management import BaseCommand
 
 from ...models import Notification
+from ...retention import delete_by_chunks
 
 
 logger = logging.getLogger('django.development')
@@ -11,8 +12,15 @@ logger = logging.getLogger('django.development')
 
 class Command(BaseCommand):
 
+    def add_arguments(self, parser):
+
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Count notifications deleted by a query.',
+        )
+
     def handle(self, *args, **kwargs):
 
-        Notification._default_manager.filter().delete()
+        delete_by_chunks(Notification._default_manager.all(), chunk_size=kwargs['chunk_size'])
 
         logger.debug('Cleared all notifications')
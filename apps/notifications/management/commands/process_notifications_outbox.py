@@ -0,0 +1,73 @@
+
+import time
+import logging
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from ...models import NotificationOutbox
+
+
+logger = logging.getLogger('django.development')
+
+
+class Command(BaseCommand):
+
+    help = 'Deliver notifications recorded in the outbox'
+
+    def add_arguments(self, parser):
+
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Count notifications taken from the outbox at once.',
+        )
+        parser.add_argument(
+            '--loop', action='store_true', default=False,
+            help='Keep waiting for new notifications, instead of exit when the outbox is empty.',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1,
+            help='Seconds of waiting for new notifications in the loop.',
+        )
+        parser.add_argument(
+            '--purge-interval', type=float, default=60 * 60,
+            help='Seconds between purges of processed notifications in the loop.',
+        )
+
+    def handle(self, *args, **kwargs):
+
+        batch_size = kwargs['batch_size']
+        max_attempts = getattr(settings, 'NOTIFICATIONS_OUTBOX_MAX_ATTEMPTS', 5)
+        retention = getattr(settings, 'NOTIFICATIONS_OUTBOX_RETENTION', 7)
+
+        count_delivered = 0
+        count_failed = 0
+        count_purged = 0
+        last_purge = None
+
+        while True:
+
+            pks = NotificationOutbox.objects.get_pending_pks(batch_size, max_attempts)
+
+            for pk in pks:
+                try:
+                    if NotificationOutbox.objects.process(pk):
+                        count_delivered += 1
+                except Exception:
+                    count_failed += 1
+                    logger.exception('Notification {} from the outbox was not delivered.'.format(pk))
+
+            if len(pks) < batch_size:
+
+                # processed notifications are purged when the outbox is drained
+                if last_purge is None or time.time() - last_purge >= kwargs['purge_interval']:
+                    count_purged += NotificationOutbox.objects.purge_processed(retention)
+                    last_purge = time.time()
+
+                if not kwargs['loop']:
+                    break
+                time.sleep(kwargs['interval'])
+
+        logger.info('Delivered {} notifications, failed {}, purged {} processed.'.format(
+            count_delivered, count_failed, count_purged,
+        ))
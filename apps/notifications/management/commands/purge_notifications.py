@@ -0,0 +1,61 @@
+
+import os
+import logging
+
+from django.core.management import BaseCommand, CommandError
+
+from ...models import Notification
+from ...retention import get_expired_condition, delete_by_chunks
+
+
+logger = logging.getLogger('django.development')
+
+
+class Command(BaseCommand):
+
+    help = 'Delete notifications out of the retention (setting NOTIFICATIONS_RETENTION) by chunks'
+
+    def add_arguments(self, parser):
+
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Count notifications deleted by a query.',
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=0,
+            help='Seconds of pause after each chunk.',
+        )
+        parser.add_argument(
+            '--max-rows-per-second', type=int, default=None,
+            help='Limit of rate of deleting.',
+        )
+        parser.add_argument(
+            '--archive-dir', default=None,
+            help='Directory for compressed monthly archives of deleted notifications.',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true', default=False,
+            help='Only count notifications out of the retention.',
+        )
+
+    def handle(self, *args, **kwargs):
+
+        archive_dir = kwargs['archive_dir']
+        if archive_dir is not None and not os.path.isdir(archive_dir):
+            raise CommandError('Directory "{}" does not exist.'.format(archive_dir))
+
+        expired_notifications = Notification.objects.filter(get_expired_condition())
+
+        if kwargs['dry_run']:
+            logger.info('{} notifications are out of the retention.'.format(expired_notifications.count()))
+            return
+
+        count_deleted = delete_by_chunks(
+            expired_notifications,
+            chunk_size=kwargs['chunk_size'],
+            sleep=kwargs['sleep'],
+            max_rows_per_second=kwargs['max_rows_per_second'],
+            archive_dir=archive_dir,
+        )
+
+        logger.info('Deleted {} notifications out of the retention.'.format(count_deleted))
@@ -1,31 +1,157 @@
 
-from django.db import models
+import json
+import uuid
+import collections
+
+from django.conf import settings
+from django.db import models, transaction, IntegrityError
+from django.utils import timezone
 # from django.utils.translation import ugettext_lazy as _
+from django.contrib.auth import get_user_model
 
 from .querysets import NotificationQuerySet
+from .counters import increment_count_unread_notifications
 from .constants import Actions
 
 
 class NotificationManager(models.Manager):
     """ """
 
-    def mark_all_as_read(self, recipient=None):
-        pass
+    def bulk_notify(self, recipient_pks, actor=None, target=None, batch_size=500, **options):
+        """
+        Create the same notification for every of users by chunked bulk inserts;
+        the notification is validated once and texts of actor and target are made once.
+        """
+
+        recipient_pks = list(recipient_pks)
+        if not recipient_pks:
+            return list()
+
+        # objects are given only if they are known, otherwise keys from options are kept
+        if actor is not None:
+            options['actor'] = actor
+        if target is not None:
+            options['target'] = target
+        notification = self.model(**options)
+
+        # the same as on saving a notification
+        if target is not None:
+            notification.target_display_text = str(target)
+        if actor is not None:
+            notification.actor_display_text = actor.get_full_name()
+        if notification.is_deleted is True:
+            notification.is_read = True
+
+        notification.full_clean(exclude=('recipient', ))
+
+        # render text once, or per recipient if it is mentioned in the text
+        display_texts = dict()
+        if notification.has_recipient_in_display_text():
+            User = get_user_model()
+            recipients = User._default_manager.in_bulk(recipient_pks)
+            for recipient_pk, recipient in recipients.items():
+                display_texts[str(recipient_pk)] = notification.get_display_text(recipient)
+        else:
+            notification.display_text = notification.get_display_text()
+
+        notification.last_actors = json.dumps([notification.get_actor_display_text()])
+
+        # similar unread notifications of recipients get one more event, instead of new rows
+        if not display_texts and notification.is_read is False:
+            coalesced_pks = self._coalesce(notification, recipient_pks)
+            recipient_pks = [pk for pk in recipient_pks if str(pk) not in coalesced_pks]
+
+        values = {
+            field.attname: getattr(notification, field.attname)
+            for field in self.model._meta.concrete_fields
+            if not field.primary_key and field.name != 'recipient'
+        }
+
+        notifications = list()
+        for recipient_pk in recipient_pks:
+            values['display_text'] = display_texts.get(str(recipient_pk), notification.display_text)
+            notifications.append(self.model(recipient_id=recipient_pk, **values))
+
+        notifications = self.bulk_create(notifications, batch_size=batch_size)
+
+        if notification.is_read is False:
+            increment_count_unread_notifications(recipient_pks)
+
+        return notifications
+
+    def _coalesce(self, notification, recipient_pks):
+        """
+        Add event of the notification to similar unread notifications of recipients, by setting
+        NOTIFICATIONS_COALESCING: for mode 'window' similar ones have the same action and target and
+        were updated within NOTIFICATIONS_COALESCING_WINDOW seconds, for mode 'digest' - the same action
+        and created today. Return primary keys (as strings) of recipients whose notifications got the event.
+        """
+
+        mode = getattr(settings, 'NOTIFICATIONS_COALESCING', {}).get(notification.action)
+        if mode is None:
+            return set()
+
+        now = timezone.now()
+
+        similar = self.filter(
+            recipient_id__in=recipient_pks, action=notification.action, is_read=False, is_deleted=False,
+        )
+        if mode == 'window':
+            window = getattr(settings, 'NOTIFICATIONS_COALESCING_WINDOW', 60 * 60)
+            similar = similar.filter(
+                target_content_type_id=notification.target_content_type_id,
+                target_object_id=notification.target_object_id,
+                updated__gte=now - timezone.timedelta(seconds=window),
+            )
+        elif mode == 'digest':
+            # today of the current time zone, not of UTC
+            similar = similar.filter(
+                created__gte=timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0),
+            )
+        else:
+            raise ValueError('Unknown mode "{}" of coalescing notifications.'.format(mode))
+
+        # the latest similar notification per recipient
+        pks_by_recipient = dict()
+        for pk, recipient_pk, last_actors in similar.order_by('updated').values_list('pk', 'recipient', 'last_actors'):
+            pks_by_recipient[str(recipient_pk)] = (pk, last_actors)
+
+        # one update per distinct list of last actors, usually the same for all recipients
+        count_last_actors = getattr(settings, 'NOTIFICATIONS_COALESCING_COUNT_LAST_ACTORS', 5)
+        pks_by_last_actors = collections.defaultdict(list)
+        for pk, last_actors in pks_by_recipient.values():
+            pks_by_last_actors[last_actors].append(pk)
+
+        for last_actors, pks in pks_by_last_actors.items():
+            actors = [notification.get_actor_display_text()] + json.loads(last_actors or '[]')
+            self.filter(pk__in=pks).update(
+                count_events=models.F('count_events') + 1,
+                last_actors=json.dumps(actors[:count_last_actors]),
+                display_text=notification.display_text,
+                actor_id=notification.actor_id,
+                actor_display_text=notification.actor_display_text,
+                updated=now,
+            )
+
+        return set(pks_by_recipient)
+
+    # flags are changed only for notifications of the recipient
+
+    def mark_all_as_read(self, recipient):
+
+        return self.get_queryset().filter(recipient=recipient).mark_as_read()
+
+    def mark_all_as_deleted(self, recipient):
 
-    def mark_all_as_deleted(self, recipient=None):
-        pass
+        return self.get_queryset().filter(recipient=recipient).mark_as_deleted()
 
-    def mark_all_as_unread(self, recipient=None):
-        pass
+    def mark_all_as_unread(self, recipient):
 
-    def mark_as_deleted(self, recipient=None):
-        pass
+        return self.get_queryset().filter(recipient=recipient).mark_as_unread()
 
-    def mark_as_unread(self, recipient=None):
-        pass
+    def mark_all_as_undeleted(self, recipient):
 
-    def mark_as_read(self, recipient=None):
-        pass
+        return self.get_queryset().filter(recipient=recipient).mark_as_undeleted()
 
 
 NotificationManager = NotificationManager.from_queryset(NotificationQuerySet)
@@ -41,6 +167,8 @@ class NotificationBadgeManager(models.Manager):
         qs = super(NotificationBadgeManager, self).get_queryset()
         qs = qs.filter(action__in=(Actions.LOST_BADGE.value, Actions.EARNED_BADGE.value))
         qs = qs.select_related('recipient', 'actor', 'target_content_type', 'action_target_content_type')
+        # targets are fetched by a query per a type of them
+        qs = qs.prefetch_related('target', 'action_target')
         # qs = qs.prefetch_related('recipient__badges__badge', 'actor__badges__badge')
         return qs
 
@@ -101,6 +229,8 @@ class NotificationActivityManager(models.Manager):
             )
         )
         qs = qs.select_related('recipient', 'actor', 'target_content_type', 'action_target_content_type')
+        # targets are fetched by a query per a type of them
+        qs = qs.prefetch_related('target', 'action_target')
         # qs = qs.prefetch_related('recipient__badges__badge', 'actor__badges__badge')
         return qs
 
@@ -115,5 +245,98 @@ class NotificationReputationManager(models.Manager):
         qs = super(NotificationReputationManager, self).get_queryset()
         qs = qs.filter(action=Actions.UPDATED_REPUTATION.value)
         qs = qs.select_related('recipient', 'actor', 'target_content_type', 'action_target_content_type')
+        # targets are fetched by a query per a type of them
+        qs = qs.prefetch_related('target', 'action_target')
         # qs = qs.prefetch_related('recipient__badges__badge', 'actor__badges__badge')
         return qs
+
+
+class NotificationOutboxManager(models.Manager):
+    """
+    Manager for notifications waiting for delivery.
+    """
+
+    def enqueue(self, payload, idempotency_key=None):
+        """
+        Record the payload of notification in the current transaction; return None if a notification
+        with the same idempotency key, given by the caller, is already recorded.
+        """
+
+        if idempotency_key is None:
+            return self.create(key=uuid.uuid4().hex, payload=json.dumps(payload))
+
+        try:
+            with transaction.atomic():
+                return self.create(key=idempotency_key, payload=json.dumps(payload))
+        except IntegrityError:
+            return None
+
+    def get_pending_pks(self, batch_size, max_attempts):
+
+        return list(
+            self.filter(processed__isnull=True, count_attempts__lt=max_attempts).
+            order_by('created').values_list('pk', flat=True)[:batch_size]
+        )
+
+    def deliver(self, payload, batch_size=500):
+        """Create notifications from the payload for recipients still existing."""
+
+        from .models import Notification
+
+        User = get_user_model()
+
+        payload = dict(payload)
+        recipients = payload.pop('recipients')
+
+        recipient_pks = set(recipients['users'])
+        if recipients['groups']:
+            recipient_pks.update(
+                str(pk) for pk in
+                User._default_manager.filter(groups__pk__in=recipients['groups']).values_list('pk', flat=True)
+            )
+
+        # recipients and actor may be deleted since the action
+        pks = recipient_pks | {payload['actor_id']} - {None}
+        existing_pks = set(str(pk) for pk in User._default_manager.filter(pk__in=pks).values_list('pk', flat=True))
+
+        if payload['actor_id'] not in existing_pks:
+            payload['actor_id'] = None
+
+        recipient_pks = [pk for pk in recipient_pks if pk in existing_pks]
+        return Notification.notifications.bulk_notify(recipient_pks, batch_size=batch_size, **payload)
+
+    def purge_processed(self, days, batch_size=1000):
+        """Delete notifications processed more than the given count of days ago, by chunks; return their count."""
+
+        before = timezone.now() - timezone.timedelta(days=days)
+        qs = self.filter(processed__lt=before)
+
+        count = 0
+        while True:
+            pks = list(qs.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                return count
+            count += self.filter(pk__in=pks).delete()[0]
+
+    def process(self, pk):
+        """
+        Deliver the notification and mark it as processed in the same transaction, so it is delivered
+        at least once, and is not delivered again after commit. Return True if it was delivered.
+        """
+
+        try:
+            with transaction.atomic():
+
+                entry = self.select_for_update().filter(pk=pk, processed__isnull=True).first()
+                if entry is None:
+                    return False
+
+                self.deliver(json.loads(entry.payload))
+
+                entry.processed = timezone.now()
+                entry.save(update_fields=['processed'])
+        except Exception as exc:
+            self.filter(pk=pk).update(count_attempts=models.F('count_attempts') + 1, last_error=repr(exc))
+            raise
+
+        return True
@@ -1,18 +1,25 @@
 
+import json
+
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
-from django.utils.translation import ugettext_lazy as _
+from django.utils.translation import ugettext_lazy as _, ungettext
 from django.db import models
 from django.conf import settings
+from django.contrib.auth import get_user_model
 
 from utils.django.models import UUIDable
 
+from apps.core.registry import registry
+
 from .constants import Actions
+from .counters import increment_count_unread_notifications, reset_count_unread_notifications
 from .managers import (
     NotificationManager,
     NotificationBadgeManager,
     NotificationActivityManager,
     NotificationReputationManager,
+    NotificationOutboxManager,
 )
 
 
@@ -42,6 +49,11 @@ class Notification(UUIDable):
     is_emailed = models.BooleanField(_('is emailed?'), default=True)
 
     created = models.DateTimeField(_('created'), auto_now_add=True)
+    updated = models.DateTimeField(_('updated'), auto_now=True)
+
+    # similar events are merged into one notification, see NotificationManager.bulk_notify
+    count_events = models.PositiveIntegerField(_('count events'), default=1)
+    last_actors = models.TextField(_('last actors'), default='[]', editable=False)
 
     recipient = models.ForeignKey(
         settings.AUTH_USER_MODEL, models.CASCADE,
@@ -62,6 +74,9 @@ class Notification(UUIDable):
     target = GenericForeignKey(ct_field='target_content_type', fk_field='target_object_id')
     target_display_text = models.CharField(_('target'), max_length=200, null=True, blank=True)
 
+    # rendered on creating, so displaying does not touch actor and target
+    display_text = models.TextField(_('display text'), blank=True)
+
     action_target_content_type = models.ForeignKey(
         ContentType, models.SET_NULL, blank=True,
         null=True, related_name='notifications_action_targets',
@@ -81,6 +96,7 @@ class Notification(UUIDable):
         verbose_name_plural = _('notifications')
         get_latest_by = 'created'
         ordering = ('-created', )
+        index_together = (('recipient', 'is_read', 'is_deleted', 'created'), )
 
     def __str__(self):
 
@@ -88,20 +104,50 @@ class Notification(UUIDable):
             recipient = self.recipient if hasattr(self, 'recipient') else 'unknown user'
             return 'for {}'.format(recipient)
 
-        action_display_pattern = self.get_action_display_pattern()
-        target = self.target_display_text if self.target is None else self.target
+        display_text = self.display_text or self.get_display_text()
+        if self.count_events > 1:
+            display_text = '{} ({})'.format(display_text, self.get_count_events_display())
+        return 'for {}: {}'.format(self.recipient, display_text)
+
+    def get_display_text(self, recipient=None):
+        """Return text of the notification by pattern of its action, for the given or own recipient."""
 
-        actor_type = 'ERRRROR' if self.actor is None else self.actor._meta.verbose_name
-        action_display_pattern = action_display_pattern % dict(
+        try:
+            action_display_pattern = self.get_action_display_pattern()
+        except ValueError:
+            return ''
+
+        if recipient is None and self.has_recipient_in_display_text():
+            recipient = self.recipient
+
+        target = self.target_display_text if self.target_display_text else self.target
+
+        actor_type = 'ERRRROR' if self.actor_id is None else get_user_model()._meta.verbose_name
+        return action_display_pattern % dict(
             actor=self.get_actor_display_text(),
             actor_type=actor_type,
             target=target,
             target_type=self.target_type_verbose_name,
             action_target_type=self.action_target_type_verbose_name,
             reputation_deviation=self.get_reputation_deviation(),
-            recipient=self.recipient,
+            recipient=recipient,
         )
-        return 'for {}: {}'.format(self.recipient, action_display_pattern)
+
+    def get_count_events_display(self):
+
+        return ungettext('%(count)s event', '%(count)s events', self.count_events) % dict(count=self.count_events)
+
+    def get_last_actors(self):
+        """Return display texts of the latest actors of merged events, the most recent first."""
+
+        return json.loads(self.last_actors or '[]')
+
+    def has_recipient_in_display_text(self):
+
+        try:
+            return '%(recipient)s' in self.get_action_display_pattern()
+        except ValueError:
+            return False
 
     def save(self, *args, **kwargs):
 
@@ -116,36 +162,47 @@ class Notification(UUIDable):
         if self.is_deleted is True:
             self.is_read = True
 
+        if not self.display_text:
+            self.display_text = self.get_display_text()
+
+        is_new = self._state.adding
+
         self.full_clean()
         super(Notification, self).save(*args, **kwargs)
 
+        if is_new is True and self.is_read is False:
+            increment_count_unread_notifications([self.recipient_id])
+        elif is_new is False:
+            reset_count_unread_notifications([self.recipient_id])
+
+    # flags are changed by single update, without validation and saving all fields
+
+    def _update_flags(self, **flags):
+
+        for name, value in flags.items():
+            setattr(self, name, value)
+        self.__class__.objects.filter(pk=self.pk).update(**flags)
+        reset_count_unread_notifications([self.recipient_id])
+
     def mark_as_read(self):
 
         if self.is_read is False:
-            self.is_read = True
-            self.full_clean()
-            self.save()
+            self._update_flags(is_read=True)
 
     def mark_as_unread(self):
 
-        if self.is_read is True:
-            self.is_read = False
-            self.full_clean()
-            self.save()
+        if self.is_read is True and self.is_deleted is False:
+            self._update_flags(is_read=False)
 
     def mark_as_deleted(self):
 
         if self.is_deleted is False:
-            self.is_deleted = True
-            self.full_clean()
-            self.save()
+            self._update_flags(is_deleted=True, is_read=True)
 
     def mark_as_undeleted(self):
 
         if self.is_deleted is True:
-            self.is_deleted = False
-            self.full_clean()
-            self.save()
+            self._update_flags(is_deleted=False)
 
     def get_target_info(self):
 
@@ -160,7 +217,7 @@ class Notification(UUIDable):
 
     def get_actor_display_text(self):
 
-        if self.actor is None:
+        if self.actor_display_text or self.actor is None:
             return self.actor_display_text
         return self.actor.get_full_name()
 
@@ -170,7 +227,7 @@ class Notification(UUIDable):
         if self.target_content_type is None:
             return 'self.actor_verbose_name'
 
-        target_model = self.target_content_type.model_class()
+        target_model = registry.get_content_type_for_id(self.target_content_type_id).model_class()
         return target_model._meta.verbose_name
 
     @property
@@ -178,7 +235,7 @@ class Notification(UUIDable):
 
         if self.action_target_content_type is not None:
 
-            action_target_model = self.action_target_content_type.model_class()
+            action_target_model = registry.get_content_type_for_id(self.action_target_content_type_id).model_class()
             return action_target_model._meta.verbose_name
 
         return self.target_type_verbose_name
@@ -193,4 +250,34 @@ class Notification(UUIDable):
 
     def get_reputation_deviation(self):
 
-        return Actions.get_reputation_deviation(self.action, self.target_content_type)
+        target_content_type = None
+        if self.target_content_type_id is not None:
+            target_content_type = registry.get_content_type_for_id(self.target_content_type_id)
+        return Actions.get_reputation_deviation(self.action, target_content_type)
+
+
+class NotificationOutbox(UUIDable):
+    """
+    Notification recorded in the transaction of the action, and delivered to recipients later by a worker.
+    """
+
+    key = models.CharField(_('key'), max_length=200, unique=True)
+    payload = models.TextField(_('payload'))
+    created = models.DateTimeField(_('created'), auto_now_add=True)
+    processed = models.DateTimeField(_('processed'), null=True, blank=True)
+    count_attempts = models.PositiveSmallIntegerField(_('count attempts'), default=0)
+    last_error = models.TextField(_('last error'), blank=True)
+
+    objects = models.Manager()
+    objects = NotificationOutboxManager()
+
+    class Meta:
+        verbose_name = _('outgoing notification')
+        verbose_name_plural = _('outgoing notifications')
+        get_latest_by = 'created'
+        ordering = ('created', )
+        index_together = (('processed', 'created'), )
+
+    def __str__(self):
+
+        return self.key
@@ -1,29 +1,72 @@
 
 from django.db import models
 
+from .counters import reset_count_unread_notifications
+
 
 class NotificationQuerySet(models.QuerySet):
     """ """
 
+    def for_recipient(self, recipient=None):
+        """Notifications of the recipient, or all if it is not given."""
+
+        if recipient is None:
+            return self
+        return self.filter(recipient=recipient)
+
     def only_deleted(self, recipient=None):
         """ """
 
-        return self
+        return self.for_recipient(recipient).filter(is_deleted=True)
 
     def only_unread(self, include_deleted=False):
         """ """
 
-        return self
+        qs = self
+        if include_deleted is False:
+            qs = qs.only_non_deleted()
+        return qs.filter(is_read=False)
 
     def only_read(self, include_deleted=False):
         """ """
 
-        return self
+        qs = self
+        if include_deleted is False:
+            qs = qs.only_non_deleted()
+        return qs.filter(is_read=True)
 
     def only_non_deleted(self):
         """ """
 
-        return self
+        return self.filter(is_deleted=False)
+
+    # all of these make single update and return count of changed notifications
+
+    def _update_flags(self, **flags):
+
+        recipient_pks = list(self.order_by().values_list('recipient', flat=True).distinct())
+
+        count = self.update(**flags)
+        if count:
+            reset_count_unread_notifications(recipient_pks)
+        return count
+
+    def mark_as_read(self):
+
+        return self.filter(is_read=False)._update_flags(is_read=True)
+
+    def mark_as_unread(self):
+
+        # deleted notifications are always read
+        return self.filter(is_read=True, is_deleted=False)._update_flags(is_read=False)
+
+    def mark_as_deleted(self):
+
+        return self.filter(is_deleted=False)._update_flags(is_deleted=True, is_read=True)
+
+    def mark_as_undeleted(self):
+
+        return self.filter(is_deleted=True)._update_flags(is_deleted=False)
 
 
 class UserNotificationQuerySet(models.QuerySet):
@@ -0,0 +1,141 @@
+
+import os
+import gzip
+import operator
+import functools
+import json
+import time
+import collections
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.utils import timezone
+
+from .counters import reset_count_unread_notifications
+
+
+DEFAULT_RETENTION = {
+    'default': {'read': 90, 'unread': 365},
+    'levels': {},
+    'actions': {},
+}
+
+
+def _get_expired_condition(policy, now):
+
+    return (
+        models.Q(is_read=True, created__lt=now - timezone.timedelta(days=policy['read'])) |
+        models.Q(is_read=False, created__lt=now - timezone.timedelta(days=policy['unread']))
+    )
+
+
+def get_expired_condition(retention=None, now=None):
+    """
+    Return condition for notifications out of the retention, where for an action and a level
+    are given days of keeping read and unread notifications.
+    """
+
+    if retention is None:
+        retention = getattr(settings, 'NOTIFICATIONS_RETENTION', DEFAULT_RETENTION)
+
+    if now is None:
+        now = timezone.now()
+
+    actions = retention.get('actions', {})
+    levels = retention.get('levels', {})
+
+    conditions = list()
+
+    for action, policy in actions.items():
+        conditions.append(models.Q(action=action) & _get_expired_condition(policy, now))
+
+    for level, policy in levels.items():
+        condition = models.Q(level=level) & _get_expired_condition(policy, now)
+        if actions:
+            condition &= ~models.Q(action__in=list(actions))
+        conditions.append(condition)
+
+    condition = _get_expired_condition(retention['default'], now)
+    if actions:
+        condition &= ~models.Q(action__in=list(actions))
+    if levels:
+        condition &= ~models.Q(level__in=list(levels))
+    conditions.append(condition)
+
+    return functools.reduce(operator.or_, conditions)
+
+
+def iterate_chunks_of_pks(queryset, chunk_size):
+    """Yield primary keys of the queryset by chunks, in order of the keys, each one is a query by range."""
+
+    last_pk = None
+    while True:
+
+        chunk = queryset.order_by('pk')
+        if last_pk is not None:
+            chunk = chunk.filter(pk__gt=last_pk)
+
+        pks = list(chunk.values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            return
+
+        yield pks
+        last_pk = pks[-1]
+
+
+def archive_notifications(rows, archive_dir):
+    """Append the notifications to compressed files per a month of their creating, a line of JSON per row."""
+
+    rows_by_month = collections.defaultdict(list)
+    for row in rows:
+        rows_by_month[row['created'].strftime('%Y-%m')].append(row)
+
+    for month, rows_of_month in rows_by_month.items():
+
+        filename = os.path.join(archive_dir, 'notifications-{}.jsonl.gz'.format(month))
+
+        # appending makes another member of gzip, it is still a valid file
+        with gzip.open(filename, 'at', encoding='utf-8') as file:
+            for row in rows_of_month:
+                file.write(json.dumps(row, cls=DjangoJSONEncoder))
+                file.write('\n')
+
+
+def delete_by_chunks(queryset, chunk_size=1000, sleep=0, max_rows_per_second=None, archive_dir=None):
+    """
+    Delete rows of the queryset by chunks of primary keys, each one in own transaction,
+    optionally archiving them before; return count of deleted rows.
+    """
+
+    count_deleted = 0
+    started = time.monotonic()
+
+    for pks in iterate_chunks_of_pks(queryset, chunk_size):
+
+        with transaction.atomic():
+
+            chunk = queryset.model._default_manager.filter(pk__in=pks)
+
+            if archive_dir is None:
+                recipient_pks = set(chunk.values_list('recipient', flat=True))
+            else:
+                rows = list(chunk.values())
+                recipient_pks = set(row['recipient_id'] for row in rows)
+                archive_notifications(rows, archive_dir)
+
+            chunk.delete()
+            reset_count_unread_notifications(recipient_pks)
+
+        count_deleted += len(pks)
+
+        if sleep:
+            time.sleep(sleep)
+
+        # wait until the rate goes down to the limit
+        if max_rows_per_second:
+            delay = count_deleted / max_rows_per_second - (time.monotonic() - started)
+            if delay > 0:
+                time.sleep(delay)
+
+    return count_deleted
@@ -1,17 +1,18 @@
 
 import uuid
-import collections
 
-from django.contrib.auth.models import Group
+from django.conf import settings
 # from django.core.exceptions import ValidationError
 from django.dispatch import Signal, receiver
 
-from .models import Notification
+from .models import NotificationOutbox
 from .constants import Actions
+from .utils import make_payload
 
 
 notify = Signal(providing_args=[
-    'actor', 'target', 'action', 'is_public', 'is_emailed', 'level', 'action_target', 'recipient'
+    'actor', 'target', 'action', 'is_public', 'is_emailed', 'level', 'action_target', 'recipient',
+    'idempotency_key',
 ])
 
 
@@ -51,25 +52,9 @@ def handle_notify(sender, **kwargs):
     if is_deleted is not None:
         options['is_deleted'] = is_deleted
 
-    if isinstance(recipient, collections.Iterable):
-        recipients = set()
-        for obj in recipient:
-            if isinstance(obj, Group):
-                recipients.update(frozenset(obj.user_set.all()))
-            else:
-                recipients.add(obj)
-    else:
-        if isinstance(recipient, Group):
-            recipients = recipient.user_set.iterator()
-        else:
-            recipients = frozenset({recipient})
-
-    for recipient in recipients:
-
-        options['recipient'] = recipient
+    payload = make_payload(recipient, **options)
 
-        notification = Notification(**options)
-
-        notification.full_clean()
-        # required additional variables
-        notification.save(actor=actor, target=target)
+    if getattr(settings, 'NOTIFICATIONS_DELIVERY', 'sync') == 'outbox':
+        NotificationOutbox.objects.enqueue(payload, idempotency_key=kwargs.get('idempotency_key'))
+    else:
+        NotificationOutbox.objects.deliver(payload)
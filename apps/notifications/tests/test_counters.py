@@ -0,0 +1,87 @@
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.users.factories import UserFactory
+
+from apps.notifications.constants import Actions
+from apps.notifications.models import Notification
+from apps.notifications.counters import (
+    get_count_unread_notifications, increment_count_unread_notifications, reset_count_unread_notifications,
+)
+
+
+def run_on_commit(func):
+
+    func()
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CountUnreadNotificationsTest(TestCase):
+    """
+    Tests for counters of unread notifications kept in the cache.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+
+        cls.recipient = UserFactory()
+
+    def setUp(self):
+
+        cache.clear()
+
+        for action in (Actions.UPDATED_PROFILE.value, Actions.UPDATED_USER.value):
+            Notification.notifications.bulk_notify([self.recipient.pk], action=action, level=Notification.INFO)
+        Notification.notifications.bulk_notify(
+            [self.recipient.pk], action=Actions.REGISTRED_USER.value, level=Notification.INFO, is_deleted=True,
+        )
+
+    def test_count_is_cached(self):
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_count_unread_notifications(self.recipient.pk), 2)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_count_unread_notifications(self.recipient.pk), 2)
+
+    def test_counters_are_changed_only_after_commit(self):
+
+        get_count_unread_notifications(self.recipient.pk)
+
+        increment_count_unread_notifications([self.recipient.pk])
+        reset_count_unread_notifications([self.recipient.pk])
+
+        # the transaction of the test is never committed
+        with self.assertNumQueries(0):
+            self.assertEqual(get_count_unread_notifications(self.recipient.pk), 2)
+
+    @mock.patch('apps.notifications.counters.transaction.on_commit', run_on_commit)
+    def test_increment(self):
+
+        get_count_unread_notifications(self.recipient.pk)
+
+        Notification(recipient=self.recipient, action=Actions.UPDATED_PROFILE.value).save()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_count_unread_notifications(self.recipient.pk), 3)
+
+    @mock.patch('apps.notifications.counters.transaction.on_commit', run_on_commit)
+    def test_increment_missed_counter(self):
+
+        increment_count_unread_notifications([self.recipient.pk])
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_count_unread_notifications(self.recipient.pk), 2)
+
+    @mock.patch('apps.notifications.counters.transaction.on_commit', run_on_commit)
+    def test_reset_on_marking(self):
+
+        get_count_unread_notifications(self.recipient.pk)
+
+        Notification.notifications.mark_all_as_read(self.recipient)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_count_unread_notifications(self.recipient.pk), 0)
@@ -0,0 +1,430 @@
+
+import datetime
+from unittest import mock
+
+from django.utils import timezone
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import Group
+from django.contrib.contenttypes.models import ContentType
+
+from apps.users.factories import UserFactory
+
+from apps.notifications.constants import Actions
+from apps.notifications.models import Notification, NotificationOutbox
+from apps.notifications.signals import notify
+from apps.notifications.utils import make_payload
+
+
+class NotificationOutboxManagerDeliverTest(TestCase):
+    """
+    Tests for delivering notifications from payloads of the outbox.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+
+        cls.actor = UserFactory()
+        cls.target = UserFactory()
+        cls.recipient = UserFactory()
+
+    def test_delivered_notification_keeps_actor_and_target(self):
+
+        payload = make_payload(
+            self.recipient, actor=self.actor, target=self.target,
+            action=Actions.UPDATED_PROFILE.value, level=Notification.INFO,
+        )
+
+        notifications = NotificationOutbox.objects.deliver(payload)
+        self.assertEqual(len(notifications), 1)
+
+        notification = Notification.objects.get(recipient=self.recipient)
+        self.assertEqual(notification.actor_id, self.actor.pk)
+        self.assertEqual(notification.actor_display_text, self.actor.get_full_name())
+        self.assertEqual(notification.target_content_type_id, ContentType.objects.get_for_model(self.target).pk)
+        self.assertEqual(notification.target_object_id, str(self.target.pk))
+        self.assertEqual(notification.target, self.target)
+        self.assertEqual(notification.target_display_text, str(self.target))
+
+    def test_delivered_notification_without_deleted_actor(self):
+
+        actor = UserFactory()
+        payload = make_payload(
+            self.recipient, actor=actor, target=self.target,
+            action=Actions.UPDATED_PROFILE.value, level=Notification.INFO,
+        )
+        actor.delete()
+
+        NotificationOutbox.objects.deliver(payload)
+
+        notification = Notification.objects.get(recipient=self.recipient)
+        self.assertIsNone(notification.actor_id)
+        self.assertEqual(notification.target_object_id, str(self.target.pk))
+
+    def test_deliver_to_users_and_members_of_groups_once(self):
+
+        group = Group.objects.create(name='testers')
+        member, other_member = UserFactory(), UserFactory()
+        member.groups.add(group)
+        other_member.groups.add(group)
+
+        payload = make_payload(
+            [self.recipient, member, group], actor=self.actor,
+            action=Actions.UPDATED_PROFILE.value, level=Notification.INFO,
+        )
+
+        notifications = NotificationOutbox.objects.deliver(payload)
+
+        self.assertEqual(len(notifications), 3)
+        self.assertCountEqual(
+            Notification.objects.values_list('recipient', flat=True), [self.recipient.pk, member.pk, other_member.pk],
+        )
+
+    def test_deliver_without_recipients(self):
+
+        payload = make_payload(None, actor=self.actor, action=Actions.UPDATED_PROFILE.value, level=Notification.INFO)
+
+        self.assertEqual(NotificationOutbox.objects.deliver(payload), [])
+        self.assertFalse(Notification.objects.exists())
+
+
+class NotificationManagerBulkNotifyTest(TestCase):
+    """
+    Tests for creating the same notification for many users by bulk inserts.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+
+        cls.actor = UserFactory()
+        cls.recipients = [UserFactory() for i in range(3)]
+
+    def test_bulk_notify(self):
+
+        notifications = Notification.notifications.bulk_notify(
+            [recipient.pk for recipient in self.recipients], actor=self.actor, target=self.actor,
+            action=Actions.UPDATED_PROFILE.value, level=Notification.INFO, batch_size=2,
+        )
+
+        self.assertEqual(len(notifications), 3)
+        for notification in Notification.objects.all():
+            self.assertEqual(notification.actor_id, self.actor.pk)
+            self.assertEqual(notification.target, self.actor)
+            self.assertEqual(notification.display_text, '{} updated profile'.format(self.actor.get_full_name()))
+            self.assertFalse(notification.is_read)
+
+    def test_bulk_notify_renders_text_per_recipient(self):
+
+        Notification.notifications.bulk_notify(
+            [recipient.pk for recipient in self.recipients],
+            action=Actions.REPUTATION_PARTICIPATE_IN_POLL.value, level=Notification.SUCCESS,
+        )
+
+        for recipient in self.recipients:
+            notification = Notification.objects.get(recipient=recipient)
+            self.assertIn(str(recipient), notification.display_text)
+
+    def test_bulk_notify_deleted_notification_is_read(self):
+
+        Notification.notifications.bulk_notify(
+            [self.recipients[0].pk], actor=self.actor,
+            action=Actions.UPDATED_PROFILE.value, level=Notification.INFO, is_deleted=True,
+        )
+
+        self.assertTrue(Notification.objects.get().is_read)
+
+    def test_bulk_notify_without_recipients(self):
+
+        with self.assertNumQueries(0):
+            self.assertEqual(Notification.notifications.bulk_notify([], action=Actions.UPDATED_PROFILE.value), [])
+
+
+class NotificationOutboxManagerEnqueueTest(TestCase):
+    """
+    Tests for recording, processing and purging notifications in the outbox.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+
+        cls.actor = UserFactory()
+        cls.recipient = UserFactory()
+
+    def get_payload(self, action=Actions.UPDATED_PROFILE.value):
+
+        return make_payload(self.recipient, actor=self.actor, action=action, level=Notification.INFO)
+
+    def test_equal_payloads_are_recorded_every_time(self):
+
+        self.assertIsNotNone(NotificationOutbox.objects.enqueue(self.get_payload()))
+        self.assertIsNotNone(NotificationOutbox.objects.enqueue(self.get_payload()))
+
+        self.assertEqual(NotificationOutbox.objects.count(), 2)
+
+    def test_payloads_with_the_same_idempotency_key_are_recorded_once(self):
+
+        self.assertIsNotNone(NotificationOutbox.objects.enqueue(self.get_payload(), idempotency_key='a'))
+        self.assertIsNotNone(NotificationOutbox.objects.enqueue(self.get_payload(), idempotency_key='b'))
+        self.assertIsNone(
+            NotificationOutbox.objects.enqueue(self.get_payload(Actions.UPDATED_USER.value), idempotency_key='a'),
+        )
+
+        self.assertEqual(NotificationOutbox.objects.count(), 2)
+
+    def test_process(self):
+
+        entry = NotificationOutbox.objects.enqueue(self.get_payload())
+
+        self.assertTrue(NotificationOutbox.objects.process(entry.pk))
+        self.assertFalse(NotificationOutbox.objects.process(entry.pk))
+
+        entry.refresh_from_db()
+        self.assertIsNotNone(entry.processed)
+        self.assertEqual(Notification.objects.filter(recipient=self.recipient).count(), 1)
+        self.assertEqual(NotificationOutbox.objects.get_pending_pks(10, 5), [])
+
+    def test_purge_processed(self):
+
+        old = NotificationOutbox.objects.enqueue(self.get_payload(), idempotency_key='old')
+        recent = NotificationOutbox.objects.enqueue(self.get_payload(), idempotency_key='recent')
+        pending = NotificationOutbox.objects.enqueue(self.get_payload(), idempotency_key='pending')
+
+        now = timezone.now()
+        NotificationOutbox.objects.filter(pk=old.pk).update(processed=now - timezone.timedelta(days=8))
+        NotificationOutbox.objects.filter(pk=recent.pk).update(processed=now - timezone.timedelta(days=6))
+
+        self.assertEqual(NotificationOutbox.objects.purge_processed(7, batch_size=1), 1)
+        self.assertQuerysetEqual(
+            NotificationOutbox.objects.order_by('key'), [pending.pk, recent.pk], transform=lambda entry: entry.pk,
+        )
+
+
+class NotifySignalTest(TestCase):
+    """
+    Tests for delivering notifications in the request or by the outbox.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+
+        cls.actor = UserFactory()
+        cls.recipient = UserFactory()
+
+    def send(self, **kwargs):
+
+        notify.send(
+            None, actor=self.actor, recipient=self.recipient,
+            action=Actions.UPDATED_PROFILE.value, level=Notification.INFO, **kwargs
+        )
+
+    @override_settings(NOTIFICATIONS_DELIVERY='sync')
+    def test_sync_delivery(self):
+
+        self.send()
+        self.send()
+
+        self.assertEqual(Notification.objects.filter(recipient=self.recipient).count(), 2)
+        self.assertFalse(NotificationOutbox.objects.exists())
+
+    @override_settings(NOTIFICATIONS_DELIVERY='outbox')
+    def test_outbox_delivery(self):
+
+        self.send()
+        self.send()
+        self.send(idempotency_key='login')
+        self.send(idempotency_key='login')
+
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(NotificationOutbox.objects.count(), 3)
+
+
+class NotificationQuerySetMarkTest(TestCase):
+    """
+    Tests for changing flags of all notifications of a recipient by single updates.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+
+        cls.recipient, cls.other_recipient = UserFactory(), UserFactory()
+
+    def setUp(self):
+
+        for action in (Actions.UPDATED_PROFILE.value, Actions.UPDATED_USER.value):
+            Notification.notifications.bulk_notify(
+                [self.recipient.pk, self.other_recipient.pk], action=action, level=Notification.INFO,
+            )
+        Notification.objects.filter(recipient=self.recipient, action=Actions.UPDATED_USER.value).update(is_read=True)
+
+    def get_flags(self, recipient):
+
+        return sorted(Notification.objects.filter(recipient=recipient).values_list('is_read', 'is_deleted'))
+
+    def test_mark_all_as_read_and_unread(self):
+
+        with self.assertNumQueries(2):
+            self.assertEqual(Notification.notifications.mark_all_as_read(self.recipient), 1)
+        self.assertEqual(self.get_flags(self.recipient), [(True, False), (True, False)])
+        self.assertEqual(self.get_flags(self.other_recipient), [(False, False), (False, False)])
+
+        self.assertEqual(Notification.notifications.mark_all_as_read(self.recipient), 0)
+
+        self.assertEqual(Notification.notifications.mark_all_as_unread(self.recipient), 2)
+        self.assertEqual(self.get_flags(self.recipient), [(False, False), (False, False)])
+
+    def test_mark_all_as_deleted_and_undeleted(self):
+
+        self.assertEqual(Notification.notifications.mark_all_as_deleted(self.recipient), 2)
+        self.assertEqual(self.get_flags(self.recipient), [(True, True), (True, True)])
+
+        # deleted notifications are always read
+        self.assertEqual(Notification.notifications.mark_all_as_unread(self.recipient), 0)
+
+        self.assertEqual(Notification.notifications.mark_all_as_undeleted(self.recipient), 2)
+        self.assertEqual(self.get_flags(self.recipient), [(True, False), (True, False)])
+
+    def test_mark_all_requires_recipient(self):
+
+        with self.assertRaises(TypeError):
+            Notification.notifications.mark_all_as_read()
+
+        self.assertEqual(Notification.objects.filter(is_read=False).count(), 3)
+
+
+@override_settings(
+    NOTIFICATIONS_COALESCING={
+        Actions.UPDATED_PROFILE.value: 'window',
+        Actions.USER_LOGGED_IN.value: 'digest',
+        Actions.UPDATED_USER.value: 'weekly',
+    },
+    NOTIFICATIONS_COALESCING_WINDOW=60 * 60,
+    NOTIFICATIONS_COALESCING_COUNT_LAST_ACTORS=2,
+)
+class NotificationManagerCoalesceTest(TestCase):
+    """
+    Tests for merging similar notifications of a recipient into one.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+
+        cls.recipient = UserFactory()
+        cls.other_recipient = UserFactory()
+        cls.actors = [UserFactory() for i in range(3)]
+        cls.target, cls.other_target = UserFactory(), UserFactory()
+
+    def notify(self, actor, action=Actions.UPDATED_PROFILE.value, target=None, recipients=None):
+
+        if target is None:
+            target = self.target
+
+        if recipients is None:
+            recipients = [self.recipient]
+
+        return Notification.notifications.bulk_notify(
+            [recipient.pk for recipient in recipients], actor=actor, target=target,
+            action=action, level=Notification.INFO,
+        )
+
+    def test_window(self):
+
+        self.notify(self.actors[0])
+        self.assertEqual(self.notify(self.actors[1]), [])
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.count_events, 2)
+        self.assertEqual(notification.get_last_actors(), [actor.get_full_name() for actor in self.actors[1::-1]])
+        self.assertEqual(notification.actor_id, self.actors[1].pk)
+        self.assertEqual(notification.display_text, '{} updated profile'.format(self.actors[1].get_full_name()))
+
+        self.notify(self.actors[2])
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.count_events, 3)
+        self.assertEqual(notification.get_last_actors(), [actor.get_full_name() for actor in self.actors[:0:-1]])
+
+    def test_window_of_other_target(self):
+
+        self.notify(self.actors[0])
+        self.notify(self.actors[1], target=self.other_target)
+
+        self.assertEqual(Notification.objects.count(), 2)
+        self.assertFalse(Notification.objects.filter(count_events__gt=1).exists())
+
+    def test_window_is_expired(self):
+
+        self.notify(self.actors[0])
+        Notification.objects.update(updated=timezone.now() - timezone.timedelta(seconds=60 * 60 + 1))
+
+        self.notify(self.actors[1])
+
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_read_notifications_are_not_coalesced(self):
+
+        self.notify(self.actors[0])
+        Notification.notifications.mark_all_as_read(self.recipient)
+
+        self.notify(self.actors[1])
+
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_coalesce_per_recipient(self):
+
+        self.notify(self.actors[0])
+
+        notifications = self.notify(self.actors[1], recipients=[self.recipient, self.other_recipient])
+
+        self.assertEqual([notification.recipient_id for notification in notifications], [self.other_recipient.pk])
+        self.assertEqual(Notification.objects.get(recipient=self.recipient).count_events, 2)
+        self.assertEqual(Notification.objects.get(recipient=self.other_recipient).count_events, 1)
+
+    def test_digest(self):
+
+        self.notify(self.actors[0], action=Actions.USER_LOGGED_IN.value)
+        self.notify(self.actors[1], action=Actions.USER_LOGGED_IN.value, target=self.other_target)
+
+        self.assertEqual(Notification.objects.get().count_events, 2)
+
+        Notification.objects.update(created=timezone.now() - timezone.timedelta(days=1))
+        self.notify(self.actors[2], action=Actions.USER_LOGGED_IN.value)
+
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_digest_uses_today_of_current_time_zone(self):
+
+        now = datetime.datetime(2026, 1, 10, 20, 0, tzinfo=timezone.utc)
+
+        with timezone.override('Europe/Kiev'), mock.patch('django.utils.timezone.now', return_value=now):
+            self.notify(self.actors[0], action=Actions.USER_LOGGED_IN.value)
+
+            # after midnight of Kiev, but before midnight of UTC
+            Notification.objects.update(created=datetime.datetime(2026, 1, 9, 23, 0, tzinfo=timezone.utc))
+            self.notify(self.actors[1], action=Actions.USER_LOGGED_IN.value)
+
+        self.assertEqual(Notification.objects.get().count_events, 2)
+
+    def test_action_without_coalescing(self):
+
+        self.notify(self.actors[0], action=Actions.USER_LOGGED_OUT.value)
+        self.notify(self.actors[1], action=Actions.USER_LOGGED_OUT.value)
+
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_unknown_mode(self):
+
+        with self.assertRaises(ValueError):
+            self.notify(self.actors[0], action=Actions.UPDATED_USER.value)
+
+    def test_deliver(self):
+
+        for actor in self.actors[:2]:
+            payload = make_payload(
+                self.recipient, actor=actor, target=self.target,
+                action=Actions.UPDATED_PROFILE.value, level=Notification.INFO,
+            )
+            NotificationOutbox.objects.deliver(payload)
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.count_events, 2)
+        self.assertEqual(notification.target, self.target)
+        self.assertEqual(notification.get_last_actors(), [actor.get_full_name() for actor in self.actors[1::-1]])
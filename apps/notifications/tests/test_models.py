@@ -1,7 +1,144 @@
 
-import random
+from django.test import TestCase
+from django.contrib.contenttypes.models import ContentType
 
-import factory
-from factory import fuzzy
+from apps.users.factories import UserFactory
+from apps.polls.models import Poll
 
-from .models import *
+from apps.notifications.constants import Actions
+from apps.notifications.models import Notification
+
+
+class NotificationDisplayTextTest(TestCase):
+    """
+    Tests for texts of notifications rendered on creating.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+
+        cls.actor = UserFactory()
+        cls.recipient = UserFactory()
+
+    def create_notification(self, action=Actions.USER_ADDED_TO_GROUP.value, target=None, **kwargs):
+
+        if target is None:
+            target = self.recipient
+
+        notification = Notification(recipient=self.recipient, actor=self.actor, target=target, action=action, **kwargs)
+        notification.save(actor=self.actor, target=target)
+        return notification
+
+    def test_display_text_is_rendered_on_creating(self):
+
+        notification = self.create_notification()
+
+        self.assertEqual(notification.display_text, '{} added to {} "{}"'.format(
+            self.actor.get_full_name(), self.recipient._meta.verbose_name, self.recipient,
+        ))
+
+    def test_str_uses_rendered_text(self):
+
+        self.create_notification()
+        notification = Notification.objects.select_related('recipient').get()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(str(notification), 'for {}: {}'.format(self.recipient, notification.display_text))
+
+    def test_display_text_of_unknown_action(self):
+
+        notification = Notification(recipient=self.recipient, action='unknown')
+
+        self.assertEqual(notification.get_display_text(), '')
+        self.assertFalse(notification.has_recipient_in_display_text())
+
+    def test_display_text_with_recipient(self):
+
+        notification = Notification(
+            recipient=self.recipient, action=Actions.REPUTATION_PARTICIPATE_IN_POLL.value,
+            target_content_type=ContentType.objects.get_for_model(Poll),
+        )
+
+        self.assertTrue(notification.has_recipient_in_display_text())
+        self.assertEqual(
+            notification.get_display_text(), 'reputation of {} was changed on +1'.format(self.recipient),
+        )
+        self.assertEqual(
+            notification.get_display_text(self.actor), 'reputation of {} was changed on +1'.format(self.actor),
+        )
+
+    def test_reputation_deviation(self):
+
+        poll_content_type = ContentType.objects.get_for_model(Poll)
+
+        self.assertEqual(Actions.get_reputation_deviation(Actions.REPUTATION_PARTICIPATE_IN_POLL.value, poll_content_type), '+1')
+        self.assertEqual(Actions.get_reputation_deviation(Actions.REPUTATION_UNDO_PARTICIPATE_IN_POLL.value, poll_content_type), '-1')
+
+    def test_targets_are_prefetched_by_query_per_type(self):
+
+        for index in range(3):
+            self.create_notification(target=UserFactory())
+
+        with self.assertNumQueries(2):
+            notifications = list(Notification.notifications_activity.all())
+            targets = [notification.target for notification in notifications]
+
+        self.assertEqual(len(targets), 3)
+        self.assertTrue(all(target is not None for target in targets))
+
+
+class NotificationMarkTest(TestCase):
+    """
+    Tests for changing flags of notifications by single updates.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+
+        cls.recipient = UserFactory()
+
+    def setUp(self):
+
+        self.notification = Notification(recipient=self.recipient, action=Actions.UPDATED_PROFILE.value)
+        self.notification.save()
+
+    def assertFlags(self, is_read, is_deleted):
+
+        for notification in (self.notification, Notification.objects.get(pk=self.notification.pk)):
+            self.assertEqual((notification.is_read, notification.is_deleted), (is_read, is_deleted))
+
+    def test_mark_as_read_and_unread(self):
+
+        with self.assertNumQueries(1):
+            self.notification.mark_as_read()
+        self.assertFlags(is_read=True, is_deleted=False)
+
+        with self.assertNumQueries(0):
+            self.notification.mark_as_read()
+
+        with self.assertNumQueries(1):
+            self.notification.mark_as_unread()
+        self.assertFlags(is_read=False, is_deleted=False)
+
+    def test_mark_as_deleted_and_undeleted(self):
+
+        with self.assertNumQueries(1):
+            self.notification.mark_as_deleted()
+        self.assertFlags(is_read=True, is_deleted=True)
+
+        # deleted notifications are always read
+        with self.assertNumQueries(0):
+            self.notification.mark_as_unread()
+        self.assertFlags(is_read=True, is_deleted=True)
+
+        with self.assertNumQueries(1):
+            self.notification.mark_as_undeleted()
+        self.assertFlags(is_read=True, is_deleted=False)
+
+    def test_mark_does_not_change_other_fields(self):
+
+        Notification.objects.filter(pk=self.notification.pk).update(display_text='changed meanwhile')
+
+        self.notification.mark_as_read()
+
+        self.assertEqual(Notification.objects.get(pk=self.notification.pk).display_text, 'changed meanwhile')
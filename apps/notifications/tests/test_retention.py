@@ -0,0 +1,131 @@
+
+import os
+import gzip
+import json
+import shutil
+import tempfile
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.users.factories import UserFactory
+
+from apps.notifications.constants import Actions
+from apps.notifications.models import Notification
+from apps.notifications.retention import get_expired_condition, delete_by_chunks
+
+
+RETENTION = {
+    'default': {'read': 90, 'unread': 365},
+    'levels': {
+        Notification.ERROR: {'read': 180, 'unread': 365},
+    },
+    'actions': {
+        Actions.USER_LOGGED_IN.value: {'read': 7, 'unread': 30},
+    },
+}
+
+
+class RetentionTest(TestCase):
+    """
+    Tests for deleting notifications out of the retention by chunks.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+
+        cls.recipient = UserFactory()
+
+    def setUp(self):
+
+        self.now = timezone.now()
+
+    def create_notification(self, days, action=Actions.UPDATED_PROFILE.value, level=Notification.INFO, is_read=False):
+
+        notification = Notification(recipient=self.recipient, action=action, level=level)
+        notification.save()
+
+        created = self.now - timezone.timedelta(days=days)
+        Notification.objects.filter(pk=notification.pk).update(created=created, is_read=is_read)
+        return notification.pk
+
+    def get_expired_pks(self):
+
+        return set(Notification.objects.filter(get_expired_condition(RETENTION, self.now)).values_list('pk', flat=True))
+
+    def test_default_policy(self):
+
+        expired_pks = {
+            self.create_notification(91, is_read=True),
+            self.create_notification(366),
+        }
+        self.create_notification(89, is_read=True)
+        self.create_notification(200)
+
+        self.assertEqual(self.get_expired_pks(), expired_pks)
+
+    def test_policy_of_level(self):
+
+        expired_pks = {self.create_notification(181, level=Notification.ERROR, is_read=True)}
+        self.create_notification(91, level=Notification.ERROR, is_read=True)
+
+        self.assertEqual(self.get_expired_pks(), expired_pks)
+
+    def test_policy_of_action_has_priority(self):
+
+        expired_pks = {
+            self.create_notification(8, action=Actions.USER_LOGGED_IN.value, is_read=True),
+            self.create_notification(31, action=Actions.USER_LOGGED_IN.value, level=Notification.ERROR),
+        }
+        self.create_notification(6, action=Actions.USER_LOGGED_IN.value, is_read=True)
+        self.create_notification(29, action=Actions.USER_LOGGED_IN.value)
+
+        self.assertEqual(self.get_expired_pks(), expired_pks)
+
+    def test_delete_by_chunks(self):
+
+        kept_pk = self.create_notification(1)
+        for days in (100, 200, 300):
+            self.create_notification(days, is_read=True)
+
+        expired_notifications = Notification.objects.filter(get_expired_condition(RETENTION, self.now))
+
+        self.assertEqual(delete_by_chunks(expired_notifications, chunk_size=2), 3)
+
+        self.assertEqual(list(Notification.objects.values_list('pk', flat=True)), [kept_pk])
+
+    def test_delete_with_archiving(self):
+
+        pk = self.create_notification(100, is_read=True)
+        self.create_notification(1)
+
+        archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, archive_dir)
+
+        expired_notifications = Notification.objects.filter(get_expired_condition(RETENTION, self.now))
+        self.assertEqual(delete_by_chunks(expired_notifications, archive_dir=archive_dir), 1)
+
+        filenames = os.listdir(archive_dir)
+        self.assertEqual(len(filenames), 1)
+
+        with gzip.open(os.path.join(archive_dir, filenames[0]), 'rt', encoding='utf-8') as file:
+            rows = [json.loads(line) for line in file]
+
+        self.assertEqual([row[Notification._meta.pk.attname] for row in rows], [str(pk)])
+
+    def test_command(self):
+
+        self.create_notification(400)
+        self.create_notification(1)
+
+        call_command('purge_notifications', '--dry-run')
+        self.assertEqual(Notification.objects.count(), 2)
+
+        call_command('purge_notifications', '--chunk-size', '1')
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_command_with_missing_archive_dir(self):
+
+        with self.assertRaises(CommandError):
+            call_command('purge_notifications', '--archive-dir', os.path.join(tempfile.gettempdir(), 'missing', 'dir'))
@@ -0,0 +1,54 @@
+
+from django.test import TestCase
+from django.contrib.auth.models import Group
+from django.contrib.contenttypes.models import ContentType
+
+from apps.users.factories import UserFactory
+
+from apps.notifications.utils import get_recipient_references, make_payload
+
+
+class UtilsTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+
+        cls.user1, cls.user2 = UserFactory(), UserFactory()
+        cls.group = Group.objects.create(name='testers')
+
+    def test_get_recipient_references(self):
+
+        self.assertEqual(get_recipient_references(self.user1), ([str(self.user1.pk)], []))
+        self.assertEqual(get_recipient_references(self.group), ([], [self.group.pk]))
+        self.assertEqual(get_recipient_references(None), ([], []))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                get_recipient_references([self.user1, self.group, self.user2, self.user1, None]),
+                ([str(self.user1.pk), str(self.user2.pk)], [self.group.pk]),
+            )
+
+    def test_make_payload(self):
+
+        payload = make_payload(self.group, actor=self.user1, target=self.user2, action='updated_profile')
+
+        self.assertEqual(payload, dict(
+            action='updated_profile',
+            actor_id=str(self.user1.pk),
+            actor_display_text=self.user1.get_full_name(),
+            target_content_type_id=ContentType.objects.get_for_model(self.user2).pk,
+            target_object_id=str(self.user2.pk),
+            target_display_text=str(self.user2),
+            action_target_content_type_id=None,
+            action_target_object_id=None,
+            recipients=dict(users=[], groups=[self.group.pk]),
+        ))
+
+    def test_make_payload_without_actor_and_target(self):
+
+        payload = make_payload(self.user1, action='updated_profile')
+
+        self.assertIsNone(payload['actor_id'])
+        self.assertIsNone(payload['target_content_type_id'])
+        self.assertNotIn('target_display_text', payload)
+        self.assertEqual(payload['recipients'], dict(users=[str(self.user1.pk)], groups=[]))
@@ -0,0 +1,59 @@
+
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.test import TestCase, RequestFactory, override_settings
+
+from apps.users.factories import UserFactory
+
+from apps.notifications.constants import Actions
+from apps.notifications.models import Notification
+from apps.notifications.context_processors import count_unread_notifications
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CountUnreadNotificationsViewTest(TestCase):
+    """
+    Tests for getting count unread notifications of the user.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+
+        cls.user = UserFactory(is_active=True)
+
+    def setUp(self):
+
+        cache.clear()
+
+        Notification.notifications.bulk_notify(
+            [self.user.pk], action=Actions.UPDATED_PROFILE.value, level=Notification.INFO,
+        )
+
+    def test_count(self):
+
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('count_unread'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'count': 1})
+
+        response = self.client.get(reverse('count_unread'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_count_for_anonymous_user(self):
+
+        response = self.client.get(reverse('count_unread'))
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_context_processor_counts_lazily(self):
+
+        request = RequestFactory().get('/')
+        request.user = self.user
+
+        with self.assertNumQueries(0):
+            context = count_unread_notifications(request)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(context['COUNT_UNREAD_NOTIFICATIONS'], 1)
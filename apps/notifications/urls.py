@@ -2,10 +2,12 @@
 from django.conf.urls import url
 
 # from .views import NotificationDetailView
+from .views import count_unread_notifications
 
 
 name = 'notifications'
 
 urlpatterns = [
+    url(r'^unread/count/$', count_unread_notifications, {}, 'count_unread'),
     # url(r'notification/(?P<account_email>[-\w]+@[-\w]+.\w+)/$', NotificationDetailView.as_view(), {}, 'notification'),
 ]
@@ -1 +1,52 @@
 
+import collections
+
+from django.contrib.auth.models import Group
+from django.contrib.contenttypes.models import ContentType
+
+
+def get_recipient_references(recipient):
+    """Return primary keys of users and groups from an user, a group or an iterable of them, without queries."""
+
+    if isinstance(recipient, collections.Iterable):
+        recipients = recipient
+    else:
+        recipients = (recipient, )
+
+    user_pks, group_pks = collections.OrderedDict(), collections.OrderedDict()
+    for obj in recipients:
+        if isinstance(obj, Group):
+            group_pks[obj.pk] = None
+        elif obj is not None:
+            user_pks[str(obj.pk)] = None
+    return list(user_pks), list(group_pks)
+
+
+def make_payload(recipient, actor=None, target=None, action_target=None, **options):
+    """
+    Return serializable values of fields of notification, so it can be delivered
+    even if its actor, target or recipients are deleted meanwhile.
+    """
+
+    payload = dict(options)
+
+    payload['actor_id'] = None
+    if actor is not None:
+        payload['actor_id'] = str(actor.pk)
+        payload['actor_display_text'] = actor.get_full_name()
+
+    for name, obj in (('target', target), ('action_target', action_target)):
+        payload[name + '_content_type_id'] = None
+        payload[name + '_object_id'] = None
+        if obj is not None:
+            payload[name + '_content_type_id'] = ContentType.objects.get_for_model(obj).pk
+            payload[name + '_object_id'] = str(obj.pk)
+
+    if target is not None:
+        payload['target_display_text'] = str(target)
+
+    user_pks, group_pks = get_recipient_references(recipient)
+    payload['recipients'] = dict(users=user_pks, groups=group_pks)
+
+    return payload
+
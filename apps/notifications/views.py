@@ -1,9 +1,31 @@
 
+from django.http import JsonResponse
+from django.views.decorators.http import condition, require_GET
 from django.views.generic import DetailView
 
+from .counters import get_count_unread_notifications
+
 # from .models import Notification
 
 
 # class NotificationDetailView(DetailView):
 #     model = Notification
 #     template_name = "TEMPLATE_NAME"
+
+
+def _get_etag_of_count_unread_notifications(request):
+
+    if not request.user.is_authenticated():
+        return None
+    return '{}-{}'.format(request.user.pk, get_count_unread_notifications(request.user.pk))
+
+
+@require_GET
+@condition(etag_func=_get_etag_of_count_unread_notifications)
+def count_unread_notifications(request):
+    """Return count unread notifications of the user as JSON, or 304 if it was not changed for the client."""
+
+    if not request.user.is_authenticated():
+        return JsonResponse({'error': 'Authentication required.'}, status=403)
+
+    return JsonResponse({'count': get_count_unread_notifications(request.user.pk)})
@@ -8,3 +8,7 @@ class PollsConfig(AppConfig):
     name = "apps.polls"
     verbose_name = _("Polls")
     label = 'polls'
+
+    def ready(self):
+
+        from .signals import decrease_count_votes
@@ -8,6 +8,7 @@ from factory import fuzzy
 
 from utils.django.basecommands import FactoryCountBaseCommand
 
+from apps.core.dispatch import suspend_model_signals
 from apps.polls.factories import PollFactory, ChoiceFactory
 from apps.polls.models import Poll, Choice, Vote
 from apps.polls.constants import MIN_COUNT_CHOICES_IN_POLL, MAX_COUNT_CHOICES_IN_POLL
@@ -25,6 +26,7 @@ class Command(FactoryCountBaseCommand):
 
         parser.add_argument('count_polls', nargs=1, type=self._positive_integer_from_1_to_999)
 
+    @suspend_model_signals()
     def handle(self, *args, **kwargs):
 
         count_polls = kwargs['count_polls'][0]
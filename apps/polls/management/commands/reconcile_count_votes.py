@@ -0,0 +1,37 @@
+
+import logging
+
+from django.core.management import BaseCommand
+
+from apps.polls.models import Poll, Choice, Vote
+
+
+logger = logging.getLogger('django.development')
+
+
+class Command(BaseCommand):
+
+    help = 'Set the actual counts of votes of polls and choices, where they differ from the votes'
+
+    def add_arguments(self, parser):
+
+        parser.add_argument(
+            '--dry-run', action='store_true', default=False,
+            help='Only count polls and choices with wrong counts of votes.',
+        )
+
+    def handle(self, *args, **kwargs):
+
+        dry_run = kwargs['dry_run']
+
+        count_fixed_polls = Vote.objects.reconcile_count_votes(Poll, 'poll', dry_run=dry_run)
+        count_fixed_choices = Vote.objects.reconcile_count_votes(Choice, 'choice', dry_run=dry_run)
+
+        if dry_run:
+            logger.info('{} polls and {} choices have wrong counts of votes.'.format(
+                count_fixed_polls, count_fixed_choices,
+            ))
+        else:
+            logger.info('Fixed counts of votes of {} polls and {} choices.'.format(
+                count_fixed_polls, count_fixed_choices,
+            ))
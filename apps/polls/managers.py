@@ -1,12 +1,6 @@
 
-import datetime
-import itertools
-
 from django.utils.translation import ugettext_lazy as _
-from django.db import models
-from django.utils import timezone
-
-from dateutil.relativedelta import relativedelta
+from django.db import models, transaction
 
 from utils.django.functions_db import Round
 
@@ -196,10 +190,75 @@ class ChoiceManager(models.Manager):
             )
         )['avg']
 
+    def get_results_polls(self, polls=None):
+        """
+        Return results of the polls by a single grouped query, as dictionary
+        {pk of poll: ((Choice, count votes), ...)}, where choices are in a descending order by count votes.
+        Polls without choices are not presented in the dictionary.
+        """
+
+        choices_with_count_votes = self.choices_with_count_votes().order_by('poll', '-count_votes')
+
+        if polls is not None:
+            choices_with_count_votes = choices_with_count_votes.filter(poll__in=polls)
+
+        results = dict()
+        for choice in choices_with_count_votes.iterator():
+            results.setdefault(choice.poll_id, list()).append((choice, choice.count_votes))
+
+        return {poll_pk: tuple(result) for poll_pk, result in results.items()}
+
 
 class VoteManager(models.Manager):
     """ """
 
+    def change_count_votes(self, poll_pk, choice_pk, delta):
+        """Change counts of votes of the poll and the choice (if passed) on the delta, by atomic updates."""
+
+        from .models import Poll, Choice
+
+        count_votes = models.functions.Greatest(models.F('count_votes') + delta, 0)
+
+        if poll_pk is not None:
+            Poll._default_manager.filter(pk=poll_pk).update(count_votes=count_votes)
+
+        if choice_pk is not None:
+            Choice._default_manager.filter(pk=choice_pk).update(count_votes=count_votes)
+
+    def reconcile_count_votes(self, model, field_name, dry_run=False):
+        """
+        Set the actual counts of votes for objects of the model (Poll or Choice) where they differ,
+        by the field of vote, pointing to the model. Return count of fixed objects.
+        """
+
+        actual_counts = dict(
+            self.order_by().values_list(field_name).annotate(count=models.Count('pk')).values_list(field_name, 'count')
+        )
+
+        count_fixed = 0
+
+        for pk, count_votes in model._default_manager.values_list('pk', 'count_votes').iterator():
+
+            if count_votes == actual_counts.get(pk, 0):
+                continue
+
+            if dry_run:
+                count_fixed += 1
+                continue
+
+            # count again under a lock of the object, since votes can be changed meanwhile
+            with transaction.atomic():
+                obj = model._default_manager.select_for_update().filter(pk=pk).first()
+                if obj is None:
+                    continue
+
+                actual_count_votes = self.filter(**{field_name: pk}).count()
+                if obj.count_votes != actual_count_votes:
+                    model._default_manager.filter(pk=pk).update(count_votes=actual_count_votes)
+                    count_fixed += 1
+
+        return count_fixed
+
     def get_count_distinct_voters(self):
         """ """
 
@@ -225,39 +284,7 @@ class VoteManager(models.Manager):
         month return as localized format - (month_name, year)
         """
 
-        now = timezone.now()
-
-        # date exactly eleven months ago
-        exact_eleven_months_ago = now - relativedelta(months=11)
-
-        # go to start new day of the first day a month
-        eleven_months_ago = exact_eleven_months_ago.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-        # votes for this month and eleven months ago (considering from start day of first day month)
-        objs = self.filter(date_voting__range=[eleven_months_ago, now])
-
-        # iteration number months, starting in past year month + 1, ending in this month
-        numbers_months = itertools.chain.from_iterable([range(now.month + 1, 12 + 1), range(1, now.month + 1)])
-
-        result = []
-        for month_number in numbers_months:
-            # get an objects by the month`s number
-            # given that, we have a dates range with an unique numbers of months
-            objs_count = objs.filter(date_voting__month=month_number).count()
-
-            # if number of month is more than current, than it was in past year
-            if month_number > now.month:
-                year = now.year - 1
-
-            else:
-                year = now.year
-
-            # create a datetime object, in order to get string representation datetime as next: AbbrMonth, Year
-            month_year_name = datetime.datetime(year=year, month=month_number, day=1).strftime('%b %Y')
-
-            result.append((month_year_name, objs_count))
-
-        return result
+        return get_statistics_count_objects_for_the_past_year(self, 'created')
 
     def get_latest_vote(self):
         """ """
@@ -270,7 +297,7 @@ class VoteManager(models.Manager):
     def get_statistics_count_votes_for_the_past_year(self):
         """ """
 
-        return get_statistics_count_objects_for_the_past_year(self, 'date_voting')
+        return get_statistics_count_objects_for_the_past_year(self, 'created')
 
     def get_chart_count_votes_for_the_past_year(self):
         """ """
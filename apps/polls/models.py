@@ -1,6 +1,4 @@
 
-import itertools
-
 from django.template import Context, Template
 from django.utils.html import mark_safe, escape, format_html
 from django.template.defaultfilters import truncatechars
@@ -9,7 +7,7 @@ from django.core.exceptions import ValidationError
 from django.core.urlresolvers import reverse
 from django.core.validators import MinLengthValidator
 from django.utils.translation import ugettext_lazy as _
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 
 import pygal
@@ -58,6 +56,7 @@ class Poll(Timestampable, UUIDable):
         through_fields=['poll', 'user'],
         verbose_name=_('voters'),
     )
+    count_votes = models.PositiveIntegerField(_('count votes'), default=0, editable=False)
 
     objects = models.Manager()
     objects = PollManager.from_queryset(PollQuerySet)()
@@ -84,47 +83,27 @@ class Poll(Timestampable, UUIDable):
     def get_most_popular_choice_or_choices(self):
         """Return a most popular choice/choices of that poll, as queryset."""
 
-        # determinating a count votes for choices this poll
-        choices_with_count_votes = self.choices.choices_with_count_votes()
+        if not self.count_votes:
+            return []
 
         # get max count votes from all choices
-        max_count_votes = choices_with_count_votes.aggregate(max_count_votes=models.Max('count_votes'))
-        max_count_votes = max_count_votes['max_count_votes']
-
-        if max_count_votes == 0:
-            return []
+        max_count_votes = self.choices.order_by('-count_votes').values_list('count_votes', flat=True).first()
 
         # filter choice or choices with max count votes
-        choices_with_max_count_votes = choices_with_count_votes.filter(count_votes=max_count_votes)
-
-        return choices_with_max_count_votes
+        return self.choices.filter(count_votes=max_count_votes)
 
     def get_result(self):
         """Return as a sequnce details about result poll: (Choice, count votes)."""
 
-        # determinate count votes in each choices
-        # and make an order of choices by descending
-        choices_with_count_votes = self.choices.choices_with_count_votes().order_by('-count_votes')
+        # make an order of choices by descending of count votes
+        choices = self.choices.order_by('-count_votes')
 
-        # get count votes of an each choice
-        count_votes_of_choices = choices_with_count_votes.values_list('count_votes')
-
-        # make as flatten list
-        count_votes_of_choices = itertools.chain.from_iterable(count_votes_of_choices)
-
-        # make two-nested list: (choice, count_votes)
-        result = zip(choices_with_count_votes, count_votes_of_choices)
-
-        # convert generator to tuple and to return it
-        return tuple(result)
+        return tuple((choice, choice.count_votes) for choice in choices)
 
     def get_count_votes(self):
         """Return count total votes in poll."""
 
-        if hasattr(self, 'count_votes'):
-            return self.count_votes
-
-        return self.votes.count()
+        return self.count_votes
     get_count_votes.admin_order_field = 'count_votes'
     get_count_votes.short_description = _('Count votes')
 
@@ -190,6 +169,7 @@ class Choice(UUIDable):
         on_delete=models.CASCADE, related_name='choices',
     )
     text_choice = models.TextField(_('text choice'))
+    count_votes = models.PositiveIntegerField(_('count votes'), default=0, editable=False)
 
     objects = models.Manager()
     objects = ChoiceManager.from_queryset(ChoiceQuerySet)()
@@ -215,7 +195,7 @@ class Choice(UUIDable):
     natural_key.dependencies = ['polls.Poll']
 
     def get_count_votes(self):
-        return self.votes.count()
+        return self.count_votes
     get_count_votes.short_description = _('Count votes')
     get_count_votes.admin_order_field = 'count_votes'
 
@@ -264,6 +244,33 @@ class Vote(UUIDable):
     def __str__(self):
         return _('In a poll "{0.poll}"').format(self)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+
+        instance = super(Vote, cls).from_db(db, field_names, values)
+
+        # keep a loaded choice, to move the vote between counts of choices on saving
+        instance._loaded_choice_id = instance.__dict__.get('choice_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Save the vote and change counts of votes of its poll and choice in the same transaction."""
+
+        is_adding = self._state.adding
+        loaded_choice_id = getattr(self, '_loaded_choice_id', None)
+
+        with transaction.atomic():
+
+            super(Vote, self).save(*args, **kwargs)
+
+            if is_adding:
+                type(self)._default_manager.change_count_votes(self.poll_id, self.choice_id, 1)
+            elif loaded_choice_id is not None and loaded_choice_id != self.choice_id:
+                type(self)._default_manager.change_count_votes(None, loaded_choice_id, -1)
+                type(self)._default_manager.change_count_votes(None, self.choice_id, 1)
+
+        self._loaded_choice_id = self.choice_id
+
     def unique_error_message(self, model_class, unique_check):
         """A custom text for fields in meta-attribute unique_together."""
 
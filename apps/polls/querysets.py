@@ -23,9 +23,9 @@ class PollQuerySet(models.QuerySet):
         return self.filter(status=self.model.CHOICES_STATUS.draft)
 
     def polls_with_count_votes(self):
-        """Determining count a votes for each poll in a queryset."""
+        """Count a votes for each poll is kept in the field count_votes, so nothing is to determinate."""
 
-        return self.annotate(count_votes=models.Count('votes', distinct=True))
+        return self.all()
 
     def polls_with_count_choices(self):
         """Determining count a votes for each poll in a queryset."""
@@ -53,9 +53,9 @@ class ChoiceQuerySet(models.QuerySet):
     """
 
     def choices_with_count_votes(self):
-        """Return the queryset where each a choice have determined count a votes."""
+        """Count a votes for each choice is kept in the field count_votes, so nothing is to determinate."""
 
-        return self.annotate(count_votes=models.Count('votes', distinct=True))
+        return self.all()
 
 
 class UserPollQuerySet(models.QuerySet):
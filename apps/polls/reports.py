@@ -1,12 +1,20 @@
 
 from io import BytesIO
+import os
+import atexit
 import random
+import tempfile
 import textwrap
+import functools
+import itertools
+import threading
+import multiprocessing
 
 from django.utils.text import force_text
+from django.utils.functional import cached_property
 from django.utils.translation import ugettext as _
 from django.utils import timezone
-from django.http import HttpResponse
+from django.http import HttpResponse, FileResponse
 from django.contrib.auth import get_user_model
 from django.conf import settings
 
@@ -55,6 +63,13 @@ User = get_user_model()
 logger = create_logger_by_filename(__name__)
 
 
+FONTS = (
+    ('DejaVuSans', 'DejaVuSans.ttf'),
+    ('FreeSans', 'FreeSans.ttf'),
+    ('FreeSansBold', 'FreeSansBold.ttf'),
+)
+
+
 SUBJECTS_HUMAN_NAMES = {
     'polls': _('Polls'),
     'choices': _('Choices'),
@@ -88,15 +103,21 @@ class ExcelReport(object):
         # count row for shift to objects on Excel sheet
         self.objects_shift = 5
 
-        #
-        self.all_polls = Poll.objects.prefetch_related('choices', 'votes', 'voters')
+        # counts are annotated instead of prefetching, because objects are read by an iterator
+        self.all_polls = Poll.objects.polls_with_count_votes().polls_with_count_choices()
         self.all_votes = Vote.objects.select_related('poll', 'user', 'choice')
-        self.all_choices = Choice.objects.select_related('poll').prefetch_related('votes')
+        self.all_choices = Choice.objects.select_related('poll').choices_with_count_votes()
 
         #
-        self.count_polls = self.all_polls.count()
+        self.count_polls = Poll.objects.count()
         self.count_choices = Choice.objects.count()
-        self.count_votes = self.all_votes.count()
+        self.count_votes = Vote.objects.count()
+
+    @cached_property
+    def results_polls(self):
+        """Results of all polls, got by a single query."""
+
+        return Choice.objects.get_results_polls()
 
     # Set up the document
 
@@ -106,9 +127,11 @@ class ExcelReport(object):
         # get user
         logger.info('A user {0} demand a report in the Excel about polls'.format(self.author))
 
-        # create in-memory file for writting
-        self.output = BytesIO()
-        workbook = xlsxwriter.Workbook(self.output)
+        # create a temporary file for writting; in the mode constant_memory rows are flushed
+        # to a disk as soon as a next row is written, so they must be written in order
+        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as file:
+            self.filename = file.name
+        workbook = xlsxwriter.Workbook(self.filename, {'constant_memory': True})
         logger.debug('Created a workbook for report in the Excel')
 
         # add properties to document
@@ -143,10 +166,20 @@ class ExcelReport(object):
         return subjects.capitalize()
 
     def create_response(self):
-        """Create a response with attached a Excel file """
+        """Create a response streaming a written Excel file from a disk."""
+
+        file = open(self.filename, 'rb')
+        size = os.path.getsize(self.filename)
+
+        # the opened file is still readable, so remove it from a disk right away
+        os.remove(self.filename)
 
         # create response for Excel
-        response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+        response = FileResponse(
+            file,
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
+        response['Content-Length'] = size
 
         # get filename and attach it to the response
         filename = get_filename_with_datetime(_('Report about polls'), 'xlsx')
@@ -157,43 +190,46 @@ class ExcelReport(object):
     def make_report(self):
         """Create a report, on based information, about an exists polls."""
 
-        #
+        try:
+            self.workbook.add_worksheet(_('Statistics'))
+            self.fillup_sheet_statistics()
+
+            # adding needed worksheets and to fill up it
+            if 'polls' in self.subjects:
+                self.workbook.add_worksheet(_('Polls'))
+                self.fillup_sheet_polls()
+            if 'choices' in self.subjects:
+                self.workbook.add_worksheet(_('Choices'))
+                self.fillup_sheet_choices()
+            if 'votes' in self.subjects:
+                self.workbook.add_worksheet(_('Votes'))
+                self.fillup_sheet_votes()
+            if 'voters' in self.subjects:
+                self.workbook.add_worksheet(_('Voters'))
+                self.fillup_sheet_voters()
+            if 'results' in self.subjects:
+                self.workbook.add_worksheet(_('Results'))
+                self.fillup_sheet_results()
+
+            logger.debug('Added worksheets to the workbook')
+
+            # close the workbook, as well as to write the Excel document on a disk
+            self.workbook.close()
+        except Exception:
+            os.remove(self.filename)
+            raise
+
+        # the Excel document is streamed by the response from the disk
         response = self.create_response()
-
-        self.workbook.add_worksheet(_('Statistics'))
-        self.fillup_sheet_statistics()
-
-        # adding needed worksheets and to fill up it
-        if 'polls' in self.subjects:
-            self.workbook.add_worksheet(_('Polls'))
-            self.fillup_sheet_polls()
-        if 'choices' in self.subjects:
-            self.workbook.add_worksheet(_('Choices'))
-            self.fillup_sheet_choices()
-        if 'votes' in self.subjects:
-            self.workbook.add_worksheet(_('Votes'))
-            self.fillup_sheet_votes()
-        if 'voters' in self.subjects:
-            self.workbook.add_worksheet(_('Voters'))
-            self.fillup_sheet_voters()
-        if 'results' in self.subjects:
-            self.workbook.add_worksheet(_('Results'))
-            self.fillup_sheet_results()
-
-        logger.debug('Added worksheets to the workbook')
-
-        # close the workbook, as well as to write the Excel document in the response and to return it
-        self.workbook.close()
-        response.write(self.output.getvalue())
-        logger.debug('Wrote a PDF in the response')
+        logger.debug('Attached an Excel document to the response')
         logger.info('Succefully created a report about polls in Excel for user {0}'.format(self.author))
         return response
 
     # Common methods for majority sheets
 
-    @property
+    @cached_property
     def get_formats(self):
-        """Return all styled formats for Excel document as dictionary."""
+        """Return all styled formats for Excel document as dictionary (are added to the workbook once)."""
 
         return dict(
             title=self.workbook.add_format({
@@ -304,8 +340,9 @@ class ExcelReport(object):
             sheet.set_row(self.objects_shift, 50)
         else:
 
-            # number row for writting information about object
-            for num_obj, obj in enumerate(qs):
+            # number row for writting information about object;
+            # objects are read by chunks, without keeping them in a memory
+            for num_obj, obj in enumerate(qs.iterator()):
                 num_row = num_obj + self.objects_shift
 
                 # as num_obj is started from 0, than make it +1
@@ -352,6 +389,20 @@ class ExcelReport(object):
 
         self.write_title(title, sheet, count_fields)
 
+        # heights of rows must be set before writting to them
+        sheet.set_column(0, 1, 20)
+        sheet.set_row(4, 40)
+        sheet.set_row(9, 40)
+        sheet.set_row(10, 40)
+        sheet.set_row(11, 40)
+        sheet.set_row(12, 40)
+        sheet.set_row(13, 40)
+        sheet.set_row(15, 40)
+        sheet.set_row(16, 60)
+        sheet.set_row(17, 60)
+        sheet.set_row(18, 60)
+        sheet.set_row(19, 40)
+
         sheet.merge_range('A5:B5', _('Common statistics'), self.get_formats['table_cell_title'])
         sheet.write('A6', _('Count polls'), self.get_formats['table_cell_header'])
         sheet.write('B6', self.count_polls, self.get_formats['table_cell_centered'])
@@ -390,19 +441,6 @@ class ExcelReport(object):
         else:
             sheet.merge_range('A17:B20', _('Votes are not exists yet'), self.get_formats['empty_row'])
 
-        sheet.set_column(0, 1, 20)
-        sheet.set_row(4, 40)
-        sheet.set_row(9, 40)
-        sheet.set_row(10, 40)
-        sheet.set_row(11, 40)
-        sheet.set_row(12, 40)
-        sheet.set_row(13, 40)
-        sheet.set_row(15, 40)
-        sheet.set_row(16, 60)
-        sheet.set_row(17, 60)
-        sheet.set_row(18, 60)
-        sheet.set_row(19, 40)
-
     def fillup_sheet_polls(self):
         """ """
 
@@ -470,10 +508,13 @@ class ExcelReport(object):
         func = self.write_vote
 
         self.write_title(title, sheet, count_fields)
+
+        # the statistics is placed upper the votes, so it is written before them
+        self.write_count_votes_by_months_for_past_year()
+
         self.write_field_names(field_names, sheet)
         self.write_objects(sheet, count_fields, 'Votes are not exists yet', qs, func)
 
-        self.write_count_votes_by_months_for_past_year()
         chart = self.get_chart_votes_for_past_year()
         sheet.insert_chart('H6', chart)
 
@@ -508,7 +549,7 @@ class ExcelReport(object):
 
         row_len = count_fields - 1
 
-        for i, poll in enumerate(self.all_polls):
+        for i, poll in enumerate(self.all_polls.iterator()):
 
             if i == 0:
                 num_row = self.objects_shift
@@ -551,7 +592,7 @@ class ExcelReport(object):
             )
             sheet.set_row(num_row, 40)
 
-            result_poll = poll.get_result_poll()
+            result_poll = self.results_polls.get(poll.pk, ())
 
             num_row += 1
             sheet.write_row(
@@ -735,13 +776,13 @@ class ExcelReport(object):
 
         dates, count_votes = zip(*stat)
 
-        sheet.write('H3', _('Month, year'), self.get_formats['table_cell_bold'])
-        sheet.write('H4', _('Count votes'), self.get_formats['table_cell_bold'])
         sheet.merge_range('H2:T2', _('Count votes for the past year'), self.get_formats['title'])
         sheet.set_column('H:H', 20)
         sheet.set_row(2, 30)
         sheet.set_row(3, 30)
+        sheet.write('H3', _('Month, year'), self.get_formats['table_cell_bold'])
         sheet.write_row('I3', dates, self.get_formats['table_cell_centered'])
+        sheet.write('H4', _('Count votes'), self.get_formats['table_cell_bold'])
         sheet.write_row('I4', count_votes, self.get_formats['table_cell_centered'])
 
     # Add formulas
@@ -881,22 +922,155 @@ class ExcelReport(object):
         return chart
 
 
-class PollPDFReport(object):
+def register_fonts():
+    """Register fonts for the PDF reports, if they are not registered in the current process yet."""
+
+    registered_fonts = pdfmetrics.getRegisteredFontNames()
+
+    for name, filename in FONTS:
+        if name not in registered_fonts:
+            pdfmetrics.registerFont(TTFont(name, filename))
+
+
+@functools.lru_cache()
+def get_styles():
+    """Return a sheet of styles for the PDF reports; it is created once per a process."""
+
+    styles = getSampleStyleSheet()
+
+    # Styles for paragraphs
+
+    styles.add(ParagraphStyle(
+        'RightParagraph',
+        alignment=TA_RIGHT,
+        parent=styles['Normal'],
+        fontName='FreeSans',
+        fontSize=12,
+        spaceAfter=inch / 4,
+    ))
+    styles.add(ParagraphStyle(
+        'JustifyParagraph',
+        alignment=TA_JUSTIFY,
+        parent=styles['Normal'],
+        fontName='FreeSans',
+        fontSize=14,
+        leading=20,
+    ))
+    styles.add(ParagraphStyle(
+        'CenterNormal',
+        alignment=TA_CENTER,
+        parent=styles['Normal'],
+        fontName='FreeSans',
+    ))
+    styles.add(ParagraphStyle(
+        'TitleReport',
+        alignment=TA_CENTER,
+        fontSize=28,
+        fontName='FreeSansBold',
+        leading=inch / 2,
+    ))
+    styles.add(ParagraphStyle(
+        'TitlePage',
+        alignment=TA_CENTER,
+        fontSize=15,
+        fontName='FreeSansBold',
+    ))
+    styles.add(ParagraphStyle(
+        'TableCaption',
+        alignment=TA_CENTER,
+        fontSize=15,
+        fontName='FreeSansBold',
+        leading=inch / 2,
+    ))
+    styles.add(ParagraphStyle(
+        'SubjectHeader',
+        parent=styles['Heading2'],
+        fontName='FreeSansBold',
+        spaceAfter=inch / 2,
+        leftIndent=4,
+    ))
+    styles.add(ParagraphStyle(
+        'DefinitionUnicode',
+        parent=styles['Definition'],
+        fontName='FreeSans',
+    ))
+    styles.add(ParagraphStyle(
+        'ItalicCenter',
+        parent=styles['Italic'],
+        alignment=TA_CENTER,
+    ))
+    styles.add(ParagraphStyle(
+        'Warning',
+        parent=styles['Italic'],
+        textColor='red',
+        spaceBefore=inch / 2,
+        fontSize=15,
+        leftIndent=4,
+    ))
+
+    return styles
+
+
+def render_chart_result_poll(width, top_margin, result_poll):
+    """
+    Return a drawing with a chart of result of a poll, where widgets are already drawn as primitive shapes,
+    so it can be made in a worker process and only placed on a page after.
+    """
+
+    chart = PollPDFReport.get_canvas_chart_result_poll(width, top_margin, result_poll)
+    return chart.expandUserNodes()
+
+
+def _init_charts_worker():
+    """Prepare a worker process of the pool of charts once: register fonts and make styles."""
+
+    register_fonts()
+    get_styles()
+
+
+_charts_pool = None
+_charts_pool_processes = None
+_charts_pool_lock = threading.Lock()
+
+
+def get_charts_pool(processes):
     """
+    Return the pool of worker processes rendering charts of results of polls, created on the first call
+    and shared by all reports of the process, so the workers are prepared once.
+    """
+
+    global _charts_pool, _charts_pool_processes
+
+    with _charts_pool_lock:
+        if _charts_pool is None or _charts_pool_processes != processes:
+            if _charts_pool is not None:
+                _charts_pool.terminate()
+            _charts_pool = multiprocessing.Pool(processes, initializer=_init_charts_worker)
+            _charts_pool_processes = processes
+        return _charts_pool
+
+
+@atexit.register
+def _terminate_charts_pool():
 
+    if _charts_pool is not None:
+        _charts_pool.terminate()
+
+
+register_fonts()
+
+
+class PollPDFReport(object):
     """
 
-    # register fonts
-    pdfmetrics.registerFont(TTFont('DejaVuSans', 'DejaVuSans.ttf'))
-    pdfmetrics.registerFont(TTFont('FreeSans', 'FreeSans.ttf'))
-    pdfmetrics.registerFont(TTFont('FreeSansBold', 'FreeSansBold.ttf'))
+    """
 
     def __init__(self, request, subjects, *args, **kwargs):
         # super(self.__class__, self).__init__(self, *args, **kwargs)
         self.now = timezone.now()
         self.author = request.user.get_full_name()
         self.subjects = tuple(subject for subject in subjects if subject is not None)
-        self.styles = getSampleStyleSheet()
+        self.styles = get_styles()
         self.slavic_aryan_year = get_year_by_slavic_aryan_calendar(self.now)
         self.request = request
         self.buffer = BytesIO()
@@ -913,6 +1087,12 @@ class PollPDFReport(object):
         self.all_votes = Vote.objects.select_related('poll', 'user', 'choice')
         self.all_choices = Choice.objects.select_related('poll').prefetch_related('votes')
 
+    @cached_property
+    def results_polls(self):
+        """Results of all polls, got by a single query."""
+
+        return Choice.objects.get_results_polls()
+
     def get_doc(self):
         """ """
 
@@ -969,77 +1149,7 @@ class PollPDFReport(object):
         ])
 
     def add_styles(self):
-        """Add styles specific for polls."""
-
-        # Styles for paragraphs
-
-        self.styles.add(ParagraphStyle(
-            'RightParagraph',
-            alignment=TA_RIGHT,
-            parent=self.styles['Normal'],
-            fontName='FreeSans',
-            fontSize=12,
-            spaceAfter=inch / 4,
-        ))
-        self.styles.add(ParagraphStyle(
-            'JustifyParagraph',
-            alignment=TA_JUSTIFY,
-            parent=self.styles['Normal'],
-            fontName='FreeSans',
-            fontSize=14,
-            leading=20,
-        ))
-        self.styles.add(ParagraphStyle(
-            'CenterNormal',
-            alignment=TA_CENTER,
-            parent=self.styles['Normal'],
-            fontName='FreeSans',
-        ))
-        self.styles.add(ParagraphStyle(
-            'TitleReport',
-            alignment=TA_CENTER,
-            fontSize=28,
-            fontName='FreeSansBold',
-            leading=inch / 2,
-        ))
-        self.styles.add(ParagraphStyle(
-            'TitlePage',
-            alignment=TA_CENTER,
-            fontSize=15,
-            fontName='FreeSansBold',
-        ))
-        self.styles.add(ParagraphStyle(
-            'TableCaption',
-            alignment=TA_CENTER,
-            fontSize=15,
-            fontName='FreeSansBold',
-            leading=inch / 2,
-        ))
-        self.styles.add(ParagraphStyle(
-            'SubjectHeader',
-            parent=self.styles['Heading2'],
-            fontName='FreeSansBold',
-            spaceAfter=inch / 2,
-            leftIndent=4,
-        ))
-        self.styles.add(ParagraphStyle(
-            'DefinitionUnicode',
-            parent=self.styles['Definition'],
-            fontName='FreeSans',
-        ))
-        self.styles.add(ParagraphStyle(
-            'ItalicCenter',
-            parent=self.styles['Italic'],
-            alignment=TA_CENTER,
-        ))
-        self.styles.add(ParagraphStyle(
-            'Warning',
-            parent=self.styles['Italic'],
-            textColor='red',
-            spaceBefore=inch / 2,
-            fontSize=15,
-            leftIndent=4,
-        ))
+        """Add styles of tables specific for polls."""
 
         # Styles for tables
 
@@ -1428,6 +1538,8 @@ class PollPDFReport(object):
         self._write_subject_header(story, SUBJECTS_HUMAN_NAMES['results'])
 
         if self.count_polls:
+            charts_results_polls = self.render_charts_results_polls()
+
             # draw results all of the polls by PieChart
             # where a each chart will be placed on a separated page
             for poll in self.all_polls:
@@ -1439,9 +1551,8 @@ class PollPDFReport(object):
                 story.append(PageBreak())
 
                 # add canvas with result of poll in the form of table
-                if poll.get_count_votes():
-                    canvas_chart_result_poll = self.get_canvas_chart_result_poll(poll)
-                    story.append(canvas_chart_result_poll)
+                if poll.pk in charts_results_polls:
+                    story.append(charts_results_polls[poll.pk])
                     story.append(PageBreak())
         else:
             story.append(Paragraph(_('Polls are not exists yet'), self.styles['Warning']))
@@ -1601,11 +1712,39 @@ class PollPDFReport(object):
 
         return canvas
 
-    def get_canvas_chart_result_poll(self, poll):
-        """ """
+    def render_charts_results_polls(self):
+        """
+        Render charts of results of polls with votes in the shared pool of processes (setting
+        POLLS_REPORTS_CHARTS_PROCESSES, None - count of CPUs, 1 - in the current process)
+        and return them as dictionary {pk of poll: drawing}, in the order of polls.
+        """
+
+        polls_pks = list()
+        arguments = list()
+
+        for poll_pk, result_poll in self.results_polls.items():
+            if any(count_votes for choice, count_votes in result_poll):
+                polls_pks.append(poll_pk)
+                result_poll = tuple((force_text(choice), count_votes) for choice, count_votes in result_poll)
+                arguments.append((self.doc.width, self.doc.topMargin, result_poll))
+
+        processes = getattr(settings, 'POLLS_REPORTS_CHARTS_PROCESSES', None)
+
+        if len(arguments) < 2 or processes == 1:
+            charts = list(itertools.starmap(render_chart_result_poll, arguments))
+        else:
+            charts = get_charts_pool(processes).starmap(render_chart_result_poll, arguments)
+
+        logger.debug('Rendered {} charts of results of polls'.format(len(charts)))
+
+        return dict(zip(polls_pks, charts))
+
+    @classmethod
+    def get_canvas_chart_result_poll(cls, width, top_margin, result_poll):
+        """Return a canvas with a pie chart of a result of a poll, passed as pairs (choice, count votes)."""
 
         # create canvas place on page
-        canvas = Drawing(self.doc.width, 300 + self.doc.topMargin)
+        canvas = Drawing(width, 300 + top_margin)
 
         # create pie chart
         chart = Pie()
@@ -1622,20 +1761,16 @@ class PollPDFReport(object):
         # add a pointing lines between a slice and its label
         chart.sideLabels = 1
 
-        # get a result of the poll as two-nested list
-        # as next: (choice, count votes in that choice)
-        result_poll = poll.get_result_poll()
-
         # make unpack a nested list in a two lists
         # the first - for choices, the second - for count votes in an each choice
         choices, votes = zip(*(result_poll))
         count_choices = len(choices)
 
         # get names of a unique colors using in ReportLab by passed count
-        colors_for_chart = self._get_colors_for_chart(count_choices)
+        colors_for_chart = cls._get_colors_for_chart(count_choices)
 
         # get a string representation of the each choice and break it on lines, if need
-        choices = self._wrap_text_choice_for_legend(choices)
+        choices = cls._wrap_text_choice_for_legend(choices)
 
         # make two-nested list as next: (color, object)
         objects_with_colors = tuple(zip(colors_for_chart, choices))
@@ -1716,7 +1851,8 @@ class PollPDFReport(object):
         tbl = Table(data, style=self.PollTableStyle, colWidths=[inch * 2, inch * 4])
         return tbl
 
-    def _get_colors_for_chart(self, count_colors):
+    @staticmethod
+    def _get_colors_for_chart(count_colors):
         """Return unique color`s names from all default ReportLab`s colors"""
 
         # get the all reportLab`s colors names as a dictionary {color_name: rgba()}
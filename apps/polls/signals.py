@@ -0,0 +1,14 @@
+
+import uuid
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Vote
+
+
+@receiver(post_delete, sender=Vote, dispatch_uid=uuid.uuid4)
+def decrease_count_votes(sender, instance, **kwargs):
+    """Decrease counts of votes of the poll and the choice, in the transaction of deleting of the vote."""
+
+    sender._default_manager.change_count_votes(instance.poll_id, instance.choice_id, -1)
@@ -685,6 +685,49 @@ class PollManagerTest(TestCase):
         self.assertEqual(Poll.objects.get_average_count_choices_in_polls(), 1)
 
 
+class ChoiceManagerTest(TestCase):
+    """ """
+
+    @classmethod
+    def setUpTestData(cls):
+
+        cls.user1 = UserFactory()
+        cls.user2 = UserFactory()
+
+    def setUp(self):
+
+        # create a polls with choices
+        call_command('factory_test_polls', '2', '--without-votes')
+
+        self.poll1, self.poll2 = Poll.objects.all()
+
+    def test_get_results_polls_if_no_votes(self):
+
+        results = Choice.objects.get_results_polls()
+
+        self.assertCountEqual(results[self.poll1.pk], ((choice, 0) for choice in self.poll1.choices.all()))
+        self.assertCountEqual(results[self.poll2.pk], ((choice, 0) for choice in self.poll2.choices.all()))
+
+    def test_get_results_polls_if_exists_votes(self):
+
+        Choice.objects.filter().delete()
+        choice1 = ChoiceFactory(poll=self.poll1)
+        choice2 = ChoiceFactory(poll=self.poll1)
+        self.poll1.votes.create(choice=choice2, user=self.user1)
+        self.poll1.votes.create(choice=choice2, user=self.user2)
+
+        with self.assertNumQueries(1):
+            results = Choice.objects.get_results_polls()
+
+        self.assertEqual(results, {self.poll1.pk: ((choice2, 2), (choice1, 0))})
+
+    def test_get_results_polls_for_given_polls(self):
+
+        results = Choice.objects.get_results_polls(Poll.objects.filter(pk=self.poll2.pk))
+
+        self.assertEqual(list(results), [self.poll2.pk])
+
+
 class VoteManagerTest(TestCase):
     """ """
 
@@ -734,6 +777,51 @@ class VoteManagerTest(TestCase):
 
         self.assertEqual(Vote.objects.get_count_voters(), 3)
 
+    def test_counts_votes_are_changed_with_votes(self):
+
+        choice1, choice2 = self.poll1.choices.all()[:2]
+
+        vote = self.user1.votes.create(poll=self.poll1, choice=choice1)
+        self.user2.votes.create(poll=self.poll1, choice=choice1)
+
+        self.poll1.refresh_from_db()
+        choice1.refresh_from_db()
+        self.assertEqual(self.poll1.count_votes, 2)
+        self.assertEqual(choice1.count_votes, 2)
+
+        # change a choice of the vote
+        vote = Vote.objects.get(pk=vote.pk)
+        vote.choice = choice2
+        vote.save()
+
+        choice1.refresh_from_db()
+        choice2.refresh_from_db()
+        self.assertEqual(choice1.count_votes, 1)
+        self.assertEqual(choice2.count_votes, 1)
+
+        Vote.objects.filter(user=self.user2).delete()
+
+        self.poll1.refresh_from_db()
+        choice1.refresh_from_db()
+        self.assertEqual(self.poll1.count_votes, 1)
+        self.assertEqual(choice1.count_votes, 0)
+
+    def test_reconcile_count_votes(self):
+
+        choice = self.poll1.choices.first()
+        self.user1.votes.create(poll=self.poll1, choice=choice)
+
+        Poll.objects.filter(pk=self.poll1.pk).update(count_votes=5)
+        Choice.objects.filter(pk=choice.pk).update(count_votes=0)
+
+        self.assertEqual(Vote.objects.reconcile_count_votes(Poll, 'poll', dry_run=True), 1)
+        self.assertEqual(Vote.objects.reconcile_count_votes(Poll, 'poll'), 1)
+        self.assertEqual(Vote.objects.reconcile_count_votes(Choice, 'choice'), 1)
+        self.assertEqual(Vote.objects.reconcile_count_votes(Poll, 'poll'), 0)
+
+        self.assertEqual(Poll.objects.get(pk=self.poll1.pk).count_votes, 1)
+        self.assertEqual(Choice.objects.get(pk=choice.pk).count_votes, 1)
+
     def test_get_latest_vote_if_no_votes(self):
 
         self.assertIsNone(Vote.objects.get_latest_vote())
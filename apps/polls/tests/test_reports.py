@@ -6,6 +6,7 @@ from unittest import mock
 from unittest import skip
 
 from django.core.management import call_command
+from django.test import TestCase, override_settings
 
 import pytest
 from PyPDF2 import PdfFileReader
@@ -22,6 +23,7 @@ from utils.django.test_utils import EnhancedTestCase
 from config.admin import AdminSite
 from apps.polls.models import Poll, Vote
 from apps.polls.admin import PollAdmin
+from apps.polls.reports import PollPDFReport, get_charts_pool
 from apps.polls.factories import PollFactory, ChoiceFactory
 
 
@@ -1496,7 +1498,7 @@ class PollExcelReportWithoutObjectsTests(EnhancedTestCase):
             request = self.factory.post('admin:polls_make_report', self.data)
             request.user = self.active_superuser
             response = self.PollAdmin.view_make_report(request)
-            self.excelfile = openpyxl.load_workbook(io.BytesIO(response.getvalue()))
+            self.excelfile = openpyxl.load_workbook(io.BytesIO(b''.join(response.streaming_content)))
 
             # tests for basic of generated document
             self._tests_basic_document()
@@ -1523,3 +1525,67 @@ class PollExcelReportWithoutObjectsTests(EnhancedTestCase):
             # tests for sheet of 'Results'
             if 'results' in self.data:
                 self._tests_for_sheet_results_if_no_results()
+
+
+class PollPDFReportChartsResultsPollsTests(TestCase):
+    """
+    Tests for rendering charts of results of polls for the PDF report.
+    """
+
+    def setUp(self):
+
+        request = mock.Mock()
+        request.user.get_full_name.return_value = 'Author'
+        self.report = PollPDFReport(request, ['results'])
+
+        # results of polls, as returned by Choice.objects.get_results_polls()
+        self.report.__dict__['results_polls'] = collections.OrderedDict((
+            (3, (('Yes', 5), ('No', 2))),
+            (1, (('Python', 0), ('Ruby', 0))),
+            (2, (('Red', 1), ('Blue', 0))),
+        ))
+
+    @override_settings(POLLS_REPORTS_CHARTS_PROCESSES=1)
+    def test_charts_are_rendered_serially_in_the_order_of_polls(self):
+
+        with mock.patch('apps.polls.reports.multiprocessing.Pool') as mock_pool:
+            with mock.patch(
+                'apps.polls.reports.render_chart_result_poll',
+                side_effect=lambda width, top_margin, result_poll: result_poll,
+            ):
+                charts = self.report.render_charts_results_polls()
+
+        self.assertFalse(mock_pool.called)
+
+        # polls without votes have no charts
+        self.assertEqual(list(charts), [3, 2])
+        self.assertEqual(charts[3], (('Yes', 5), ('No', 2)))
+        self.assertEqual(charts[2], (('Red', 1), ('Blue', 0)))
+
+    @override_settings(POLLS_REPORTS_CHARTS_PROCESSES=1)
+    def test_charts_are_drawings(self):
+
+        charts = self.report.render_charts_results_polls()
+
+        self.assertEqual(list(charts), [3, 2])
+        for chart in charts.values():
+            self.assertEqual(chart.width, self.report.doc.width)
+            self.assertTrue(chart.contents)
+
+    @override_settings(POLLS_REPORTS_CHARTS_PROCESSES=2)
+    def test_charts_are_rendered_in_shared_pool(self):
+
+        charts = self.report.render_charts_results_polls()
+
+        with override_settings(POLLS_REPORTS_CHARTS_PROCESSES=1):
+            serial_charts = self.report.render_charts_results_polls()
+
+        self.assertEqual(list(charts), [3, 2])
+        for poll_pk, chart in charts.items():
+            self.assertEqual(chart.width, self.report.doc.width)
+            self.assertEqual(len(chart.contents), len(serial_charts[poll_pk].contents))
+
+        # workers are prepared once and used by the next reports
+        pool = get_charts_pool(2)
+        self.report.render_charts_results_polls()
+        self.assertIs(get_charts_pool(2), pool)
@@ -4,6 +4,8 @@ import logging
 
 from utils.django.basecommands import FactoryCountBaseCommand
 
+from apps.core.dispatch import suspend_model_signals
+
 from ...factories import QuestionFactory, AnswerFactory
 
 
@@ -18,6 +20,7 @@ class Command(FactoryCountBaseCommand):
 
         parser.add_argument('count', nargs='+', type=self._positive_integer_from_1_to_999)
 
+    @suspend_model_signals()
     def handle(self, *args, **kwargs):
 
         count = kwargs['count'][0]
@@ -22,7 +22,7 @@ class QuestionManager(models.Manager):
     def get_statistics_count_questions_for_the_past_year(self):
         """ """
 
-        return get_statistics_count_objects_for_the_past_year(self, 'date_added')
+        return get_statistics_count_objects_for_the_past_year(self, 'created')
 
     def get_chart_count_questions_for_the_past_year(self):
         """ """
@@ -40,7 +40,7 @@ class AnswerManager(models.Manager):
     def get_statistics_count_answers_for_the_past_year(self):
         """ """
 
-        return get_statistics_count_objects_for_the_past_year(self, 'date_added')
+        return get_statistics_count_objects_for_the_past_year(self, 'created')
 
     def get_chart_count_answers_for_the_past_year(self):
         """ """
@@ -3,6 +3,8 @@ import logging
 
 from utils.django.basecommands import FactoryCountBaseCommand
 
+from apps.core.dispatch import suspend_model_signals
+
 from ...factories import SnippetFactory
 
 
@@ -13,6 +15,7 @@ class Command(FactoryCountBaseCommand):
 
     help = 'Factory test snippets'
 
+    @suspend_model_signals()
     def handle(self, *args, **kwargs):
 
         count = kwargs['count'][0]
@@ -66,7 +66,7 @@ class SnippetManager(models.Manager):
     def get_statistics_count_snippets_for_the_past_year(self):
         """ """
 
-        return get_statistics_count_objects_for_the_past_year(self, 'date_added')
+        return get_statistics_count_objects_for_the_past_year(self, 'created')
 
     def get_chart_count_snippets_for_the_past_year(self):
         """ """
@@ -3,6 +3,8 @@ import logging
 
 from utils.django.basecommands import FactoryCountBaseCommand
 
+from apps.core.dispatch import suspend_model_signals
+
 from ...factories import SolutionFactory
 
 logger = logging.getLogger('django.development')
@@ -12,6 +14,7 @@ class Command(FactoryCountBaseCommand):
 
     help = None
 
+    @suspend_model_signals()
     def handle(self, **kwargs):
 
         count = kwargs['count'][0]
@@ -20,7 +20,7 @@ class SolutionManager(models.Manager):
     def get_statistics_count_solutions_for_the_past_year(self):
         """ """
 
-        return get_statistics_count_objects_for_the_past_year(self, 'date_added')
+        return get_statistics_count_objects_for_the_past_year(self, 'created')
 
     def get_chart_count_solutions_for_the_past_year(self):
         """ """
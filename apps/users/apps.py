@@ -11,6 +11,7 @@ from django.apps import AppConfig
 
 from .signals import (
     signal_post_migrate_model_levels_of_users,
+    signal_post_delete_level,
     # auto_create_user_profile,
     # auto_delete_user_profile,
 )
@@ -26,3 +27,4 @@ class UsersConfig(AppConfig):
         """ """
 
         post_migrate.connect(signal_post_migrate_model_levels_of_users, sender=self)
+        post_delete.connect(signal_post_delete_level, sender=self.get_model('Level'))
@@ -11,77 +11,91 @@ SUPERUSER_DATA = dict(
 )
 
 
-# Data for creating levels of users
+# Data for creating levels of users, from the highest; an user has the highest level allowed by reputation
 LEVELS = (
     {
         'name': Level.PLATINUM,
         'color': '#D8BFD8',
         'description': 'Platinum level of user',
+        'min_reputation': 50000,
     },
     {
         'name': Level.GOLDEN,
         'color': '#FFD700',
         'description': 'Golder level of user',
+        'min_reputation': 25000,
     },
     {
         'name': Level.SILVER,
         'color': '#C0C0C0',
         'description': 'Silver level of user',
+        'min_reputation': 15000,
     },
     {
         'name': Level.DIAMOND,
         'color': '#4B0082',
         'description': 'Diamond level of user',
+        'min_reputation': 10000,
     },
     {
         'name': Level.RUBY,
         'color': '#DC143C',
         'description': 'Ruby level of user',
+        'min_reputation': 7500,
     },
     {
         'name': Level.SAPPHIRE,
         'color': '#483D8B',
         'description': 'Sapphire level of user',
+        'min_reputation': 5000,
     },
     {
         'name': Level.MALACHITE,
         'color': '#3CB371',
         'description': 'Malachite level of user',
+        'min_reputation': 3500,
     },
     {
         'name': Level.AMETHYST,
         'color': '#800080',
         'description': 'Amethyst level of user',
+        'min_reputation': 2000,
     },
     {
         'name': Level.EMERALD,
         'color': '#00FA9A',
         'description': 'Emerald level of user',
+        'min_reputation': 1000,
     },
     {
         'name': Level.AGATE,
         'color': '#2F4F4F',
         'description': 'Agate level of user',
+        'min_reputation': 500,
     },
     {
         'name': Level.TURQUOISE,
         'color': '#40E0D0',
         'description': 'Turquoise level of user',
+        'min_reputation': 250,
     },
     {
         'name': Level.AMBER,
         'color': '#FF8C00',
         'description': 'Amber level of user',
+        'min_reputation': 100,
     },
     {
         'name': Level.OPAL,
         'color': '#FF7F50',
         'description': 'Opal level of user',
+        'min_reputation': 50,
     },
     {
         'name': Level.REGULAR,
         'color': '#F0F8FF',
         'description': 'Regular level of user',
+        'min_reputation': 0,
     },
 )
 
@@ -19,11 +19,14 @@ class Command(BaseCommand):
         LevelModel = LevelFactory._meta.model
 
         for attrs in LEVELS:
-            LevelModel._default_manager.update_or_create(
-                name=attrs['name'],
-                defaults={
-                    'color': attrs['color'],
-                    'description': attrs['description'],
-                }
-            )
-        logger.info('Created/updated levels for users.')
+            defaults = {
+                'color': attrs['color'],
+                'description': attrs['description'],
+                'min_reputation': attrs['min_reputation'],
+            }
+            # levels of users are recomputed once below
+            if not LevelModel._default_manager.filter(name=attrs['name']).update(**defaults):
+                LevelModel(name=attrs['name'], **defaults).save(force_insert=True, recompute_levels_of_users=False)
+
+        count_changed = LevelModel.objects.recompute_levels_of_users()
+        logger.info('Created/updated levels for users, changed levels of {} users.'.format(count_changed))
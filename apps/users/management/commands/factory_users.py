@@ -5,6 +5,8 @@ import logging
 from django.contrib.auth.models import Group
 from utils.django.basecommands import FactoryCountBaseCommand
 
+from apps.core.dispatch import suspend_model_signals
+
 from ...factories import UserFactory
 
 
@@ -15,6 +17,7 @@ class Command(FactoryCountBaseCommand):
 
     help = 'Factory a given amount users.'
 
+    @suspend_model_signals()
     def handle(self, *args, **kwargs):
 
         UserModel = UserFactory._meta.model
@@ -0,0 +1,25 @@
+
+import logging
+
+from django.core.management.base import BaseCommand
+
+from ...models import ReputationDailyRollup
+
+
+logger = logging.getLogger('django.development')
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Record opening balances of reputation of users, '
+        'then recount daily rollups of reputation and reputation of users from the ledger of changes'
+    )
+
+    def handle(self, *args, **kwargs):
+
+        ReputationDailyRollup.objects.rebuild()
+
+        logger.info('Rebuilt reputation of users, there are {} daily rollups.'.format(
+            ReputationDailyRollup.objects.count()
+        ))
@@ -0,0 +1,38 @@
+
+import time
+import logging
+
+from django.core.management.base import BaseCommand
+
+from ...models import LeaderboardEntry, Level
+
+
+logger = logging.getLogger('django.development')
+
+
+class Command(BaseCommand):
+
+    help = 'Recount scores and ranks of users in leaderboards by reputation'
+
+    def add_arguments(self, parser):
+
+        parser.add_argument(
+            '--periods', nargs='+', default=[period for period, label in LeaderboardEntry.CHOICES_PERIOD],
+            choices=[period for period, label in LeaderboardEntry.CHOICES_PERIOD],
+            help='Leaderboards to refresh, all by default.',
+        )
+        parser.add_argument(
+            '--levels', action='store_true', default=False,
+            help='Also reassign levels of all users by their reputation.',
+        )
+
+    def handle(self, *args, **kwargs):
+
+        for period in kwargs['periods']:
+            start_time = time.monotonic()
+            LeaderboardEntry.objects.refresh(period)
+            logger.info('Refreshed leaderboard "{}" for {:.2f} sec.'.format(period, time.monotonic() - start_time))
+
+        if kwargs['levels']:
+            count_changed = Level.objects.recompute_levels_of_users()
+            logger.info('Changed levels of {} users.'.format(count_changed))
@@ -2,9 +2,12 @@
 import itertools
 import collections
 
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.utils import timezone
 # from django.utils.translation import ugettext as _
+from django.contrib.auth import get_user_model
 from django.contrib.auth.models import BaseUserManager
+from django.contrib.contenttypes.models import ContentType
 
 from .querysets import LevelQuerySet, UserQuerySet
 # from .constants import CALCULATION_REPUTATION
@@ -17,7 +20,37 @@ CALCULATION_REPUTATION = {
 
 class LevelManager(models.Manager):
 
-    pass
+    def get_name_for_reputation(self, reputation):
+        """Return name of the highest level allowed by the reputation, the lowest level is the floor; or None."""
+
+        name = self.filter(min_reputation__lte=reputation).order_by('-min_reputation').values_list(
+            'name', flat=True
+        ).first()
+        if name is None:
+            name = self.order_by('min_reputation').values_list('name', flat=True).first()
+        return name
+
+    def recompute_levels_of_users(self):
+        """Assign levels to all users by their reputation, by single update per a level; return count changed."""
+
+        User = get_user_model()
+
+        thresholds = list(self.order_by('min_reputation').values_list('name', 'min_reputation'))
+
+        count_changed = 0
+        with transaction.atomic():
+            for index, (name, min_reputation) in enumerate(thresholds):
+
+                # the lowest level is the floor for any reputation
+                users = User._default_manager.all()
+                if index > 0:
+                    users = users.filter(reputation__gte=min_reputation)
+                if index + 1 < len(thresholds):
+                    users = users.filter(reputation__lt=thresholds[index + 1][1])
+
+                count_changed += users.exclude(level=name).update(level=name)
+
+        return count_changed
 
 
 LevelManager = LevelManager.from_queryset(LevelQuerySet)
@@ -88,3 +121,205 @@ class ActiveUserManager(models.Manager):
 
 
 UserManager = UserManager.from_queryset(UserQuerySet)
+
+
+class ReputationChangeManager(models.Manager):
+    """
+    Manager for the ledger of changes of reputation; rows are only added.
+    """
+
+    def add(self, user, delta, action, target=None, now=None):
+        """
+        Record the change, and apply it to the total and the level of the user,
+        to the daily rollup and to leaderboards, all in the same transaction.
+        """
+
+        from .models import ReputationDailyRollup, LeaderboardEntry, Level
+
+        if now is None:
+            now = timezone.now()
+
+        options = dict(user=user, delta=delta, action=action, created=now)
+        if target is not None:
+            options['target_content_type'] = ContentType.objects.get_for_model(target)
+            options['target_object_id'] = str(target.pk)
+
+        User = get_user_model()
+
+        with transaction.atomic():
+
+            change = self.create(**options)
+            User._default_manager.filter(pk=user.pk).update(reputation=models.F('reputation') + delta)
+            ReputationDailyRollup.objects.add(user, timezone.localtime(now).date(), delta)
+            LeaderboardEntry.objects.add_score(user, delta)
+
+            user.reputation += delta
+
+            level = Level.objects.get_name_for_reputation(user.reputation)
+            if level is not None and level != user.level_id:
+                User._default_manager.filter(pk=user.pk).update(level=level)
+                user.level_id = level
+
+        return change
+
+    def get_total(self, user):
+
+        return self.filter(user=user).aggregate(total=models.Sum('delta'))['total'] or 0
+
+    def open_balances(self):
+        """
+        Record an opening change for users without it, by difference between their reputation and
+        the ledger, dated by joining, so reputation earned before the ledger is kept by the ledger.
+        Return count of recorded changes.
+        """
+
+        User = get_user_model()
+
+        opened_pks = self.filter(action=self.model.ACTION_OPENING_BALANCE).values('user')
+        totals = dict(
+            self.exclude(user__in=opened_pks).order_by().values('user').
+            annotate(total=models.Sum('delta')).values_list('user', 'total')
+        )
+
+        changes = list()
+        users = User._default_manager.exclude(pk__in=opened_pks).values_list('pk', 'reputation', 'date_joined')
+        for user_pk, reputation, date_joined in users.iterator():
+            delta = reputation - totals.get(user_pk, 0)
+            if delta != 0:
+                changes.append(self.model(
+                    user_id=user_pk, delta=delta, action=self.model.ACTION_OPENING_BALANCE, created=date_joined,
+                ))
+
+        self.bulk_create(changes, batch_size=1000)
+        return len(changes)
+
+
+class ReputationDailyRollupManager(models.Manager):
+    """
+    Manager for sums of changes of reputation of users per a day.
+    """
+
+    def add(self, user, date, delta):
+
+        try:
+            with transaction.atomic():
+                self.create(user=user, date=date, delta=delta)
+        except IntegrityError:
+            self.filter(user=user, date=date).update(delta=models.F('delta') + delta)
+
+    def get_changes(self, user, start, end):
+        """Return changes of reputation of the user for each day from start to end inclusive, as list (date, delta)."""
+
+        deltas = dict(self.filter(user=user, date__range=(start, end)).values_list('date', 'delta'))
+
+        count_days = (end - start).days + 1
+        dates = [start + timezone.timedelta(days=index) for index in range(count_days)]
+        return [(date, deltas.get(date, 0)) for date in dates]
+
+    def get_change(self, user, start, end):
+
+        return self.filter(user=user, date__range=(start, end)).aggregate(total=models.Sum('delta'))['total'] or 0
+
+    def rebuild(self):
+        """Recount rollups and totals of users from the ledger, opening balances of users are recorded before."""
+
+        from .models import ReputationChange
+
+        User = get_user_model()
+
+        with transaction.atomic():
+
+            ReputationChange.objects.open_balances()
+
+            self.all().delete()
+
+            rollups = collections.defaultdict(int)
+            totals = collections.defaultdict(int)
+            for user_pk, created, delta in ReputationChange.objects.values_list('user', 'created', 'delta').iterator():
+                rollups[(user_pk, timezone.localtime(created).date())] += delta
+                totals[user_pk] += delta
+
+            self.bulk_create(
+                [self.model(user_id=user_pk, date=date, delta=delta) for (user_pk, date), delta in rollups.items()],
+                batch_size=1000,
+            )
+
+            User._default_manager.exclude(pk__in=totals).update(reputation=0)
+            for user_pk, total in totals.items():
+                User._default_manager.filter(pk=user_pk).update(reputation=total)
+
+
+class LeaderboardEntryManager(models.Manager):
+    """
+    Manager for leaderboards of users by reputation.
+    """
+
+    def add_score(self, user, delta):
+        """
+        Change scores of the user in all leaderboards, ranks are changed on the next refresh.
+        Scores for a week and a month keep changes older than the period until the next refresh too,
+        because only the refresh recounts them from daily rollups.
+        """
+
+        periods = [period for period, label in self.model.CHOICES_PERIOD]
+
+        count_updated = self.filter(user=user).update(score=models.F('score') + delta)
+        if count_updated == len(periods):
+            return
+
+        existing_periods = set(self.filter(user=user).values_list('period', flat=True))
+        for period in periods:
+            if period in existing_periods:
+                continue
+            score = user.reputation + delta if period == self.model.PERIOD_ALL else delta
+            try:
+                with transaction.atomic():
+                    self.create(user=user, period=period, score=score)
+            except IntegrityError:
+                self.filter(user=user, period=period).update(score=models.F('score') + delta)
+
+    def get_top(self, period, count=10, offset=0):
+        """Return a page of the leaderboard, users go with entries."""
+
+        return self.filter(period=period, rank__isnull=False).select_related('user').order_by('rank')[
+            offset:offset + count
+        ]
+
+    def get_rank(self, user, period):
+        """Return rank of the user in the leaderboard, by single lookup by index, or None."""
+
+        return self.filter(user=user, period=period).values_list('rank', flat=True).first()
+
+    def refresh(self, period, now=None):
+        """
+        Recount scores of the leaderboard (for a limited period from daily rollups,
+        otherwise from totals of users) and ranks of users in it.
+        """
+
+        from .models import ReputationDailyRollup
+
+        User = get_user_model()
+
+        count_days = self.model.PERIODS_DAYS[period]
+
+        if count_days is None:
+            scores = User._default_manager.values_list('pk', 'reputation').order_by('-reputation')
+        else:
+            if now is None:
+                now = timezone.now()
+            start = timezone.localtime(now).date() - timezone.timedelta(days=count_days - 1)
+            scores = ReputationDailyRollup.objects.filter(date__gte=start).values('user').annotate(
+                score=models.Sum('delta'),
+            ).values_list('user', 'score').order_by('-score')
+
+        # the same score gives the same rank, the next score gets rank by count of users above it
+        entries = list()
+        rank, previous_score = None, None
+        for index, (user_pk, score) in enumerate(scores.iterator(), 1):
+            if score != previous_score:
+                rank, previous_score = index, score
+            entries.append(self.model(period=period, user_id=user_pk, score=score, rank=rank))
+
+        with transaction.atomic():
+            self.filter(period=period).delete()
+            self.bulk_create(entries, batch_size=1000)
@@ -52,7 +52,9 @@ from apps.tags.querysets import UserTagQuerySet
 from apps.badges.querysets import UserBadgeQuerySet
 from apps.notifications.querysets import UserNotificationQuerySet
 
-from .managers import UserManager, LevelManager
+from .managers import (
+    UserManager, LevelManager, ReputationChangeManager, ReputationDailyRollupManager, LeaderboardEntryManager,
+)
 from .exceptions import ProtectDeleteUser
 from .utils import UserCollector
 from .validators import UsernameValidator
@@ -117,6 +119,10 @@ class Level(models.Model):
         unique=True,
         error_messages={'unique': _('Level with color already exists.')}
     )
+    min_reputation = models.IntegerField(
+        _('Min reputation'), default=0, db_index=True,
+        help_text=_('Users with reputation not less than it have the level, if they have not a higher one'),
+    )
 
     objects = models.Manager()
     objects = LevelManager()
@@ -130,8 +136,19 @@ class Level(models.Model):
         return self.get_name_display()
 
     def save(self, *args, **kwargs):
+
+        # a caller saving many levels recomputes levels of users once by itself
+        recompute_levels_of_users = kwargs.pop('recompute_levels_of_users', True)
+
+        old_min_reputation = Level._default_manager.filter(pk=self.pk).values_list('min_reputation', flat=True).first()
+
         super(Level, self).save(*args, **kwargs)
 
+        # users get other levels if a level is added or its threshold is changed,
+        # on deleting a level see signal_post_delete_level
+        if recompute_levels_of_users and old_min_reputation != self.min_reputation:
+            Level.objects.recompute_levels_of_users()
+
     def get_absolute_url(self):
         return reverse('users:level', kwargs={'slug': self.slug})
 
@@ -179,8 +196,9 @@ class User(AbstractBaseUser, PermissionsMixin, UserCommentModelMixin, UserOpinio
         help_text=_('Name for public display'),
     )
     is_active = models.BooleanField(_('is active?'), default=True)
+    # users of a deleted level are moved to other levels in the same transaction, see signal_post_delete_level
     level = models.ForeignKey(
-        'level',
+        'level', models.DO_NOTHING,
         verbose_name='level',
         related_name='users',
         default=Level.REGULAR,
@@ -311,14 +329,28 @@ class User(AbstractBaseUser, PermissionsMixin, UserCommentModelMixin, UserOpinio
     display_avatar.short_description = _('Avatar')
 
     def get_changes_reputation_for_last_week(self):
+        """Return changes of reputation for the last 7 days, as list (date, delta), from daily rollups."""
+
+        today = timezone.localtime(timezone.now()).date()
+        return ReputationDailyRollup.objects.get_changes(self, today - timezone.timedelta(days=6), today)
 
-        raise NotImplementedError
-        return
+    def get_data_for_chart_reputation(self, count_days=30):
+        """Return reputation at the end of each of the last days, as list (date, reputation)."""
 
-    def get_data_for_chart_reputation(self):
+        today = timezone.localtime(timezone.now()).date()
+        changes = ReputationDailyRollup.objects.get_changes(
+            self, today - timezone.timedelta(days=count_days - 1), today
+        )
 
-        raise NotImplementedError
-        return
+        # go back from the current reputation
+        data = list()
+        reputation = self.reputation
+        for date, delta in reversed(changes):
+            data.append((date, reputation))
+            reputation -= delta
+
+        data.reverse()
+        return data
 
 
 class Profile(Viewable, Updateable, UUIDable):
@@ -460,3 +492,110 @@ class Profile(Viewable, Updateable, UUIDable):
 
     def latest_activity_from_stackoverflow(self):
         pass
+
+
+class ReputationChange(UUIDable):
+    """
+    Change of reputation of an user, the ledger of them is the source of reputation of users.
+    """
+
+    # reputation of an user earned before the ledger, see ReputationChangeManager.open_balances
+    ACTION_OPENING_BALANCE = 'opening_balance'
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, models.CASCADE,
+        verbose_name=_('user'), related_name='reputation_changes',
+    )
+    delta = models.IntegerField(_('delta'))
+    action = models.CharField(_('action'), max_length=200)
+    target_content_type = models.ForeignKey(
+        'contenttypes.ContentType', models.SET_NULL, null=True, blank=True, related_name='+',
+    )
+    target_object_id = models.CharField(max_length=200, null=True, blank=True)
+    created = models.DateTimeField(_('created'), default=timezone.now)
+
+    objects = models.Manager()
+    objects = ReputationChangeManager()
+
+    class Meta:
+        verbose_name = _('change of reputation')
+        verbose_name_plural = _('changes of reputation')
+        get_latest_by = 'created'
+        ordering = ('-created', )
+        index_together = (('user', 'created'), )
+
+    def __str__(self):
+
+        return '{:+d} for {}'.format(self.delta, self.user)
+
+
+class ReputationDailyRollup(models.Model):
+    """
+    Sum of changes of reputation of an user for a day.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, models.CASCADE,
+        verbose_name=_('user'), related_name='reputation_rollups',
+    )
+    date = models.DateField(_('date'))
+    delta = models.IntegerField(_('delta'), default=0)
+
+    objects = models.Manager()
+    objects = ReputationDailyRollupManager()
+
+    class Meta:
+        verbose_name = _('daily change of reputation')
+        verbose_name_plural = _('daily changes of reputation')
+        ordering = ('-date', )
+        unique_together = (('user', 'date'), )
+        index_together = (('date', 'delta'), )
+
+    def __str__(self):
+
+        return '{:+d} for {} on {}'.format(self.delta, self.user, self.date)
+
+
+class LeaderboardEntry(models.Model):
+    """
+    Score of an user in a leaderboard for a period, with rank refreshed periodically.
+    """
+
+    PERIOD_ALL = 'all'
+    PERIOD_WEEK = 'week'
+    PERIOD_MONTH = 'month'
+
+    CHOICES_PERIOD = (
+        (PERIOD_ALL, _('All time')),
+        (PERIOD_WEEK, _('Week')),
+        (PERIOD_MONTH, _('Month')),
+    )
+
+    # days in a period, None is unlimited
+    PERIODS_DAYS = {
+        PERIOD_ALL: None,
+        PERIOD_WEEK: 7,
+        PERIOD_MONTH: 30,
+    }
+
+    period = models.CharField(_('period'), max_length=10, choices=CHOICES_PERIOD)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, models.CASCADE,
+        verbose_name=_('user'), related_name='leaderboard_entries',
+    )
+    score = models.IntegerField(_('score'), default=0)
+    rank = models.PositiveIntegerField(_('rank'), null=True, blank=True)
+
+    objects = models.Manager()
+    objects = LeaderboardEntryManager()
+
+    class Meta:
+        verbose_name = _('entry of leaderboard')
+        verbose_name_plural = _('entries of leaderboards')
+        ordering = ('period', 'rank')
+        unique_together = (('period', 'user'), )
+        index_together = (('period', 'rank'), ('period', 'score'))
+
+    def __str__(self):
+
+        return '#{} {} in {}'.format(self.rank, self.user, self.get_period_display())
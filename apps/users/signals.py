@@ -6,3 +6,9 @@ def signal_post_migrate_model_levels_of_users(sender, **kwargs):
     call_command('create_levels_of_users')
     call_command('create_groups')
     call_command('create_superuser')
+
+
+def signal_post_delete_level(sender, instance, **kwargs):
+    """Move users of the deleted level to other levels by their reputation, in the transaction of deleting."""
+
+    sender.objects.recompute_levels_of_users()
@@ -0,0 +1,202 @@
+
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+
+from apps.users.constants import LEVELS
+from apps.users.factories import UserFactory
+from apps.users.models import Level, LeaderboardEntry, ReputationChange, ReputationDailyRollup
+
+
+User = get_user_model()
+
+
+class ReputationChangeManagerTest(TestCase):
+    """
+    Tests for the ledger of changes of reputation and its opening balances.
+    """
+
+    def setUp(self):
+
+        self.user = UserFactory()
+
+        # reputation earned before the ledger
+        User.objects.filter(pk=self.user.pk).update(reputation=50)
+        self.user.refresh_from_db()
+
+    def test_add(self):
+
+        ReputationChange.objects.add(self.user, 5, 'test')
+        ReputationChange.objects.add(self.user, -2, 'test')
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.reputation, 53)
+        self.assertEqual(ReputationChange.objects.get_total(self.user), 3)
+        self.assertEqual(ReputationDailyRollup.objects.get(user=self.user).delta, 3)
+
+    def test_open_balances(self):
+
+        ReputationChange.objects.add(self.user, 5, 'test')
+        UserFactory()
+
+        self.assertEqual(ReputationChange.objects.open_balances(), 1)
+        self.assertEqual(ReputationChange.objects.open_balances(), 0)
+
+        opening = ReputationChange.objects.get(user=self.user, action=ReputationChange.ACTION_OPENING_BALANCE)
+        self.assertEqual(opening.delta, 50)
+        self.assertEqual(opening.created, self.user.date_joined)
+        self.assertEqual(ReputationChange.objects.get_total(self.user), 55)
+
+    def test_rebuild_keeps_reputation_earned_before_ledger(self):
+
+        ReputationChange.objects.add(self.user, 5, 'test')
+
+        ReputationDailyRollup.objects.rebuild()
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.reputation, 55)
+        self.assertEqual(sum(ReputationDailyRollup.objects.filter(user=self.user).values_list('delta', flat=True)), 55)
+
+
+class LevelManagerTest(TestCase):
+    """
+    Tests for assigning levels to users by their reputation.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+
+        call_command('create_levels_of_users')
+
+        thresholds = sorted((attrs['min_reputation'], attrs['name']) for attrs in LEVELS)
+        cls.lowest_level, cls.second_level = thresholds[0][1], thresholds[1][1]
+        cls.second_min_reputation = thresholds[1][0]
+        cls.highest_level, cls.highest_min_reputation = thresholds[-1][1], thresholds[-1][0]
+
+    def test_get_name_for_reputation(self):
+
+        self.assertEqual(Level.objects.get_name_for_reputation(0), self.lowest_level)
+        self.assertEqual(Level.objects.get_name_for_reputation(self.second_min_reputation - 1), self.lowest_level)
+        self.assertEqual(Level.objects.get_name_for_reputation(self.second_min_reputation), self.second_level)
+        self.assertEqual(Level.objects.get_name_for_reputation(self.highest_min_reputation * 2), self.highest_level)
+
+    def test_get_name_for_negative_reputation(self):
+
+        self.assertEqual(Level.objects.get_name_for_reputation(-10), self.lowest_level)
+
+    def test_recompute_levels_of_users(self):
+
+        negative_user, second_user, highest_user = UserFactory(), UserFactory(), UserFactory()
+
+        User.objects.filter(pk=negative_user.pk).update(reputation=-10, level=self.highest_level)
+        User.objects.filter(pk=second_user.pk).update(reputation=self.second_min_reputation, level=self.lowest_level)
+        User.objects.filter(pk=highest_user.pk).update(reputation=self.highest_min_reputation, level=self.lowest_level)
+
+        self.assertEqual(Level.objects.recompute_levels_of_users(), 3)
+        self.assertEqual(Level.objects.recompute_levels_of_users(), 0)
+
+        self.assertEqual(User.objects.get(pk=negative_user.pk).level_id, self.lowest_level)
+        self.assertEqual(User.objects.get(pk=second_user.pk).level_id, self.second_level)
+        self.assertEqual(User.objects.get(pk=highest_user.pk).level_id, self.highest_level)
+
+    def test_levels_are_recomputed_only_by_changed_threshold(self):
+
+        level = Level.objects.get(name=self.second_level)
+
+        with mock.patch.object(Level.objects, 'recompute_levels_of_users') as mock_recompute:
+
+            level.description = 'Changed description of level'
+            level.save()
+            self.assertFalse(mock_recompute.called)
+
+            level.min_reputation += 1
+            level.save()
+            self.assertEqual(mock_recompute.call_count, 1)
+
+    def test_levels_are_recomputed_on_deleting_and_adding_level(self):
+
+        user = UserFactory()
+        User.objects.filter(pk=user.pk).update(reputation=self.second_min_reputation)
+        Level.objects.recompute_levels_of_users()
+
+        level = Level.objects.get(name=self.second_level)
+        level.delete()
+
+        # users of the deleted level are not deleted with it
+        self.assertEqual(User.objects.get(pk=user.pk).level_id, self.lowest_level)
+
+        level.save(force_insert=True)
+
+        self.assertEqual(User.objects.get(pk=user.pk).level_id, self.second_level)
+
+    def test_levels_are_recomputed_once_by_command(self):
+
+        with mock.patch.object(Level.objects, 'recompute_levels_of_users', return_value=0) as mock_recompute:
+            call_command('create_levels_of_users')
+
+        self.assertEqual(mock_recompute.call_count, 1)
+
+
+class LeaderboardEntryManagerTest(TestCase):
+    """
+    Tests for leaderboards of users by reputation.
+    """
+
+    def setUp(self):
+
+        self.user1, self.user2, self.user3 = UserFactory(), UserFactory(), UserFactory()
+
+        for user, reputation in ((self.user1, 10), (self.user2, 10), (self.user3, 5)):
+            User.objects.filter(pk=user.pk).update(reputation=reputation)
+            user.refresh_from_db()
+
+    def get_scores(self, user):
+
+        return dict(LeaderboardEntry.objects.filter(user=user).values_list('period', 'score'))
+
+    def test_add_score(self):
+
+        LeaderboardEntry.objects.add_score(self.user1, 5)
+        self.assertEqual(self.get_scores(self.user1), {
+            LeaderboardEntry.PERIOD_ALL: 15, LeaderboardEntry.PERIOD_WEEK: 5, LeaderboardEntry.PERIOD_MONTH: 5,
+        })
+
+        LeaderboardEntry.objects.add_score(self.user1, -2)
+        self.assertEqual(self.get_scores(self.user1), {
+            LeaderboardEntry.PERIOD_ALL: 13, LeaderboardEntry.PERIOD_WEEK: 3, LeaderboardEntry.PERIOD_MONTH: 3,
+        })
+
+        self.assertEqual(self.get_scores(self.user2), {})
+
+    def test_refresh_gives_the_same_rank_for_the_same_score(self):
+
+        LeaderboardEntry.objects.refresh(LeaderboardEntry.PERIOD_ALL)
+
+        self.assertEqual(LeaderboardEntry.objects.get_rank(self.user1, LeaderboardEntry.PERIOD_ALL), 1)
+        self.assertEqual(LeaderboardEntry.objects.get_rank(self.user2, LeaderboardEntry.PERIOD_ALL), 1)
+        self.assertEqual(LeaderboardEntry.objects.get_rank(self.user3, LeaderboardEntry.PERIOD_ALL), 3)
+
+        top = LeaderboardEntry.objects.get_top(LeaderboardEntry.PERIOD_ALL, count=3)
+        self.assertEqual([entry.user for entry in top][2], self.user3)
+        self.assertCountEqual([entry.user for entry in top][:2], [self.user1, self.user2])
+
+    def test_refresh_period_by_daily_rollups(self):
+
+        today = timezone.localtime(timezone.now()).date()
+        ReputationDailyRollup.objects.add(self.user1, today, 3)
+        ReputationDailyRollup.objects.add(self.user3, today - timezone.timedelta(days=1), 4)
+        ReputationDailyRollup.objects.add(self.user2, today - timezone.timedelta(days=7), 100)
+
+        LeaderboardEntry.objects.refresh(LeaderboardEntry.PERIOD_WEEK)
+
+        self.assertEqual(LeaderboardEntry.objects.get_rank(self.user3, LeaderboardEntry.PERIOD_WEEK), 1)
+        self.assertEqual(LeaderboardEntry.objects.get_rank(self.user1, LeaderboardEntry.PERIOD_WEEK), 2)
+        self.assertIsNone(LeaderboardEntry.objects.get_rank(self.user2, LeaderboardEntry.PERIOD_WEEK))
+        self.assertEqual(self.get_scores(self.user1), {LeaderboardEntry.PERIOD_WEEK: 3})
+
+    def test_get_rank_without_entry(self):
+
+        self.assertIsNone(LeaderboardEntry.objects.get_rank(self.user1, LeaderboardEntry.PERIOD_ALL))
@@ -4,6 +4,7 @@ import logging
 
 from utils.django.basecommands import FactoryCountBaseCommand
 
+from apps.core.dispatch import suspend_model_signals
 from apps.utilities.factories import CategoryFactory, UtilityFactory
 
 
@@ -14,6 +15,7 @@ class Command(FactoryCountBaseCommand):
 
     help = 'Factory testing categories with utilities.'
 
+    @suspend_model_signals()
     def handle(self, **kwargs):
 
         count = kwargs['count'][0]
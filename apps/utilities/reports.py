@@ -15,6 +15,7 @@ from weasyprint import HTML as weasyprint_HTML
 # from utils.django.functions_db import IsNullAsLast
 
 from apps.core.reports import BaseReport
+from apps.opinions.models import Opinion
 
 from .models import Category, Utility
 
@@ -22,6 +23,7 @@ from .models import Category, Utility
 class Report(BaseReport):
 
     theme = _('Utilities')
+    report_models = (Category, Utility, Opinion)
 
     def __init__(self, *args, **kwargs):
         self.PDF_class_report = PdfReport
@@ -1,11 +1,12 @@
 
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
 from apps.admin.admin import ModelAdmin
 from apps.admin.app import AppAdmin
 from apps.admin.utils import register_app, register_model
 
-from .models import Attendance
+from .models import Attendance, VisitPageRollup
 from .apps import VisitsConfig
 
 
@@ -14,6 +15,53 @@ class VisitsAppAdmin(AppAdmin):
 
     app_config_class = VisitsConfig
 
+    def get_tables_of_statistics(self):
+
+        now = timezone.now()
+
+        return (
+            (_('Active users'), (
+                (_('For the last day'), Attendance.objects.get_count_active_users(1)),
+                (_('For the last week'), Attendance.objects.get_wau()),
+                (_('For the last month'), Attendance.objects.get_mau()),
+            )),
+            (_('Top pages for the last day'), tuple(
+                VisitPageRollup.objects.get_top_pages(now - timezone.timedelta(days=1))
+            )),
+            (_('Top pages for the last week'), tuple(
+                VisitPageRollup.objects.get_top_pages(now - timezone.timedelta(days=7))
+            )),
+            (_('Top pages for the last month'), tuple(
+                VisitPageRollup.objects.get_top_pages(now - timezone.timedelta(days=30))
+            )),
+        )
+
+    def get_charts_of_statistics(self):
+
+        today = timezone.localdate()
+
+        # cohorts by weeks for the last 8 weeks
+        retention_matrix = Attendance.objects.get_retention_matrix(today - timezone.timedelta(days=7 * 8 - 1), today)
+
+        return (
+            {
+                'title': _('Chart count visitors for the past month'),
+                'table': None,
+                'chart': Attendance.objects.get_chart_dau(today - timezone.timedelta(days=29), today),
+            },
+            {
+                'title': _('Retention of users by weeks'),
+                'table': {
+                    'fields': (_('Cohort'), ) + tuple(_('Week {}').format(index) for index in range(len(retention_matrix))),
+                    'data': tuple(
+                        (index + 1, ) + tuple('{:.0%}'.format(value) for value in row)
+                        for index, row in enumerate(retention_matrix)
+                    ),
+                },
+                'chart': Attendance.objects.get_chart_retention(retention_matrix),
+            },
+        )
+
 
 @register_model(Attendance)
 class Attendance(ModelAdmin):
@@ -0,0 +1,137 @@
+
+import uuid
+
+import numpy
+
+
+# primary keys of users are UUIDs, so a day of attendance is kept as sorted array of their 16 bytes
+USER_ID_DTYPE = numpy.dtype('S16')
+
+EMPTY_ARRAY = numpy.array([], dtype=USER_ID_DTYPE)
+
+
+def _to_bytes(user_id):
+
+    if isinstance(user_id, uuid.UUID):
+        return user_id.bytes
+    return uuid.UUID(str(user_id)).bytes
+
+
+def make_array(user_ids):
+    """Return sorted array of unique ids of users."""
+
+    return numpy.unique(numpy.array([_to_bytes(user_id) for user_id in user_ids], dtype=USER_ID_DTYPE))
+
+
+def load_array(data):
+    """Return array of ids of users from bytes kept in database."""
+
+    if not data:
+        return EMPTY_ARRAY
+    return numpy.frombuffer(bytes(data), dtype=USER_ID_DTYPE)
+
+
+def dump_array(array):
+
+    return array.tobytes()
+
+
+def insert_into_array(array, user_id):
+    """Return the array with id of user inserted by order and True if the id was missing there."""
+
+    value = numpy.array(_to_bytes(user_id), dtype=USER_ID_DTYPE)
+    index = numpy.searchsorted(array, value)
+    if index < array.size and array[index] == value:
+        return array, False
+    return numpy.insert(array, index, value), True
+
+
+def contains(array, user_id):
+
+    return _contains_value(array, numpy.array(_to_bytes(user_id), dtype=USER_ID_DTYPE))
+
+
+def _contains_value(array, value):
+
+    index = numpy.searchsorted(array, value)
+    return bool(index < array.size and array[index] == value)
+
+
+def to_uuids(array):
+
+    # numpy strips trailing null bytes of items
+    return [uuid.UUID(bytes=item.ljust(16, b'\0')) for item in array.tolist()]
+
+
+def union_arrays(arrays):
+
+    arrays = [array for array in arrays if array.size]
+    if not arrays:
+        return EMPTY_ARRAY
+    return numpy.unique(numpy.concatenate(arrays))
+
+
+def count_unique(arrays):
+    """Return count distinct users in the arrays, as WAU or MAU for arrays of days."""
+
+    return union_arrays(arrays).size
+
+
+def get_presence(arrays, user_id):
+    """Return boolean vector of presence of user, per an array."""
+
+    value = numpy.array(_to_bytes(user_id), dtype=USER_ID_DTYPE)
+    return numpy.fromiter((_contains_value(array, value) for array in arrays), dtype=bool, count=len(arrays))
+
+
+def get_streaks(presence):
+    """Return lengths of the current (ending the last day) and the longest runs of True in boolean vector."""
+
+    if not presence.size:
+        return 0, 0
+
+    # positions where runs start and end
+    padded = numpy.concatenate(([False], presence, [False])).astype(numpy.int8)
+    changes = numpy.diff(padded)
+    starts = numpy.flatnonzero(changes == 1)
+    ends = numpy.flatnonzero(changes == -1)
+
+    if not starts.size:
+        return 0, 0
+
+    lengths = ends - starts
+    current = int(lengths[-1]) if presence[-1] else 0
+    return current, int(lengths.max())
+
+
+def get_retention_matrix(arrays, period_days):
+    """
+    Return matrix of retention by cohorts: row is cohort of users first seen in a period,
+    column is share of the cohort active in the following periods.
+
+    The arrays must be per consecutive day, the oldest first.
+    """
+
+    periods = [
+        union_arrays(arrays[index:index + period_days])
+        for index in range(0, len(arrays), period_days)
+    ]
+
+    count_periods = len(periods)
+    matrix = numpy.zeros((count_periods, count_periods), dtype=float)
+
+    seen = EMPTY_ARRAY
+    for cohort_index, active in enumerate(periods):
+
+        cohort = numpy.setdiff1d(active, seen, assume_unique=True)
+        seen = numpy.union1d(seen, active)
+
+        if not cohort.size:
+            continue
+
+        for index in range(cohort_index, count_periods):
+            retained = numpy.intersect1d(cohort, periods[index], assume_unique=True).size
+            matrix[cohort_index, index - cohort_index] = retained / cohort.size
+
+    return matrix
+
@@ -1,4 +1,14 @@
 
-AUTHENTICATED_USERS_KEY = 'ONLINE_AUTHENTICATED_USERS_PKS'
+ONLINE_USERS_KEY_PREFIX = 'ONLINE_USERS:'
 
-ANONYMOUS_USERS_KEY = 'ONLINE_ANONYMOUS_USERS'
+VISIT_PAGE_COUNTER_KEY_PREFIX = 'VISIT_PAGE_COUNTER:'
+
+VISIT_PAGE_COUNTER_URLS_KEY_PREFIX = 'VISIT_PAGE_COUNTER_URLS:'
+
+VISIT_PAGE_COUNTER_GENERATION_KEY = 'VISIT_PAGE_COUNTER_GENERATION'
+
+VISIT_PAGE_COUNTER_FLUSH_KEY = 'VISIT_PAGE_COUNTER_FLUSH'
+
+ATTENDANCE_SEEN_KEY_PREFIX = 'ATTENDANCE_SEEN:'
+
+VISIT_UPDATED_KEY_PREFIX = 'VISIT_UPDATED:'
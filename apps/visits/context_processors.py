@@ -3,10 +3,12 @@ from importlib import import_module
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.cache import cache
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 
-from .models import VisitPage
-from .constants import AUTHENTICATED_USERS_KEY, ANONYMOUS_USERS_KEY
+from .models import VisitPage, VisitPageRollup
+from .counters import visit_page_counter_buffer
+from .trackers import online_authenticated_users_tracker, online_anonymous_users_tracker
 
 
 User = get_user_model()
@@ -17,18 +19,28 @@ def count_visits_page(request):
 
     count_visits_page = VisitPage.objects.get_count_visits(request)
 
+    if visit_page_counter_buffer is not None:
+        count_visits_page += visit_page_counter_buffer.get_pending(request.path_info)
+
+    def get_count_visits_page_for_week():
+        week_ago = timezone.now() - timezone.timedelta(days=7)
+        return VisitPageRollup.objects.get_count_views(request.path_info, week_ago)
+
     return {
         'COUNT_VISITS_PAGE': count_visits_page,
+        'COUNT_VISITS_PAGE_FOR_WEEK': SimpleLazyObject(get_count_visits_page_for_week),
     }
 
 
 def online_users(request):
-    """ """
+    """Online users, fetched only if a template uses them."""
 
-    online_authenticated_users = cache.get(AUTHENTICATED_USERS_KEY)
-    online_anonymous_users = cache.get(ANONYMOUS_USERS_KEY)
+    def get_online_authenticated_users():
+        user_pks = online_authenticated_users_tracker.get_members()
+        users = User._default_manager.in_bulk(user_pks)
+        return [users[pk] for pk in user_pks if pk in users]
 
     return {
-        'ONLINE_AUTHENTICATED_USERS': online_authenticated_users,
-        'ONLINE_ANONYMOUS_USERS': online_anonymous_users,
+        'ONLINE_AUTHENTICATED_USERS': SimpleLazyObject(get_online_authenticated_users),
+        'ONLINE_ANONYMOUS_USERS': SimpleLazyObject(online_anonymous_users_tracker.get_members),
     }
@@ -0,0 +1,194 @@
+
+import re
+import time
+import atexit
+import threading
+import collections
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .constants import (
+    VISIT_PAGE_COUNTER_KEY_PREFIX, VISIT_PAGE_COUNTER_URLS_KEY_PREFIX,
+    VISIT_PAGE_COUNTER_GENERATION_KEY, VISIT_PAGE_COUNTER_FLUSH_KEY,
+)
+from .models import VisitPage
+
+
+def compile_ignorable_urls(patterns):
+    """Return single compiled regex matching any of the given patterns, or None."""
+
+    if not patterns:
+        return None
+    return re.compile('|'.join('(?:{})'.format(pattern) for pattern in patterns))
+
+
+class VisitPageCounterBuffer(object):
+    """
+    Accumulate visits of pages in process memory and write them to database periodically,
+    as single atomic increment per url.
+    """
+
+    def __init__(self, flush_interval):
+
+        self.flush_interval = flush_interval
+        self._counter = collections.Counter()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def add(self, url_path, count=1):
+
+        with self._lock:
+            self._counter[url_path] += count
+
+    def get_pending(self, url_path):
+        """Return count visits of url not written to database yet."""
+
+        with self._lock:
+            return self._counter.get(url_path, 0)
+
+    def take(self):
+        """Return accumulated visits and reset buffer."""
+
+        with self._lock:
+            counters, self._counter = self._counter, collections.Counter()
+            self._last_flush = time.monotonic()
+        return counters
+
+    def is_expired(self):
+
+        return time.monotonic() - self._last_flush >= self.flush_interval
+
+    def flush(self):
+
+        counters = self.take()
+        if counters:
+            VisitPage.objects.increment_counters(counters)
+        return counters
+
+    def flush_if_expired(self):
+
+        if self.is_expired():
+            return self.flush()
+
+
+class CacheVisitPageCounterBuffer(VisitPageCounterBuffer):
+    """
+    Accumulate visits of pages in shared cache, so all processes of website flush the same counters.
+
+    Only atomic operations of the cache are used, instead of locks of a process: urls are registered
+    for a flush in a list of the current generation, once per url by cache.add of its key, and
+    a flush starts the next generation, then reads urls of the latest two of them.
+    """
+
+    TIMEOUT = 60 * 60 * 24
+
+    def add(self, url_path, count=1):
+
+        key = VISIT_PAGE_COUNTER_KEY_PREFIX + url_path
+
+        if not cache.add(key, count, self.TIMEOUT):
+            try:
+                cache.incr(key, count)
+            except ValueError:
+                cache.set(key, count, self.TIMEOUT)
+
+        self._register(url_path)
+
+    def _get_generation(self):
+
+        generation = cache.get(VISIT_PAGE_COUNTER_GENERATION_KEY)
+        if generation is None:
+            cache.add(VISIT_PAGE_COUNTER_GENERATION_KEY, 0, None)
+            generation = cache.get(VISIT_PAGE_COUNTER_GENERATION_KEY, 0)
+        return generation
+
+    def _get_urls_key_prefix(self, generation):
+
+        return '{}{}:'.format(VISIT_PAGE_COUNTER_URLS_KEY_PREFIX, generation)
+
+    def _register(self, url_path):
+
+        prefix = self._get_urls_key_prefix(self._get_generation())
+
+        # urls start with a slash, so their keys do not clash with keys of the count and of indexes
+        if not cache.add(prefix + url_path, True, self.TIMEOUT):
+            return
+
+        cache.add(prefix + 'count', 0, self.TIMEOUT)
+        index = cache.incr(prefix + 'count')
+        cache.set(prefix + str(index), url_path, self.TIMEOUT)
+
+    def _get_urls(self, generation):
+
+        prefix = self._get_urls_key_prefix(generation)
+
+        count = cache.get(prefix + 'count', 0)
+        keys = [prefix + str(index) for index in range(1, count + 1)]
+        return set(cache.get_many(keys).values())
+
+    def get_pending(self, url_path):
+
+        return cache.get(VISIT_PAGE_COUNTER_KEY_PREFIX + url_path, 0)
+
+    def take(self):
+
+        with self._lock:
+            self._last_flush = time.monotonic()
+
+        # only one process flushes counters at once, otherwise the same visits may be taken twice
+        if not cache.add(VISIT_PAGE_COUNTER_FLUSH_KEY, True, self.flush_interval):
+            return collections.Counter()
+
+        try:
+            # urls are registered in the next generation from now; the previous one is read too,
+            # because a process could read the generation before the change and register url after the read
+            generation = self._get_generation()
+            try:
+                cache.incr(VISIT_PAGE_COUNTER_GENERATION_KEY)
+            except ValueError:
+                pass
+
+            urls = self._get_urls(generation - 1) | self._get_urls(generation)
+            if not urls:
+                return collections.Counter()
+
+            keys = {VISIT_PAGE_COUNTER_KEY_PREFIX + url_path: url_path for url_path in urls}
+            values = cache.get_many(keys.keys())
+
+            counters = collections.Counter()
+            for key, value in values.items():
+                if not value:
+                    continue
+                # decrease on the read value instead of deleting the key,
+                # so visits added by other processes in the meantime are not lost
+                try:
+                    cache.decr(key, value)
+                except ValueError:
+                    continue
+                counters[keys[key]] += value
+            return counters
+        finally:
+            cache.delete(VISIT_PAGE_COUNTER_FLUSH_KEY)
+
+
+def get_visit_page_counter_buffer():
+    """Return a buffer for counting visits of pages, in accordance with settings, or None."""
+
+    mode = getattr(settings, 'COUNT_VISITS_PAGE_BUFFER', None)
+    flush_interval = getattr(settings, 'COUNT_VISITS_PAGE_FLUSH_INTERVAL', 60)
+
+    if mode == 'memory':
+        return VisitPageCounterBuffer(flush_interval)
+    elif mode == 'cache':
+        return CacheVisitPageCounterBuffer(flush_interval)
+    elif mode is None:
+        return None
+    raise ValueError('Unknown mode "{}" of buffer for counting visits of pages.'.format(mode))
+
+
+visit_page_counter_buffer = get_visit_page_counter_buffer()
+
+if isinstance(visit_page_counter_buffer, VisitPageCounterBuffer):
+    # do not lose visits kept in memory of the process on its shutdown
+    atexit.register(visit_page_counter_buffer.flush)
@@ -0,0 +1,31 @@
+
+import logging
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...models import VisitPageRollup
+
+
+logger = logging.getLogger('django.development')
+
+
+class Command(BaseCommand):
+
+    help = 'Compact hourly visits of pages into daily ones'
+
+    def add_arguments(self, parser):
+
+        parser.add_argument(
+            '--days', type=int, default=getattr(settings, 'COUNT_DAYS_KEEP_HOURLY_VISITS_PAGE', 2),
+            help='Keep hourly visits for that count of last days.',
+        )
+
+    def handle(self, *args, **kwargs):
+
+        before = timezone.now() - timezone.timedelta(days=kwargs['days'])
+
+        count_merged = VisitPageRollup.objects.compact(before)
+
+        logger.info('Compacted {} hourly rollups of visits pages.'.format(count_merged))
@@ -12,7 +12,9 @@ from factory import fuzzy
 
 from utils.django.basecommands import FactoryCountBaseCommand
 
-from ...utils import update_user_pks
+from apps.core.dispatch import suspend_model_signals
+
+from ...utils import update_user_agent_usage
 from ...models import Visit, Attendance, VisitPage, VisitUserBrowser, VisitUserSystem
 
 
@@ -39,6 +41,7 @@ class Command(FactoryCountBaseCommand):
 
         parser.add_argument('count_visits', nargs=1, type=self._positive_integer_from_1_to_999)
 
+    @suspend_model_signals()
     def handle(self, *args, **kwargs):
 
         count_visits = kwargs.get('count_visits')[0] or 500
@@ -53,17 +56,14 @@ class Command(FactoryCountBaseCommand):
         users = get_user_model()._default_manager.all()
 
         for i in range(100, 0, -1):
-            attendance = Attendance.objects.create()
-            attendance.date = timezone.now().date() - timezone.timedelta(days=i)
-            attendance.full_clean()
-            attendance.save()
+            Attendance.objects.create(date=timezone.localdate() - timezone.timedelta(days=i))
 
         for i in range(count_visits):
 
             user = random.choice(users)
 
             attendance = random.choice(tuple(Attendance.objects.all()))
-            attendance.users.add(user)
+            Attendance.objects.add_user(user, attendance.date)
 
             url = random.choice(self.URLS)
 
@@ -72,10 +72,10 @@ class Command(FactoryCountBaseCommand):
             VisitPage.objects.change_url_counter(fake_request)
 
             browser_name = random.choice(self.BROWSERS)
-            update_user_pks(VisitUserBrowser, browser_name, user)
+            update_user_agent_usage(VisitUserBrowser, browser_name, user)
 
             os_name = random.choice(self.OS)
-            update_user_pks(VisitUserSystem, os_name, user)
+            update_user_agent_usage(VisitUserSystem, os_name, user)
 
             start_day = datetime.datetime.fromordinal(attendance.date.toordinal())
             start_day = start_day.replace(tzinfo=timezone.get_current_timezone())
@@ -92,7 +92,12 @@ class Command(FactoryCountBaseCommand):
                 if date > visit.date:
                     Visit._default_manager.filter(pk=visit.pk).update(date=date)
 
-        Attendance._default_manager.filter(users__isnull=True).delete()
+        Attendance.objects.pack_users()
+        Attendance.objects.filter(count_users=0).delete()
+
+        Visit.objects.rebuild_attendances(
+            Attendance.objects.get_arrays(Attendance.objects.earliest().date, timezone.localdate())
+        )
 
         logger.info('Made factory {} visits for {} users on {} days.'.format(
             count_visits,
@@ -0,0 +1,31 @@
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...counters import visit_page_counter_buffer, CacheVisitPageCounterBuffer
+
+
+logger = logging.getLogger('django.development')
+
+
+class Command(BaseCommand):
+
+    help = 'Write visits of pages buffered in the shared cache (setting COUNT_VISITS_PAGE_BUFFER = "cache") to database'
+
+    def handle(self, *args, **kwargs):
+
+        if visit_page_counter_buffer is None:
+            logger.info('Buffer for counting visits of pages is disabled.')
+            return
+
+        # visits buffered in memory are kept by processes of website and flushed only by them
+        if not isinstance(visit_page_counter_buffer, CacheVisitPageCounterBuffer):
+            raise CommandError(
+                'Visits of pages are buffered in memory of processes of website, and cannot be flushed '
+                'by the command; set COUNT_VISITS_PAGE_BUFFER = "cache" to flush them there.'
+            )
+
+        counters = visit_page_counter_buffer.flush()
+
+        logger.info('Flushed {} visits for {} pages.'.format(sum(counters.values()), len(counters)))
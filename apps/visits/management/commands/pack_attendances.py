@@ -0,0 +1,33 @@
+
+import logging
+
+from django.core.management.base import BaseCommand
+
+from ...models import Attendance, Visit
+
+
+logger = logging.getLogger('django.development')
+
+
+class Command(BaseCommand):
+
+    help = 'Pack visitors of days appended as rows into arrays of users, should be run periodically'
+
+    def add_arguments(self, parser):
+
+        parser.add_argument(
+            '--rebuild-visits', action='store_true', default=False,
+            help='Rebuild counts days and consecutive days of attendances of all users by the arrays.',
+        )
+
+    def handle(self, *args, **kwargs):
+
+        count_packed = Attendance.objects.pack_users()
+
+        if kwargs['rebuild_visits']:
+            first = Attendance.objects.order_by('date').first()
+            if first is not None:
+                Visit.objects.rebuild_attendances(Attendance.objects.get_arrays(first.date, Attendance.objects.latest().date))
+
+        logger.info('Packed {} attendances of users into arrays.'.format(count_packed))
+        return 0
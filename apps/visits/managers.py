@@ -1,15 +1,234 @@
 
-from django.db import models
-from django.utils.translation import ugettext as _
+import uuid
+import collections
+
+from django.db import models, connections, router, transaction, IntegrityError
+from django.db.models.functions import TruncDay
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
 
 import pygal
 
+from .arrays import (
+    load_array, dump_array, make_array, union_arrays,
+    count_unique, get_presence, get_streaks, get_retention_matrix,
+)
 from .querysets import AttendanceQuerySet
 
 
 class AttendanceManager(models.Manager):
+    """
+    Manager for attendances of website, kept as sorted arrays of users per day;
+    new visitors of a day are appended as rows and packed into the array later.
+    """
+
+    def add_user(self, user, date):
+        """
+        Register attendance of user on a day by appending a row of the user, without touching the array
+        of the day; return True if the user is first time on that day. See pack_users.
+        """
+
+        attendance = self.only('pk').get_or_create(date=date)[0]
+
+        try:
+            with transaction.atomic():
+                self.model.users.through._default_manager.create(attendance_id=attendance.pk, user_id=user.pk)
+        except IntegrityError:
+            return False
+
+        return True
+
+    def _get_staged_users(self, start, end):
+        """Return mapping date -> primary keys of users not packed into the array of the day yet."""
+
+        through = self.model.users.through
+
+        staged = collections.defaultdict(list)
+        rows = through._default_manager.filter(attendance__date__range=(start, end))
+        for date, user_pk in rows.values_list('attendance__date', 'user_id'):
+            staged[date].append(user_pk)
+        return staged
+
+    def pack_users(self):
+        """Move rows of users of every day into the array of the day; return count of moved rows."""
+
+        through = self.model.users.through
+        count_packed = 0
+
+        attendance_pks = through._default_manager.values_list('attendance', flat=True).distinct()
+        for attendance_pk in list(attendance_pks):
+
+            with transaction.atomic():
+
+                attendance = self.select_for_update().get(pk=attendance_pk)
+
+                rows = list(through._default_manager.filter(attendance=attendance).values_list('pk', 'user_id'))
+                if not rows:
+                    continue
+                pks, user_pks = zip(*rows)
+
+                array = union_arrays((attendance.get_users_array(), make_array(user_pks)))
+                self.filter(pk=attendance.pk).update(users_array=dump_array(array), count_users=array.size)
+                through._default_manager.filter(pk__in=pks).delete()
+
+            count_packed += len(pks)
+
+        return count_packed
+
+    def get_arrays(self, start, end):
+        """
+        Return ordered mapping date -> array of users for each day of range, including days without visitors
+        and users not packed into arrays yet.
+        """
+
+        rows = dict(self.filter(date__range=(start, end)).values_list('date', 'users_array'))
+        staged = self._get_staged_users(start, end)
+
+        arrays = collections.OrderedDict()
+        for index in range((end - start).days + 1):
+            date = start + timezone.timedelta(days=index)
+            arrays[date] = load_array(rows.get(date))
+            if date in staged:
+                arrays[date] = union_arrays((arrays[date], make_array(staged[date])))
+        return arrays
+
+    def get_dau(self, start, end):
+        """Return pairs (date, count visitors) for each day of range."""
+
+        counts = dict(self.filter(date__range=(start, end)).values_list('date', 'count_users'))
+
+        # days with users not packed yet, usually only the latest ones, are counted by their arrays
+        staged = self._get_staged_users(start, end)
+        if staged:
+            rows = dict(self.filter(date__in=list(staged)).values_list('date', 'users_array'))
+            for date, user_pks in staged.items():
+                counts[date] = union_arrays((load_array(rows.get(date)), make_array(user_pks))).size
+
+        return [
+            (date, counts.get(date, 0))
+            for date in (start + timezone.timedelta(days=index) for index in range((end - start).days + 1))
+        ]
+
+    def get_chart_dau(self, start, end):
+
+        config = pygal.Config(
+            fill=True,
+            show_legend=False,
+            x_label_rotation=-45,
+        )
+
+        chart = pygal.Line(config)
+
+        dates, data = zip(*self.get_dau(start, end))
+
+        chart.x_labels = [date.strftime('%d %b') for date in dates]
+        chart.add(str(_('Count visitors')), data)
+        return chart.render()
+
+    def get_chart_retention(self, retention_matrix):
+
+        config = pygal.Config(
+            show_legend=False,
+            range=(0, 1),
+        )
+
+        chart = pygal.Line(config)
+
+        chart.x_labels = [str(_('Week {}')).format(index) for index in range(len(retention_matrix))]
+        for index, row in enumerate(retention_matrix):
+            chart.add(str(_('Cohort {}')).format(index + 1), row[:len(retention_matrix) - index].tolist())
+        return chart.render()
+
+    def get_count_active_users(self, count_days, date=None):
+        """Return count distinct visitors for count days ending the date."""
+
+        if date is None:
+            date = timezone.localdate()
+
+        arrays = self.get_arrays(date - timezone.timedelta(days=count_days - 1), date)
+        return count_unique(arrays.values())
+
+    def get_wau(self, date=None):
+
+        return self.get_count_active_users(7, date)
+
+    def get_mau(self, date=None):
+
+        return self.get_count_active_users(30, date)
+
+    def get_streaks(self, user, start=None, end=None):
+        """Return the current and the longest counts consecutive days of attendances of user."""
+
+        if start is None:
+            start = timezone.localtime(user.date_joined).date()
+        if end is None:
+            end = timezone.localdate()
+
+        arrays = self.get_arrays(start, end)
+        return get_streaks(get_presence(tuple(arrays.values()), user.pk))
+
+    def get_longest_streak(self, user):
+        """Return the longest count consecutive days of attendances of user, kept with the latest visit."""
+
+        if hasattr(user, 'last_seen'):
+            return user.last_seen.longest_streak
+        return 0
+
+    def get_retention_matrix(self, start, end, period_days=7):
+        """Return matrix of retention by cohorts of users first seen in periods of given days."""
+
+        arrays = self.get_arrays(start, end)
+        return get_retention_matrix(tuple(arrays.values()), period_days)
+
+
+class VisitManager(models.Manager):
+    """
+    Manager for the latest visits of users.
+    """
+
+    def register_attendance(self, user, date):
+        """Update counts days and consecutive days of attendances of user by a day."""
+
+        with transaction.atomic():
+
+            visit = self.select_for_update().get_or_create(user=user)[0]
+
+            if visit.date_latest_attendance == date:
+                return
+
+            if visit.date_latest_attendance == date - timezone.timedelta(days=1):
+                visit.current_streak += 1
+            else:
+                visit.current_streak = 1
 
-    pass
+            visit.longest_streak = max(visit.longest_streak, visit.current_streak)
+            visit.count_days_attendance += 1
+            visit.date_latest_attendance = date
+            visit.save(update_fields=[
+                'date_latest_attendance', 'count_days_attendance', 'current_streak', 'longest_streak',
+            ])
+
+    def rebuild_attendances(self, arrays):
+        """Rebuild counts days and consecutive days of attendances of users by ordered mapping date -> array."""
+
+        stats = dict()
+        for date, array in arrays.items():
+            for user_pk in array.tolist():
+                latest, count_days, current, longest = stats.get(user_pk, (None, 0, 0, 0))
+                current = current + 1 if latest == date - timezone.timedelta(days=1) else 1
+                stats[user_pk] = (date, count_days + 1, current, max(longest, current))
+
+        # keys of the arrays are bytes of UUIDs
+        for user_pk, (latest, count_days, current, longest) in stats.items():
+            self.update_or_create(
+                user_id=uuid.UUID(bytes=user_pk.ljust(16, b'\0')),
+                defaults=dict(
+                    date_latest_attendance=latest,
+                    count_days_attendance=count_days,
+                    current_streak=current,
+                    longest_streak=longest,
+                ),
+            )
 
 
 class VisitPageManager(models.Manager):
@@ -29,58 +248,215 @@ class VisitPageManager(models.Manager):
             return obj.count_views
 
     def change_url_counter(self, request):
+        """Increase counter of visits of url at once, by single update; rollups are fed by buffers of visits only."""
 
         url_path = request.path_info
+        if not self.filter(url=url_path).update(count_views=models.F('count_views') + 1):
+            self._create_counters({url_path: 1})
 
-        obj, is_created = self.get_or_create(url=url_path)
+    def increment_counters(self, counters, batch_size=500):
+        """
+        Increase counters of visits by mapping url -> count atomically, by a single update
+        per batch of urls, creating missing urls.
+        """
 
-        if not is_created:
-            obj.count_views += 1
-            obj.save()
+        url_paths = list(counters)
 
+        for index in range(0, len(url_paths), batch_size):
+            batch = url_paths[index:index + batch_size]
 
-class VisitUserBrowserManager(models.Manager):
-    """
+            existing = set(self.filter(url__in=batch).values_list('url', flat=True))
+            if existing:
+                self.filter(url__in=existing).update(count_views=models.F('count_views') + models.Case(
+                    *(models.When(url=url_path, then=models.Value(counters[url_path])) for url_path in existing),
+                    default=models.Value(0),
+                    output_field=models.IntegerField()
+                ))
+
+            missing = {url_path: counters[url_path] for url_path in batch if url_path not in existing}
+            if missing:
+                self._create_counters(missing)
+
+        self.model._meta.get_field('rollups').related_model.objects.add_views(counters)
+
+    def _create_counters(self, missing):
+
+        try:
+            with transaction.atomic():
+                self.bulk_create([self.model(url=url_path, count_views=count) for url_path, count in missing.items()])
+        except IntegrityError:
+            # other process has created some of urls in the meantime
+            for url_path, count in missing.items():
+                obj, is_created = self.get_or_create(url=url_path, defaults={'count_views': count})
+                if not is_created:
+                    self.filter(pk=obj.pk).update(count_views=models.F('count_views') + count)
 
+
+class UserAgentManager(models.Manager):
+    """
+    Base manager for working with usage of browsers and operation systems by users.
     """
 
-    def get_chart_browsers_of_visitors(self):
+    chart_title = None
+
+    def add_user(self, name, user):
+        """Register that user uses an agent with given name; return True if it is registered first time."""
+
+        obj = self.get_or_create(name=name)[0]
+
+        through = self.model.users.through
+        field = self.model._meta.get_field('users')
+
+        try:
+            with transaction.atomic():
+                through._default_manager.create(**{
+                    field.m2m_field_name(): obj,
+                    field.m2m_reverse_field_name(): user,
+                })
+        except IntegrityError:
+            return False
+
+        self.filter(pk=obj.pk).update(count_users=models.F('count_users') + 1)
+        return True
+
+    def recount_users(self):
+        """Rebuild denormalized counts of users by single update with a correlated subquery."""
+
+        field = self.model._meta.get_field('users')
+        through = field.remote_field.through
+        connection = connections[router.db_for_write(self.model)]
+        quote_name = connection.ops.quote_name
+
+        sql = (
+            'UPDATE {table} SET {count_users} = '
+            '(SELECT COUNT(*) FROM {through_table} WHERE {through_table}.{fk} = {table}.{pk})'
+        ).format(
+            table=quote_name(self.model._meta.db_table),
+            count_users=quote_name(self.model._meta.get_field('count_users').column),
+            through_table=quote_name(through._meta.db_table),
+            fk=quote_name(through._meta.get_field(field.m2m_field_name()).column),
+            pk=quote_name(self.model._meta.pk.column),
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            return cursor.rowcount
+
+    def get_chart(self):
 
         config = pygal.Config(
             pie_half=True,
         )
 
         chart = pygal.Pie(config)
-        chart.title = _('Browsers of visitors')
-        for name, user_pks in self.values_list('name', 'user_pks'):
-            if user_pks == '':
-                count = 0
-            else:
-                count = len(user_pks.split(','))
+        chart.title = str(self.chart_title)
+        for name, count in self.values_list('name', 'count_users'):
             chart.add(name, count)
         return chart.render()
 
 
-class VisitUserSystemManager(models.Manager):
+class VisitPageRollupManager(models.Manager):
+    """
+    Manager for time-series of visits of pages.
+    """
+
+    def add_views(self, counters, now=None):
+        """Add visits by mapping url -> count to the bucket of the current hour."""
+
+        if now is None:
+            now = timezone.now()
+        start = now.replace(minute=0, second=0, microsecond=0)
+
+        VisitPage = self.model._meta.get_field('visit_page').related_model
+        page_pks = dict(VisitPage._default_manager.filter(url__in=counters.keys()).values_list('url', 'pk'))
+
+        missing = list()
+        for url_path, page_pk in page_pks.items():
+            count = counters[url_path]
+            is_updated = self.filter(
+                visit_page_id=page_pk, period=self.model.PERIOD_HOUR, start=start,
+            ).update(count_views=models.F('count_views') + count)
+            if not is_updated:
+                missing.append((page_pk, count))
+
+        for page_pk, count in missing:
+            self._add_to_bucket(page_pk, self.model.PERIOD_HOUR, start, count)
+
+    def _add_to_bucket(self, page_pk, period, start, count):
+
+        try:
+            with transaction.atomic():
+                self.create(visit_page_id=page_pk, period=period, start=start, count_views=count)
+        except IntegrityError:
+            self.filter(
+                visit_page_id=page_pk, period=period, start=start,
+            ).update(count_views=models.F('count_views') + count)
+
+    def compact(self, before):
+        """Merge hourly buckets older than given datetime into daily ones; return count merged buckets."""
+
+        # only whole days are compacted
+        before = timezone.localtime(before).replace(hour=0, minute=0, second=0, microsecond=0)
+
+        hourly = self.filter(period=self.model.PERIOD_HOUR, start__lt=before)
+
+        with transaction.atomic():
+            daily = hourly.annotate(
+                day=TruncDay('start'),
+            ).values_list('visit_page_id', 'day').annotate(
+                total=models.Sum('count_views'),
+            ).order_by()
+
+            for page_pk, day, total in daily:
+                self._add_to_bucket(page_pk, self.model.PERIOD_DAY, day, total)
+
+            count_merged = hourly.delete()[0]
+
+        return count_merged
+
+    def get_top_pages(self, start, end=None, count=10):
+        """Return pairs (url, count views) of the most visited pages for a window of time."""
+
+        qs = self.filter(start__gte=start)
+        if end is not None:
+            qs = qs.filter(start__lt=end)
+
+        return qs.values_list('visit_page__url').annotate(
+            total=models.Sum('count_views'),
+        ).order_by('-total')[:count]
+
+    def get_count_views(self, url_path, start, end=None):
+        """Return count visits of url for a window of time."""
+
+        qs = self.filter(visit_page__url=url_path, start__gte=start)
+        if end is not None:
+            qs = qs.filter(start__lt=end)
+
+        return qs.aggregate(total=models.Sum('count_views'))['total'] or 0
+
+
+class VisitUserBrowserManager(UserAgentManager):
     """
+    Manager for browsers of visitors.
+    """
+
+    chart_title = _('Browsers of visitors')
+
+    def get_chart_browsers_of_visitors(self):
 
+        return self.get_chart()
+
+
+class VisitUserSystemManager(UserAgentManager):
+    """
+    Manager for operation systems of visitors.
     """
 
-    def get_chart_systems_of_visitors(self):
+    chart_title = _('Operation systems of visitors')
 
-        config = pygal.Config(
-            pie_half=True,
-        )
+    def get_chart_systems_of_visitors(self):
 
-        chart = pygal.Pie(config)
-        chart.title = _('Operation systems of visitors')
-        for name, user_pks in self.values_list('name', 'user_pks'):
-            if user_pks == '':
-                count = 0
-            else:
-                count = len(user_pks.split(','))
-            chart.add(name, count)
-        return chart.render()
+        return self.get_chart()
 
 
 AttendanceManager = AttendanceManager.from_queryset(AttendanceQuerySet)
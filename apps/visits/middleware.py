@@ -1,15 +1,13 @@
 
-import re
 import logging
 
-from django.utils import timezone
 from django.conf import settings
-from django.core.cache import cache
 from django.utils.encoding import uri_to_iri
 
-from .models import Visit, Attendance, VisitPage
-from .constants import AUTHENTICATED_USERS_KEY, ANONYMOUS_USERS_KEY
+from .models import VisitPage
 from .utils import save_user_agent
+from .counters import compile_ignorable_urls, visit_page_counter_buffer
+from .trackers import attendance_tracker, online_authenticated_users_tracker, online_anonymous_users_tracker
 
 
 logger = logging.getLogger('django.development')
@@ -28,15 +26,7 @@ class UserVisitMiddleware(object):
 
         if request.user.is_authenticated():
 
-            now = timezone.now()
-            today = now.date()
-            if not Attendance.objects.filter(date=today).exists():
-                attendance = Attendance.objects.create()
-            else:
-                attendance = Attendance.objects.get(date=today)
-            attendance.users.add(request.user)
-
-            Visit.objects.update_or_create(user=request.user)
+            attendance_tracker.track(request.user)
 
         response = self.get_response(request)
 
@@ -56,19 +46,26 @@ class CounterVisitPageMiddleware(object):
     def __init__(self, get_response):
 
         self.get_response = get_response
+        self.ignorable_urls = compile_ignorable_urls(getattr(settings, self.SETTING_NAME_FOR_IGNORABLE_URLS, ()))
+        self.buffer = visit_page_counter_buffer
 
     def __call__(self, request):
 
         response = self.get_response(request)
 
-        if response.status_code == 200:
+        if response.status_code == 200 and not self._is_ignorable_URL(request.path_info):
 
-            VisitPage.objects.change_url_counter(request)
+            if self.buffer is None:
+                VisitPage.objects.change_url_counter(request)
+            else:
+                self.buffer.add(request.path_info)
+                self.buffer.flush_if_expired()
 
         return response
 
-    def _is_ignorable_URL(self, url_path, list_igno_urls):
-        return any(re.search(pattern, url_path) for pattern in list_igno_urls)
+    def _is_ignorable_URL(self, url_path):
+
+        return self.ignorable_urls is not None and self.ignorable_urls.search(url_path) is not None
 
 
 class UsersOnlineMiddleware:
@@ -82,38 +79,15 @@ class UsersOnlineMiddleware:
 
     def __call__(self, request):
 
-        authenticated_users = cache.get(AUTHENTICATED_USERS_KEY, dict())
-        anonymous_users = cache.get(ANONYMOUS_USERS_KEY, dict())
-
-        now = timezone.now()
-        date_expiration = timezone.now() + timezone.timedelta(seconds=settings.CHECK_USERS_ONLINE_TIMEOUT)
-
         if request.user.is_authenticated():
-            authenticated_users[request.user] = date_expiration
-
+            online_authenticated_users_tracker.mark_present(request.user.pk)
         else:
-            session_id = request.COOKIES.get(settings.SESSION_COOKIE_NAME, '')
-            anonymous_users[session_id] = date_expiration
-
-            logger.critical('Anonymous users always not more 1')
-
-        for obj, date_expiration in authenticated_users.copy().items():
-            if date_expiration < now:
-                del authenticated_users[obj]
-
-        for obj, date_expiration in anonymous_users.copy().items():
-            if date_expiration < now:
-                del anonymous_users[obj]
-
-        # 1 hour
-        cache.set(AUTHENTICATED_USERS_KEY, authenticated_users, 60 * 60)
-        cache.set(ANONYMOUS_USERS_KEY, anonymous_users, 60 * 60)
+            session_id = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+            if session_id:
+                online_anonymous_users_tracker.mark_present(session_id)
 
         response = self.get_response(request)
 
-        if response.status_code == 200:
-            pass
-
         return response
 
 
@@ -16,6 +16,8 @@ class UserVisitModelMixin(object):
 
     def get_count_days_attendances(self):
 
-        return self.attendances.count()
+        if hasattr(self, 'last_seen'):
+            return self.last_seen.count_days_attendance
+        return 0
     get_count_days_attendances.short_description = _('Count days attendance')
     get_count_days_attendances.admin_order_field = 'count_days_attendance'
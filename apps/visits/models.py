@@ -1,13 +1,17 @@
 
 from django.utils.translation import ugettext_lazy as _
 from django.db import models
+from django.utils import timezone
 from django.conf import settings
 
 from utils.django.datetime_utils import convert_date_to_django_date_format
 from utils.django.models import UUIDable, Updateable, Viewable
 
-from .validators import validate_comma_separated_objects_list
-from .managers import VisitPageManager, AttendanceManager, VisitUserBrowserManager, VisitUserSystemManager
+from .arrays import load_array
+from .managers import (
+    VisitPageManager, VisitPageRollupManager, AttendanceManager, VisitManager,
+    VisitUserBrowserManager, VisitUserSystemManager,
+)
 
 
 class VisitPage(UUIDable, Viewable):
@@ -29,17 +33,56 @@ class VisitPage(UUIDable, Viewable):
         return '{0.url}'.format(self)
 
 
+class VisitPageRollup(UUIDable):
+    """
+    Model for keeping count visits of a page for an hour or a day.
+    Hourly buckets are compacted into daily ones after a while.
+    """
+
+    PERIOD_HOUR = 'hour'
+    PERIOD_DAY = 'day'
+
+    CHOICES_PERIOD = (
+        (PERIOD_HOUR, _('Hour')),
+        (PERIOD_DAY, _('Day')),
+    )
+
+    visit_page = models.ForeignKey(
+        VisitPage, related_name='rollups',
+        on_delete=models.CASCADE, verbose_name=_('visit page'),
+    )
+    period = models.CharField(_('period'), max_length=4, choices=CHOICES_PERIOD, default=PERIOD_HOUR)
+    start = models.DateTimeField(_('start'), db_index=True)
+    count_views = models.PositiveIntegerField(_('count views'), default=0)
+
+    objects = models.Manager()
+    objects = VisitPageRollupManager()
+
+    class Meta:
+        verbose_name = _('rollup of visits page')
+        verbose_name_plural = _('rollups of visits page')
+        unique_together = (('visit_page', 'period', 'start'), )
+        index_together = (('start', 'count_views'), )
+        ordering = ('-start', )
+
+    def __str__(self):
+        return '{0.visit_page} ({0.period} {0.start})'.format(self)
+
+
 class Attendance(UUIDable):
     """
     Model for keep days of attendance of website whole
     """
 
+    # visitors not packed into users_array yet; see command pack_attendances
     users = models.ManyToManyField(
         settings.AUTH_USER_MODEL, related_name='attendances',
         verbose_name=_('user'), editable=False,
     )
+    users_array = models.BinaryField(_('users'), default=b'', editable=False)
+    count_users = models.PositiveIntegerField(_('count users'), default=0, editable=False)
     date = models.DateField(
-        _('date'), editable=False, auto_now_add=True,
+        _('date'), editable=False, default=timezone.localdate,
         db_index=True, unique=True, error_messages={
             'unique': _('Attendance on this day already exists')
         }
@@ -60,9 +103,13 @@ class Attendance(UUIDable):
 
     def get_count_visitors(self):
 
-        return self.users.count()
+        return self.count_users
     get_count_visitors.short_description = _('Count visitors')
-    get_count_visitors.admin_order_field = 'count_visitors'
+    get_count_visitors.admin_order_field = 'count_users'
+
+    def get_users_array(self):
+
+        return load_array(self.users_array)
 
 
 class Visit(UUIDable, Updateable):
@@ -74,8 +121,13 @@ class Visit(UUIDable, Updateable):
         settings.AUTH_USER_MODEL, related_name='last_seen',
         verbose_name=_('user'), editable=False, db_index=True
     )
+    date_latest_attendance = models.DateField(_('date latest attendance'), null=True, editable=False)
+    count_days_attendance = models.PositiveIntegerField(_('count days attendance'), default=0, editable=False)
+    current_streak = models.PositiveIntegerField(_('current consecutive days'), default=0, editable=False)
+    longest_streak = models.PositiveIntegerField(_('longest consecutive days'), default=0, editable=False)
 
     objects = models.Manager()
+    objects = VisitManager()
 
     class Meta:
         verbose_name = _('visit')
@@ -93,10 +145,11 @@ class VisitUserBrowser(UUIDable):
     """
 
     name = models.CharField(_('name'), max_length=100, unique=True)
-    user_pks = models.TextField(
-        _('primary key of users'), validators=[validate_comma_separated_objects_list],
-        default='', blank=True
+    users = models.ManyToManyField(
+        settings.AUTH_USER_MODEL, related_name='browsers',
+        verbose_name=_('users'), editable=False,
     )
+    count_users = models.PositiveIntegerField(_('count users'), default=0, editable=False)
 
     objects = models.Manager()
     objects = VisitUserBrowserManager()
@@ -116,10 +169,11 @@ class VisitUserSystem(UUIDable):
     """
 
     name = models.CharField(_('name'), max_length=50, unique=True)
-    user_pks = models.TextField(
-        _('primary key of users'), validators=[validate_comma_separated_objects_list],
-        default='', blank=True
+    users = models.ManyToManyField(
+        settings.AUTH_USER_MODEL, related_name='operation_systems',
+        verbose_name=_('users'), editable=False,
     )
+    count_users = models.PositiveIntegerField(_('count users'), default=0, editable=False)
 
     objects = models.Manager()
     objects = VisitUserSystemManager()
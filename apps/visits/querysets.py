@@ -1,5 +1,6 @@
 
 from django.db import models
+from django.db.models.functions import Coalesce
 
 # from utils.django.sql import NullsLastQuerySet
 
@@ -22,4 +23,4 @@ class UserAttendanceQuerySet(models.QuerySet):
 
     def users_with_count_attendances(self):
 
-        return self.annotate(count_days_attendance=models.Count('attendances', distinct=True))
+        return self.annotate(count_days_attendance=Coalesce('last_seen__count_days_attendance', 0))
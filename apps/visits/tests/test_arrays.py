@@ -0,0 +1,73 @@
+
+import uuid
+import unittest
+
+import numpy
+
+from ..arrays import (
+    make_array, dump_array, load_array, insert_into_array, contains, to_uuids,
+    count_unique, get_presence, get_streaks, get_retention_matrix,
+)
+
+
+class ArraysTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.user_ids = [uuid.uuid4() for i in range(4)]
+
+    def test_insert_into_array(self):
+
+        array = make_array(self.user_ids[:2])
+
+        array, is_added = insert_into_array(array, self.user_ids[2])
+        assert is_added is True
+        assert contains(array, self.user_ids[2]) is True
+
+        array, is_added = insert_into_array(array, self.user_ids[2])
+        assert is_added is False
+        assert array.size == 3
+        assert contains(array, self.user_ids[3]) is False
+
+    def test_dump_and_load_array(self):
+
+        # trailing null bytes must be kept
+        user_id = uuid.UUID(bytes=b'\x01' * 15 + b'\x00')
+        array = make_array([user_id] + self.user_ids)
+
+        array = load_array(dump_array(array))
+
+        assert set(to_uuids(array)) == set([user_id] + self.user_ids)
+        assert load_array(b'').size == 0
+
+    def test_count_unique(self):
+
+        arrays = [make_array(self.user_ids[:2]), make_array(self.user_ids[1:3]), make_array([])]
+
+        assert count_unique(arrays) == 3
+        assert count_unique([]) == 0
+
+    def test_get_streaks(self):
+
+        assert get_streaks(numpy.array([1, 1, 0, 1, 1, 1, 0, 1], dtype=bool)) == (1, 3)
+        assert get_streaks(numpy.array([1, 1, 0, 1, 1, 1], dtype=bool)) == (3, 3)
+        assert get_streaks(numpy.array([0, 0], dtype=bool)) == (0, 0)
+
+    def test_get_presence(self):
+
+        arrays = [make_array(self.user_ids[:2]), make_array(self.user_ids[2:]), make_array(self.user_ids[:1])]
+
+        assert get_presence(arrays, self.user_ids[0]).tolist() == [True, False, True]
+
+    def test_get_retention_matrix(self):
+
+        arrays = [
+            make_array(self.user_ids[:2]),
+            make_array(self.user_ids[:1]),
+            make_array(self.user_ids[2:4]),
+            make_array([self.user_ids[0], self.user_ids[2]]),
+        ]
+
+        matrix = get_retention_matrix(arrays, period_days=2)
+
+        assert matrix.tolist() == [[1.0, 0.5], [1.0, 0.0]]
@@ -0,0 +1,168 @@
+
+import unittest
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command, CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from ..counters import compile_ignorable_urls, VisitPageCounterBuffer, CacheVisitPageCounterBuffer
+from ..models import VisitPage, VisitPageRollup
+
+
+class CountersTest(unittest.TestCase):
+
+    def test_compile_ignorable_urls(self):
+
+        regex = compile_ignorable_urls((r'admin/[\w]*', r'\.png$', r'/favicon.ico$'))
+
+        assert regex.search('/admin/users/') is not None
+        assert regex.search('/static/img/logo.png') is not None
+        assert regex.search('/favicon.ico') is not None
+        assert regex.search('/articles/') is None
+
+    def test_compile_ignorable_urls_if_empty(self):
+
+        assert compile_ignorable_urls(()) is None
+
+    def test_buffer_take(self):
+
+        buffer = VisitPageCounterBuffer(flush_interval=60)
+        buffer.add('/')
+        buffer.add('/')
+        buffer.add('/articles/', 3)
+
+        assert buffer.get_pending('/') == 2
+        assert buffer.take() == {'/': 2, '/articles/': 3}
+        assert buffer.get_pending('/') == 0
+        assert buffer.is_expired() is False
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CacheVisitPageCounterBufferTest(SimpleTestCase):
+
+    def setUp(self):
+
+        cache.clear()
+        self.buffer = CacheVisitPageCounterBuffer(flush_interval=60)
+
+    def test_take(self):
+
+        self.buffer.add('/')
+        self.buffer.add('/')
+        self.buffer.add('/articles/', 3)
+
+        self.assertEqual(self.buffer.get_pending('/'), 2)
+        self.assertEqual(self.buffer.take(), {'/': 2, '/articles/': 3})
+        self.assertEqual(self.buffer.get_pending('/'), 0)
+        self.assertEqual(self.buffer.take(), {})
+
+    def test_urls_are_registered_again_after_take(self):
+
+        self.buffer.add('/')
+        self.buffer.take()
+
+        self.buffer.add('/', 2)
+        self.assertEqual(self.buffer.take(), {'/': 2})
+
+    def test_urls_are_registered_by_other_buffers(self):
+
+        other_buffer = CacheVisitPageCounterBuffer(flush_interval=60)
+
+        self.buffer.add('/')
+        other_buffer.add('/')
+        other_buffer.add('/articles/')
+
+        self.assertEqual(self.buffer.take(), {'/': 2, '/articles/': 1})
+
+    def test_url_registered_late_in_previous_generation_is_taken(self):
+
+        generation = self.buffer._get_generation()
+        self.buffer.take()
+
+        # another process read the generation before the flush, and registers url after it
+        with mock.patch.object(self.buffer, '_get_generation', return_value=generation):
+            self.buffer.add('/')
+
+        self.assertEqual(self.buffer.take(), {'/': 1})
+
+    def test_only_one_process_flushes_at_once(self):
+
+        self.buffer.add('/')
+        cache.add('VISIT_PAGE_COUNTER_FLUSH', True)
+
+        self.assertEqual(self.buffer.take(), {})
+
+        cache.delete('VISIT_PAGE_COUNTER_FLUSH')
+        self.assertEqual(self.buffer.take(), {'/': 1})
+
+
+class IncrementCountersTest(TestCase):
+
+    def test_increment_counters(self):
+
+        VisitPage.objects.create(url='/', count_views=5)
+        VisitPage.objects.create(url='/articles/', count_views=1)
+        VisitPage.objects.create(url='/polls/', count_views=1)
+
+        VisitPage.objects.increment_counters({'/': 2, '/articles/': 3, '/snippets/': 4}, batch_size=2)
+
+        self.assertEqual(
+            dict(VisitPage.objects.values_list('url', 'count_views')),
+            {'/': 7, '/articles/': 4, '/polls/': 1, '/snippets/': 4},
+        )
+
+    def test_existing_counters_are_increased_by_single_update(self):
+
+        for url_path in ('/', '/articles/', '/polls/'):
+            VisitPage.objects.create(url=url_path, count_views=1)
+
+        with mock.patch('apps.visits.managers.VisitPageRollupManager.add_views'):
+            # a query of existing urls and an update of them
+            with self.assertNumQueries(2):
+                VisitPage.objects.increment_counters({'/': 1, '/articles/': 2, '/polls/': 3})
+
+        self.assertEqual(
+            dict(VisitPage.objects.values_list('url', 'count_views')),
+            {'/': 2, '/articles/': 3, '/polls/': 4},
+        )
+
+
+    def test_change_url_counter_by_single_update(self):
+
+        VisitPage.objects.create(url='/', count_views=1)
+
+        request = mock.Mock(path_info='/')
+        with self.assertNumQueries(1):
+            VisitPage.objects.change_url_counter(request)
+
+        request = mock.Mock(path_info='/articles/')
+        VisitPage.objects.change_url_counter(request)
+
+        self.assertEqual(dict(VisitPage.objects.values_list('url', 'count_views')), {'/': 2, '/articles/': 1})
+        self.assertFalse(VisitPageRollup.objects.exists())
+
+class FlushVisitsPageCountersCommandTest(TestCase):
+
+    def test_memory_buffer_is_rejected(self):
+
+        with mock.patch(
+            'apps.visits.management.commands.flush_visits_page_counters.visit_page_counter_buffer',
+            VisitPageCounterBuffer(flush_interval=60),
+        ):
+            with self.assertRaises(CommandError):
+                call_command('flush_visits_page_counters')
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_flush_cache_buffer(self):
+
+        cache.clear()
+        buffer = CacheVisitPageCounterBuffer(flush_interval=60)
+        buffer.add('/', 2)
+
+        with mock.patch(
+            'apps.visits.management.commands.flush_visits_page_counters.visit_page_counter_buffer', buffer,
+        ):
+            call_command('flush_visits_page_counters')
+
+        self.assertEqual(VisitPage.objects.get(url='/').count_views, 2)
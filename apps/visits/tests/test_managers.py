@@ -0,0 +1,108 @@
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.users.factories import UserFactory
+
+from ..arrays import make_array
+from ..models import Attendance, VisitUserBrowser
+
+
+class AttendanceManagerTest(TestCase):
+    """
+    Tests for attendances of users appended as rows and packed into arrays of days.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+
+        cls.user1, cls.user2, cls.user3 = UserFactory(), UserFactory(), UserFactory()
+
+    def setUp(self):
+
+        self.today = timezone.localdate()
+        self.yesterday = self.today - timezone.timedelta(days=1)
+
+    def test_add_user(self):
+
+        self.assertTrue(Attendance.objects.add_user(self.user1, self.today))
+        self.assertFalse(Attendance.objects.add_user(self.user1, self.today))
+        self.assertTrue(Attendance.objects.add_user(self.user1, self.yesterday))
+
+        self.assertEqual(Attendance.objects.get(date=self.yesterday).users.get(), self.user1)
+
+    def test_add_user_does_not_touch_array(self):
+
+        Attendance.objects.add_user(self.user1, self.today)
+        Attendance.objects.pack_users()
+
+        self.assertTrue(Attendance.objects.add_user(self.user2, self.today))
+
+        attendance = Attendance.objects.get(date=self.today)
+        self.assertEqual(attendance.get_users_array().tolist(), make_array([self.user1.pk]).tolist())
+        self.assertEqual(attendance.count_users, 1)
+
+    def test_pack_users(self):
+
+        for user in (self.user1, self.user2):
+            Attendance.objects.add_user(user, self.today)
+        Attendance.objects.add_user(self.user3, self.yesterday)
+
+        self.assertEqual(Attendance.objects.pack_users(), 3)
+        self.assertEqual(Attendance.objects.pack_users(), 0)
+
+        self.assertFalse(Attendance.users.through.objects.exists())
+        self.assertEqual(Attendance.objects.get(date=self.today).count_users, 2)
+        self.assertEqual(Attendance.objects.get(date=self.yesterday).count_users, 1)
+
+    def test_users_not_packed_are_counted(self):
+
+        Attendance.objects.add_user(self.user1, self.today)
+        Attendance.objects.pack_users()
+
+        # seen again after packing, if the mark of the tracker was lost
+        Attendance.objects.add_user(self.user1, self.today)
+        Attendance.objects.add_user(self.user2, self.today)
+
+        self.assertEqual(Attendance.objects.get_dau(self.yesterday, self.today), [(self.yesterday, 0), (self.today, 2)])
+
+        arrays = Attendance.objects.get_arrays(self.yesterday, self.today)
+        self.assertEqual(arrays[self.today].tolist(), make_array([self.user1.pk, self.user2.pk]).tolist())
+
+        Attendance.objects.pack_users()
+
+        self.assertEqual(Attendance.objects.get_dau(self.yesterday, self.today), [(self.yesterday, 0), (self.today, 2)])
+
+    def test_command(self):
+
+        Attendance.objects.add_user(self.user1, self.today)
+
+        call_command('pack_attendances', '--rebuild-visits')
+
+        self.assertEqual(Attendance.objects.get(date=self.today).count_users, 1)
+        self.assertEqual(self.user1.last_seen.count_days_attendance, 1)
+
+
+class UserAgentManagerTest(TestCase):
+    """
+    Tests for denormalized counts of users of browsers and operation systems.
+    """
+
+    def test_recount_users(self):
+
+        user1, user2 = UserFactory(), UserFactory()
+
+        VisitUserBrowser.objects.add_user('Firefox', user1)
+        VisitUserBrowser.objects.add_user('Firefox', user2)
+        VisitUserBrowser.objects.add_user('Chrome', user1)
+        VisitUserBrowser.objects.create(name='Opera')
+        VisitUserBrowser.objects.update(count_users=10)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(VisitUserBrowser.objects.recount_users(), 3)
+
+        self.assertEqual(
+            dict(VisitUserBrowser.objects.values_list('name', 'count_users')),
+            {'Firefox': 2, 'Chrome': 1, 'Opera': 0},
+        )
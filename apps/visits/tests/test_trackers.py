@@ -0,0 +1,92 @@
+
+import unittest
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.users.factories import UserFactory
+
+from ..models import Visit
+from ..trackers import AttendanceTracker, PresenceTracker
+
+
+class PresenceTrackerTest(unittest.TestCase):
+
+    def test_get_buckets(self):
+
+        tracker = PresenceTracker('authenticated', timeout=30, bucket_size=10)
+
+        assert list(tracker.get_buckets(now=1005)) == [97, 98, 99, 100]
+
+    def test_get_buckets_if_timeout_not_multiple_of_bucket_size(self):
+
+        tracker = PresenceTracker('anonymous', timeout=25, bucket_size=10)
+
+        assert list(tracker.get_buckets(now=1000)) == [97, 98, 99, 100]
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class AttendanceTrackerTest(TestCase):
+
+    def setUp(self):
+
+        cache.clear()
+        self.tracker = AttendanceTracker(update_visit_interval=60)
+        self.user = UserFactory()
+
+    def test_attendance_is_registered_once_a_day(self):
+
+        with mock.patch.object(self.tracker, '_register_attendance') as mock_register_attendance:
+            self.tracker.track(self.user)
+            self.tracker.track(self.user)
+
+        mock_register_attendance.assert_called_once_with(self.user, timezone.localdate())
+
+    def test_attendance_is_registered_once_by_all_processes(self):
+
+        other_tracker = AttendanceTracker(update_visit_interval=60)
+
+        with mock.patch.object(AttendanceTracker, '_register_attendance') as mock_register_attendance:
+            self.tracker.track(self.user)
+            other_tracker.track(self.user)
+
+        self.assertEqual(mock_register_attendance.call_count, 1)
+
+    def test_attendance_is_registered_again_after_failure(self):
+
+        with mock.patch.object(
+            self.tracker, '_register_attendance', side_effect=[RuntimeError, None]
+        ) as mock_register_attendance:
+            with self.assertRaises(RuntimeError):
+                self.tracker.track(self.user)
+            self.tracker.track(self.user)
+            self.tracker.track(self.user)
+
+        self.assertEqual(mock_register_attendance.call_count, 2)
+
+    def test_visit_is_written_once_per_interval(self):
+
+        with mock.patch.object(self.tracker, '_register_visit') as mock_register_visit:
+            with mock.patch('apps.visits.trackers.time.monotonic', return_value=1000):
+                self.tracker.track(self.user)
+                self.tracker.track(self.user)
+
+            self.assertEqual(mock_register_visit.call_count, 1)
+
+            cache.clear()
+            with mock.patch('apps.visits.trackers.time.monotonic', return_value=1060):
+                self.tracker.track(self.user)
+
+            self.assertEqual(mock_register_visit.call_count, 2)
+
+    def test_track(self):
+
+        self.tracker.track(self.user)
+        self.tracker.track(self.user)
+
+        visit = Visit.objects.get(user=self.user)
+        self.assertEqual(visit.date_latest_attendance, timezone.localdate())
+        self.assertEqual(visit.count_days_attendance, 1)
+        self.assertEqual(visit.current_streak, 1)
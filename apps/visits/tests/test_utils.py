@@ -1,9 +1,11 @@
 
 import unittest
+from unittest import mock
 
 import pytest
 
-from ..utils import parse_user_agent_string
+from .. import utils
+from ..utils import parse_user_agent_string, update_user_agent_usage
 
 
 class UtilsTest(unittest.TestCase):
@@ -97,3 +99,46 @@ class UtilsTest(unittest.TestCase):
         assert parse_user_agent_string(
             'Mozilla/5.0 (compatible, MSIE 11, Windows NT 6.3; Trident/7.0; rv:11.0) like Gecko'
         ) == ('Windows', 'Internet Explorer')
+
+    def test_parse_user_agent_string_16(self):
+
+        assert parse_user_agent_string(
+            'curl/7.47.0'
+        ) == ('Other', 'Other')
+
+
+class UpdateUserAgentUsageTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.model = mock.Mock()
+        patcher = mock.patch.object(utils, '_registered_user_agents', utils.collections.OrderedDict())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_user(self, pk):
+
+        return mock.Mock(pk=pk)
+
+    def test_usage_is_registered_once(self):
+
+        user = self.get_user(1)
+        update_user_agent_usage(self.model, 'Linux', user)
+        update_user_agent_usage(self.model, 'Linux', user)
+        update_user_agent_usage(self.model, 'Windows', user)
+
+        assert self.model._default_manager.add_user.call_count == 2
+
+    @mock.patch.object(utils, 'REGISTERED_USER_AGENTS_MAX_SIZE', 2)
+    def test_least_recently_used_usages_are_dropped(self):
+
+        update_user_agent_usage(self.model, 'Linux', self.get_user(1))
+        update_user_agent_usage(self.model, 'Linux', self.get_user(2))
+        update_user_agent_usage(self.model, 'Linux', self.get_user(1))
+        update_user_agent_usage(self.model, 'Linux', self.get_user(3))
+
+        assert list(utils._registered_user_agents) == [(self.model, 'Linux', 1), (self.model, 'Linux', 3)]
+        assert self.model._default_manager.add_user.call_count == 3
+
+        update_user_agent_usage(self.model, 'Linux', self.get_user(2))
+        assert self.model._default_manager.add_user.call_count == 4
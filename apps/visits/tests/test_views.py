@@ -0,0 +1,49 @@
+
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+
+from apps.users.factories import UserFactory
+
+from ..models import VisitPage
+
+
+class VisitsStatisticsViewTest(TestCase):
+    """
+    Tests for the page of statistics of visits in the admin.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+
+        cls.superuser = UserFactory(is_active=True, is_superuser=True)
+
+    def get_statistics(self):
+
+        self.client.force_login(self.superuser)
+        response = self.client.get(reverse('admin:visits_statistics'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'admin/admin/statistics.html')
+        return response
+
+    def test_tables_of_top_pages(self):
+
+        VisitPage.objects.increment_counters({'/': 2, '/articles/': 1})
+
+        response = self.get_statistics()
+
+        tables = {str(title): rows for title, rows in response.context['tables_of_statistics']}
+        for title in ('Top pages for the last day', 'Top pages for the last week', 'Top pages for the last month'):
+            self.assertEqual(list(tables[title]), [('/', 2), ('/articles/', 1)])
+
+    def test_active_users_and_charts(self):
+
+        response = self.get_statistics()
+
+        tables = {str(title): rows for title, rows in response.context['tables_of_statistics']}
+        self.assertEqual(len(tables['Active users']), 3)
+
+        charts = response.context['charts_of_statistics']
+        self.assertEqual(len(charts), 2)
+        self.assertIsNone(charts[0]['table'])
+        self.assertEqual(len(charts[1]['table']['data']), 8)
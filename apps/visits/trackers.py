@@ -0,0 +1,176 @@
+
+import time
+import threading
+import collections
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .constants import ATTENDANCE_SEEN_KEY_PREFIX, VISIT_UPDATED_KEY_PREFIX, ONLINE_USERS_KEY_PREFIX
+from .models import Attendance, Visit
+
+
+class AttendanceTracker(object):
+    """
+    Registrator attendances and latest visits of users, touching database
+    only on the first request of a day of user and not often than once per interval.
+    """
+
+    def __init__(self, update_visit_interval):
+
+        self.update_visit_interval = update_visit_interval
+        self._lock = threading.Lock()
+        self._seen_date = None
+        self._seen_user_pks = set()
+        self._visits_updated = dict()
+
+    def track(self, user):
+
+        today = timezone.localdate()
+
+        if self._mark_seen(user.pk, today):
+            try:
+                self._register_attendance(user, today)
+            except Exception:
+                # let the next request of the user register the attendance again
+                self._unmark_seen(user.pk, today)
+                raise
+
+        if self._mark_visit_updated(user.pk):
+            self._register_visit(user)
+
+    def _mark_seen(self, user_pk, today):
+        """Return True if the user was not seen today by any process of website yet."""
+
+        with self._lock:
+            if self._seen_date != today:
+                self._seen_date = today
+                self._seen_user_pks = set()
+                self._visits_updated = dict()
+            elif user_pk in self._seen_user_pks:
+                return False
+            self._seen_user_pks.add(user_pk)
+
+        return cache.add(self._get_seen_key(user_pk, today), True, 60 * 60 * 24)
+
+    def _unmark_seen(self, user_pk, today):
+
+        with self._lock:
+            if self._seen_date == today:
+                self._seen_user_pks.discard(user_pk)
+
+        cache.delete(self._get_seen_key(user_pk, today))
+
+    def _get_seen_key(self, user_pk, today):
+
+        return '{}{}:{}'.format(ATTENDANCE_SEEN_KEY_PREFIX, today.isoformat(), user_pk)
+
+    def _mark_visit_updated(self, user_pk):
+        """Return True if the latest visit of the user was not written for the interval."""
+
+        now = time.monotonic()
+        with self._lock:
+            last_updated = self._visits_updated.get(user_pk)
+            if last_updated is not None and now - last_updated < self.update_visit_interval:
+                return False
+            self._visits_updated[user_pk] = now
+
+        return cache.add(VISIT_UPDATED_KEY_PREFIX + str(user_pk), True, self.update_visit_interval)
+
+    def _register_attendance(self, user, today):
+
+        if Attendance.objects.add_user(user, today):
+            Visit.objects.register_attendance(user, today)
+
+    def _register_visit(self, user):
+
+        if not Visit.objects.filter(user=user).update(updated=timezone.now()):
+            Visit.objects.get_or_create(user=user)
+
+
+class PresenceTracker(object):
+    """
+    Registrator online users, keeping them in buckets of time in a cache.
+
+    Every bucket is a list of slots: an atomic counter of slots plus one key per slot,
+    so marking present is O(1) without reading and writing whole lists of users.
+    """
+
+    def __init__(self, kind, timeout, bucket_size):
+
+        self.kind = kind
+        self.timeout = timeout
+        self.bucket_size = bucket_size
+        # keep keys a bit longer than needed
+        self.keys_timeout = timeout + bucket_size * 2
+
+    def _get_bucket(self, now=None):
+
+        if now is None:
+            now = time.time()
+        return int(now // self.bucket_size)
+
+    def _get_key(self, bucket, *parts):
+
+        return ':'.join(str(part) for part in (ONLINE_USERS_KEY_PREFIX + self.kind, bucket) + parts)
+
+    def get_buckets(self, now=None):
+        """Return buckets of time within timeout of online."""
+
+        current_bucket = self._get_bucket(now)
+        count_buckets = -(-self.timeout // self.bucket_size)
+        return range(current_bucket - count_buckets, current_bucket + 1)
+
+    def mark_present(self, member, now=None):
+
+        bucket = self._get_bucket(now)
+
+        # the member is already present in the current bucket
+        if not cache.add(self._get_key(bucket, 'member', member), True, self.keys_timeout):
+            return
+
+        count_key = self._get_key(bucket, 'count')
+        if cache.add(count_key, 1, self.keys_timeout):
+            slot = 1
+        else:
+            try:
+                slot = cache.incr(count_key)
+            except ValueError:
+                return
+        cache.set(self._get_key(bucket, 'slot', slot), member, self.keys_timeout)
+
+    def get_members(self, now=None):
+        """Return members were present within timeout of online, the most recent go first."""
+
+        buckets = tuple(reversed(self.get_buckets(now)))
+
+        count_keys = {self._get_key(bucket, 'count'): bucket for bucket in buckets}
+        counts = cache.get_many(count_keys.keys())
+
+        slot_keys = list()
+        for count_key, count in counts.items():
+            bucket = count_keys[count_key]
+            slot_keys.extend(self._get_key(bucket, 'slot', slot) for slot in range(1, count + 1))
+        slots = cache.get_many(slot_keys)
+
+        members = collections.OrderedDict()
+        for slot_key in slot_keys:
+            if slot_key in slots:
+                members.setdefault(slots[slot_key], None)
+        return list(members)
+
+    def get_count(self, now=None):
+
+        return len(self.get_members(now))
+
+
+attendance_tracker = AttendanceTracker(getattr(settings, 'UPDATE_LAST_SEEN_INTERVAL', 5 * 60))
+
+online_authenticated_users_tracker = PresenceTracker(
+    'authenticated', settings.CHECK_USERS_ONLINE_TIMEOUT, getattr(settings, 'CHECK_USERS_ONLINE_BUCKET', 10)
+)
+
+online_anonymous_users_tracker = PresenceTracker(
+    'anonymous', settings.CHECK_USERS_ONLINE_TIMEOUT, getattr(settings, 'CHECK_USERS_ONLINE_BUCKET', 10)
+)
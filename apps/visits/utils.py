@@ -1,21 +1,31 @@
 
+import threading
+import functools
+import collections
+
 from .models import VisitUserSystem, VisitUserBrowser
 
 
+# (model, name, pk of user) already registered by this process, the least recently used are dropped
+_registered_user_agents = collections.OrderedDict()
+_registered_user_agents_lock = threading.Lock()
+
+REGISTERED_USER_AGENTS_MAX_SIZE = 10000
+
+
 def save_user_agent(request):
 
-    user_agent = request.META['HTTP_USER_AGENT']
+    user_agent = request.META.get('HTTP_USER_AGENT', '')
 
     os_name, browser_name = parse_user_agent_string(user_agent)
 
-    update_user_pks(VisitUserSystem, os_name, request.user)
-    update_user_pks(VisitUserBrowser, browser_name, request.user)
+    update_user_agent_usage(VisitUserSystem, os_name, request.user)
+    update_user_agent_usage(VisitUserBrowser, browser_name, request.user)
 
 
+@functools.lru_cache(maxsize=256)
 def parse_user_agent_string(user_agent_string):
-    """
-
-    """
+    """Return names of an operation system and a browser from string of User-Agent."""
 
     start_index = user_agent_string.find('(')
     end_index = user_agent_string.find(')')
@@ -24,6 +34,8 @@ def parse_user_agent_string(user_agent_string):
     os_info = user_agent_string[start_index + 1:end_index]
     rest_info = user_agent_string[end_index + 1:]
 
+    os_name = browser_name = 'Other'
+
     if 'Windows' in os_info:
         os_name = 'Windows'
     elif 'Macintosh' in os_info:
@@ -44,25 +56,23 @@ def parse_user_agent_string(user_agent_string):
     elif 'Firefox' in rest_info:
         browser_name = 'Firefox'
     elif 'MSIE' in os_info or 'Trident' in os_info:
-        browser_name = 'Internet Explover'
+        browser_name = 'Internet Explorer'
 
     return os_name, browser_name
 
 
-def update_user_pks(model, obj_name, user):
-
-    obj = model._default_manager.get_or_create(name=obj_name)[0]
+def update_user_agent_usage(model, name, user):
+    """Register usage of an agent by user, touching database once per process for the same triple."""
 
-    user_pks = obj.user_pks.split(',')
-    user_pk = str(user.pk)
+    key = (model, name, user.pk)
+    with _registered_user_agents_lock:
+        if key in _registered_user_agents:
+            _registered_user_agents.move_to_end(key)
+            return
 
-    if user_pk not in user_pks:
+    model._default_manager.add_user(name, user)
 
-        if user_pks == ['']:
-            user_pks = user_pk
-        else:
-            user_pks.append(user_pk)
-            user_pks = ','.join(user_pks)
-        obj.user_pks = user_pks
-        obj.full_clean()
-        obj.save()
+    with _registered_user_agents_lock:
+        _registered_user_agents[key] = None
+        if len(_registered_user_agents) > REGISTERED_USER_AGENTS_MAX_SIZE:
+            _registered_user_agents.popitem(last=False)
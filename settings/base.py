@@ -114,6 +114,7 @@ MY_CONTEXT_PROCCESSORS = [
     'utils.django.context_processors.site_created',
     'apps.visits.context_processors.count_visits_page',
     'apps.visits.context_processors.online_users',
+    'apps.notifications.context_processors.count_unread_notifications',
 ]
 
 TEMPLATES[0]['OPTIONS']['context_processors'].extend(MY_CONTEXT_PROCCESSORS)
@@ -18,13 +18,82 @@ SITE_CREATED = datetime.date(year=2016, month=3, day=1)
 
 IGNORABLE_URLS_FOR_COUNT_VISITS = (
     r'admin/[\w]*',
-    r'*\.jpeg$',
-    r'*\.png$',
-    r'*\.jpg$',
-    r'*\.gif$',
+    r'\.jpeg$',
+    r'\.png$',
+    r'\.jpg$',
+    r'\.gif$',
     r'/favicon.ico$',
     r'/(robots.txt)|(humans.txt)$',
 )
 
+# None - write each visit immediately, 'memory' - buffer in process, 'cache' - buffer in shared cache,
+# flushed by requests and by the command flush_visits_page_counters
+COUNT_VISITS_PAGE_BUFFER = 'cache'
+
+# seconds
+COUNT_VISITS_PAGE_FLUSH_INTERVAL = 60
+
+# days, after which hourly visits of pages are compacted into daily ones
+COUNT_DAYS_KEEP_HOURLY_VISITS_PAGE = 2
+
+# seconds, how often write the latest visit of an user
+UPDATE_LAST_SEEN_INTERVAL = 5 * 60
 
 CHECK_USERS_ONLINE_TIMEOUT = 30
+
+# seconds, size of a bucket of time for keeping online users
+CHECK_USERS_ONLINE_BUCKET = 10
+
+# seconds, rows of badges, groups and content types kept in memory of a process are loaded again after it
+WELL_KNOWN_ROWS_TIMEOUT = 60 * 5
+
+# 'sync' - create notifications in the request, 'outbox' - record them for the worker process_notifications_outbox
+NOTIFICATIONS_DELIVERY = 'sync'
+
+NOTIFICATIONS_OUTBOX_MAX_ATTEMPTS = 5
+
+# days of keeping processed notifications in the outbox, see the command process_notifications_outbox
+NOTIFICATIONS_OUTBOX_RETENTION = 7
+
+# seconds, counters of unread notifications are recounted after it
+UNREAD_NOTIFICATIONS_COUNTER_TIMEOUT = 60 * 10
+
+# days of keeping notifications, see the command purge_notifications;
+# an action has priority over a level, and a level over the default
+NOTIFICATIONS_RETENTION = {
+    'default': {'read': 90, 'unread': 365},
+    'levels': {
+        'error': {'read': 180, 'unread': 365},
+    },
+    'actions': {
+        'user_logged_in': {'read': 7, 'unread': 30},
+        'user_logged_out': {'read': 7, 'unread': 30},
+        'user_loggin_failed': {'read': 30, 'unread': 90},
+    },
+}
+
+# merging of similar notifications of a recipient into one:
+# 'window' - of the same action and target within NOTIFICATIONS_COALESCING_WINDOW seconds,
+# 'digest' - of the same action within a day
+NOTIFICATIONS_COALESCING = {
+    'added_vote': 'window',
+    'added_opinion': 'window',
+    'added_comment': 'window',
+    'user_logged_in': 'digest',
+    'user_logged_out': 'digest',
+    'user_loggin_failed': 'digest',
+}
+
+NOTIFICATIONS_COALESCING_WINDOW = 60 * 60
+
+NOTIFICATIONS_COALESCING_COUNT_LAST_ACTORS = 5
+
+# seconds, a running job of report is made again after it, because its worker is considered lost
+REPORT_JOBS_RUNNING_TIMEOUT = 60 * 30
+
+# a job of report running longer than the timeout so many times is failed
+REPORT_JOBS_MAX_ATTEMPTS = 3
+
+# count of processes of the pool rendering charts of results of polls in the PDF reports,
+# None - count of CPUs, 1 - in the process of the report
+POLLS_REPORTS_CHARTS_PROCESSES = None